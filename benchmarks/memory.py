@@ -0,0 +1,126 @@
+"""Memory benchmark for parsed maps, in total and per top-level asset."""
+
+import gc
+import json
+import sys
+import tracemalloc
+from argparse import ArgumentParser
+from pathlib import Path
+
+from benchmarks.run import (
+    MAP_SUFFIXES,
+    MAPS_DIR,
+    ROOT,
+    decompress,
+    log,
+    metadata,
+    parse_bytes,
+    split_header,
+)
+
+
+def measure_map(data: bytes) -> dict:
+    """Retained memory of the map parsed from decompressed ``data``, in bytes."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        map_obj = parse_bytes(data)
+        gc.collect()
+        total = tracemalloc.get_traced_memory()[0] - before
+
+        assets = {}
+        names = [name for name, value in vars(map_obj).items() if value is not None and name != "assets"]
+        for name in names:
+            current = tracemalloc.get_traced_memory()[0]
+            setattr(map_obj, name, None)
+            gc.collect()
+            assets[name] = current - tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+    return {"total": total, "assets": assets}
+
+
+def flatten(results: dict) -> dict[tuple[str, str], int]:
+    """Map (map name, measurement) to its retained bytes, including per-asset figures."""
+    flat = {}
+    for entry in results["maps"]:
+        flat[(entry["name"], "total")] = entry["memory"]["total"]
+        for asset_name, size in entry["memory"]["assets"].items():
+            flat[(entry["name"], f"assets.{asset_name}")] = size
+    return flat
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> list[tuple[str, str, int, int]]:
+    """Log the change of every measurement against a baseline and return the regressions.
+
+    A regression is a measurement that grew by more than ``threshold`` (a ratio).
+    """
+    old, new = flatten(baseline), flatten(current)
+    regressions = []
+    log(f"{'map':<40} {'measurement':<36} {'before':>10} {'after':>10} {'change':>8}")
+    for key in sorted(old.keys() & new.keys()):
+        before, after = old[key], new[key]
+        ratio = after / before if before else float("inf")
+        marker = ""
+        if ratio > 1 + threshold and after > before:
+            regressions.append((*key, before, after))
+            marker = " !"
+        log(
+            f"{key[0][:40]:<40} {key[1][:36]:<36} {before / 1024:>8.0f}KB {after / 1024:>8.0f}KB {ratio:>7.2f}x{marker}"
+        )
+    return regressions
+
+
+def main():
+    parser = ArgumentParser(description="Measure the memory retained by parsed SAGE maps.")
+    parser.add_argument("--maps", nargs="*", help="Map file names or paths (default: every map in tests/data/maps)")
+    parser.add_argument("--output", "-o", help="Write JSON results to this file (default: stdout)")
+    parser.add_argument("--compare", help="Baseline JSON results to compare against")
+    parser.add_argument(
+        "--threshold", type=float, default=0.1, help="Growth ratio reported as a regression (default: 0.1)"
+    )
+    args = parser.parse_args()
+
+    if args.maps:
+        paths = [Path(p) if Path(p).exists() else MAPS_DIR / p for p in args.maps]
+    else:
+        paths = sorted(p for p in MAPS_DIR.iterdir() if p.suffix in MAP_SUFFIXES)
+
+    for path in paths:
+        if not path.exists():
+            parser.error(f"Map file not found: {path}")
+
+    meta = metadata(repeat=1)
+    del meta["repeat"]
+    results = {"meta": meta, "maps": []}
+    for path in paths:
+        log(f"Measuring {path.name}...")
+        data = decompress(split_header(path.read_bytes()))
+        results["maps"].append(
+            {
+                "name": path.name,
+                "source": str(path.relative_to(ROOT) if path.is_relative_to(ROOT) else path),
+                "bytes": len(data),
+                "memory": measure_map(data),
+            }
+        )
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        Path(args.output).write_text(output)
+        log(f"Results written to {args.output}")
+    else:
+        print(output)
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())
+        regressions = compare(baseline, results, args.threshold)
+        if regressions:
+            log(f"{len(regressions)} measurement(s) larger by more than {args.threshold:.0%}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,347 @@
+"""Benchmark runner for parsing, writing and linting the sample maps and synthetic maps."""
+
+import copy
+import io
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from argparse import ArgumentParser
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+from reversebox.compression.compression_refpack import RefpackHandler
+
+import sagemap
+from sagemap.context import ParsingContext
+from sagemap.linter import lint_map
+from sagemap.map import Map, write_map
+from sagemap.profiling import ParseProfiler
+from sagemap.stream import BinaryStream
+from sagemap.synth import SynthConfig, generate_map
+from sagemap.transform import scale_map
+
+ROOT = Path(__file__).resolve().parent.parent
+MAPS_DIR = ROOT / "tests" / "data" / "maps"
+MAP_SUFFIXES = (".map", ".bse")
+
+
+def log(message: str):
+    print(message, file=sys.stderr)
+
+
+def summarize(samples: list[float]) -> dict:
+    """Summarize timing samples (in seconds)."""
+    return {
+        "min": min(samples),
+        "mean": statistics.fmean(samples),
+        "median": statistics.median(samples),
+        "max": max(samples),
+        "runs": len(samples),
+    }
+
+
+def measure(func, repeat: int) -> tuple[dict, object]:
+    """Time ``func`` ``repeat`` times, returning the summary and the last result.
+
+    A failing benchmark is recorded with its error instead of aborting the run (for
+    example compression, which depends on the platform's refpack library).
+    """
+    samples = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        try:
+            result = func()
+        except Exception as e:
+            return {"error": f"{type(e).__name__}: {e}"}, None
+        samples.append(time.perf_counter() - start)
+    return summarize(samples), result
+
+
+def split_header(data: bytes) -> bytes:
+    """Strip the optional EAR header, as ``parse_map`` does."""
+    return data[8:] if data.startswith(b"EAR") else data
+
+
+def decompress(data: bytes) -> bytes:
+    try:
+        return RefpackHandler().decompress_data(data)
+    except Exception:
+        return data
+
+
+def parse_timed(data: bytes) -> tuple[Map, dict[str, float]]:
+    """Parse decompressed map bytes with profiling, timing every top-level asset.
+
+    Assets that occur more than once accumulate their time.
+    """
+    context = ParsingContext(BinaryStream(io.BytesIO(data)))
+    context.set_profiler(ParseProfiler())
+    map_obj = Map()
+    map_obj.parse(context)
+
+    timings = {}
+    for node in context.profiler.finish(len(data)).children:
+        timings[node.name] = timings.get(node.name, 0.0) + node.duration
+
+    return map_obj, timings
+
+
+def parse_bytes(data: bytes) -> Map:
+    context = ParsingContext(BinaryStream(io.BytesIO(data)))
+    map_obj = Map()
+    map_obj.parse(context)
+    return map_obj
+
+
+def describe(map_obj: Map) -> dict:
+    hmd = map_obj.height_map_data
+    objects = map_obj.objects_list.object_list if map_obj.objects_list is not None else []
+    return {
+        "width": hmd.width if hmd is not None else None,
+        "height": hmd.height if hmd is not None else None,
+        "objects": len(objects),
+    }
+
+
+def benchmark_map(name: str, source: str, raw: bytes | None, map_obj: Map | None, repeat: int) -> dict:
+    """Run every benchmark for one map.
+
+    Args:
+        name: Name to report the map under
+        source: Where the map came from (file path or synthetic recipe)
+        raw: File contents, or None for synthetic maps that only exist in memory
+        map_obj: Parsed map, required when ``raw`` is None
+        repeat: Number of timed runs per benchmark
+    """
+    benchmarks = {}
+
+    if raw is not None:
+        payload = split_header(raw)
+        benchmarks["decompress"], data = measure(lambda: decompress(payload), repeat)
+        data = data if data is not None else payload
+    else:
+        data = write_map(map_obj, compress=False)
+
+    asset_samples = {}
+
+    def timed_parse():
+        parsed, timings = parse_timed(data)
+        for asset_name, elapsed in timings.items():
+            asset_samples.setdefault(asset_name, []).append(elapsed)
+        return parsed
+
+    stats, _ = measure(timed_parse, repeat)
+    benchmarks["parse_assets"] = {asset_name: summarize(samples) for asset_name, samples in asset_samples.items()}
+    if "error" in stats:
+        return {"name": name, "source": source, "benchmarks": {**benchmarks, "parse": stats}}
+
+    benchmarks["parse"], map_obj = measure(lambda: parse_bytes(data), repeat)
+    benchmarks["write"], written = measure(lambda: write_map(map_obj, compress=False), repeat)
+    benchmarks["compress"], _ = measure(lambda: RefpackHandler().compress_data(written), repeat)
+    benchmarks["to_dict"], _ = measure(map_obj.to_dict, repeat)
+    benchmarks["lint_map"], errors = measure(lambda: lint_map(map_obj), repeat)
+
+    return {
+        "name": name,
+        "source": source,
+        "bytes": len(data),
+        **describe(map_obj),
+        "lint_errors": len(errors) if errors is not None else None,
+        "benchmarks": benchmarks,
+    }
+
+
+def scaled_map(map_obj: Map, scale: float) -> Map:
+    scaled = copy.deepcopy(map_obj)
+    scale_map(scaled, scale)
+    return scaled
+
+
+def crowded_map(map_obj: Map, object_count: int) -> Map:
+    """Copy a map and pad its object list to ``object_count`` by cloning existing objects.
+
+    Clones are shifted by a deterministic jitter so they do not sit on top of each other.
+    """
+    crowded = copy.deepcopy(map_obj)
+    objects = crowded.objects_list.object_list
+    if not objects:
+        raise ValueError("Cannot crowd a map without objects")
+
+    rng = np.random.default_rng(0)
+    originals = list(objects)
+    offsets = rng.uniform(-50, 50, size=(max(0, object_count - len(objects)), 2))
+    for index, (dx, dy) in enumerate(offsets):
+        clone = copy.deepcopy(originals[index % len(originals)])
+        clone.position = (clone.position[0] + dx, clone.position[1] + dy, clone.position[2])
+        objects.append(clone)
+
+    return crowded
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "HEAD"], cwd=ROOT, stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except Exception:
+        return None
+
+
+def metadata(repeat: int) -> dict:
+    return {
+        "sagemap_version": sagemap.__version__,
+        "commit": git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "repeat": repeat,
+    }
+
+
+def flatten(results: dict) -> dict[tuple[str, str], float]:
+    """Map (map name, benchmark) to its median time, including per-asset parse times."""
+    flat = {}
+    for entry in results["maps"]:
+        for bench, stats in entry["benchmarks"].items():
+            if bench == "parse_assets":
+                for asset_name, asset_stats in stats.items():
+                    flat[(entry["name"], f"parse_assets.{asset_name}")] = asset_stats["median"]
+            elif "median" in stats:
+                flat[(entry["name"], bench)] = stats["median"]
+    return flat
+
+
+def compare(
+    baseline: dict, current: dict, threshold: float, min_delta: float = 0.001
+) -> list[tuple[str, str, float, float]]:
+    """Log the change of every benchmark against a baseline and return the regressions.
+
+    A regression is a benchmark whose median grew by more than ``threshold`` (a ratio)
+    and by at least ``min_delta`` seconds, so sub-millisecond noise is not reported.
+    """
+    old, new = flatten(baseline), flatten(current)
+    regressions = []
+    log(f"{'map':<40} {'benchmark':<36} {'before':>10} {'after':>10} {'change':>8}")
+    for key in sorted(old.keys() & new.keys()):
+        before, after = old[key], new[key]
+        ratio = after / before if before else float("inf")
+        marker = ""
+        if ratio > 1 + threshold and after - before >= min_delta:
+            regressions.append((*key, before, after))
+            marker = " !"
+        log(
+            f"{key[0][:40]:<40} {key[1][:36]:<36} {before * 1000:>8.2f}ms {after * 1000:>8.2f}ms {ratio:>7.2f}x{marker}"
+        )
+    return regressions
+
+
+def main():
+    parser = ArgumentParser(description="Benchmark parsing, writing and linting of SAGE maps.")
+    parser.add_argument("--maps", nargs="*", help="Map file names or paths (default: every map in tests/data/maps)")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per benchmark (default: 3)")
+    parser.add_argument("--output", "-o", help="Write JSON results to this file (default: stdout)")
+    parser.add_argument("--compare", help="Baseline JSON results to compare against")
+    parser.add_argument(
+        "--threshold", type=float, default=0.1, help="Slowdown ratio reported as a regression (default: 0.1)"
+    )
+    parser.add_argument(
+        "--no-synthetic", action="store_true", help="Skip the synthetic scaled, crowded and generated maps"
+    )
+    parser.add_argument("--synthetic-scale", type=float, default=4, help="Scale of the synthetic map (default: 4)")
+    parser.add_argument(
+        "--synthetic-objects", type=int, default=20000, help="Object count of the synthetic map (default: 20000)"
+    )
+    parser.add_argument(
+        "--synth-factor",
+        type=float,
+        default=4,
+        help="Size of the generated map relative to the default SynthConfig (default: 4)",
+    )
+    args = parser.parse_args()
+
+    if args.repeat < 1:
+        parser.error(f"--repeat must be at least 1, got: {args.repeat}")
+
+    if args.maps:
+        paths = [Path(p) if Path(p).exists() else MAPS_DIR / p for p in args.maps]
+    else:
+        paths = sorted(p for p in MAPS_DIR.iterdir() if p.suffix in MAP_SUFFIXES)
+
+    for path in paths:
+        if not path.exists():
+            parser.error(f"Map file not found: {path}")
+
+    results = {"meta": metadata(args.repeat), "maps": []}
+
+    largest = None
+    for path in paths:
+        log(f"Benchmarking {path.name}...")
+        raw = path.read_bytes()
+        entry = benchmark_map(
+            path.name, str(path.relative_to(ROOT) if path.is_relative_to(ROOT) else path), raw, None, args.repeat
+        )
+        results["maps"].append(entry)
+        if entry.get("objects") and (largest is None or entry["bytes"] > largest[1]):
+            largest = (path, entry["bytes"])
+
+    if not args.no_synthetic and largest is not None:
+        path = largest[0]
+        base = parse_bytes(decompress(split_header(path.read_bytes())))
+
+        log(f"Building {args.synthetic_scale}x scaled copy of {path.name}...")
+        name = f"{path.stem} x{args.synthetic_scale:g}"
+        entry = benchmark_map(
+            name,
+            f"scale_map({path.name}, {args.synthetic_scale:g})",
+            None,
+            scaled_map(base, args.synthetic_scale),
+            args.repeat,
+        )
+        results["maps"].append(entry)
+
+        log(f"Building {args.synthetic_objects} object copy of {path.name}...")
+        name = f"{path.stem} {args.synthetic_objects} objects"
+        entry = benchmark_map(
+            name,
+            f"crowded_map({path.name}, {args.synthetic_objects})",
+            None,
+            crowded_map(base, args.synthetic_objects),
+            args.repeat,
+        )
+        results["maps"].append(entry)
+
+    if not args.no_synthetic:
+        log(f"Generating synthetic map at {args.synth_factor:g}x...")
+        config = SynthConfig().scaled(args.synth_factor)
+        entry = benchmark_map(
+            f"synth x{args.synth_factor:g}",
+            f"generate_map(SynthConfig().scaled({args.synth_factor:g}))",
+            None,
+            generate_map(config),
+            args.repeat,
+        )
+        results["maps"].append(entry)
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        Path(args.output).write_text(output)
+        log(f"Results written to {args.output}")
+    else:
+        print(output)
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())
+        regressions = compare(baseline, results, args.threshold)
+        if regressions:
+            log(f"{len(regressions)} benchmark(s) slower by more than {args.threshold:.0%}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 from .map import Map, parse_map, parse_map_from_path, write_map, write_map_to_path
+from .validation import validate
 
-__all__ = ["parse_map", "parse_map_from_path", "write_map", "write_map_to_path", "Map"]
+__all__ = ["parse_map", "parse_map_from_path", "write_map", "write_map_to_path", "Map", "validate"]
 __version__ = "0.8.0"
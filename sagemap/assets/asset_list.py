@@ -5,7 +5,7 @@ if TYPE_CHECKING:
     from ..context import ParsingContext, WritingContext
 
 
-@dataclass
+@dataclass(slots=True)
 class AssetListItem:
     type_id: int
     instance_id: int
@@ -26,7 +26,7 @@ class AssetListItem:
         context.stream.writeUInt32(self.instance_id)
 
 
-@dataclass
+@dataclass(slots=True)
 class AssetList:
     asset_name = "AssetList"
 
@@ -2,6 +2,8 @@ from dataclasses import dataclass
 from enum import IntEnum
 from typing import TYPE_CHECKING
 
+import numpy as np
+
 if TYPE_CHECKING:
     from ..context import ParsingContext, WritingContext
     from .height_map import HeightMapData
@@ -16,6 +18,15 @@ class BlendDirection(IntEnum):
     BOTTOM_TO_TOP = 3
 
 
+# Offset of the neighbour cell a blend transitions towards, in [x][y] grid order.
+BLEND_DIRECTION_OFFSETS = {
+    BlendDirection.RIGHT_TO_LEFT: (1, 0),
+    BlendDirection.LEFT_TO_RIGHT: (-1, 0),
+    BlendDirection.TOP_TO_BOTTOM: (0, 1),
+    BlendDirection.BOTTOM_TO_TOP: (0, -1),
+}
+
+
 class TileFlammability(IntEnum):
     """Enum for tile flammability values."""
 
@@ -25,7 +36,7 @@ class TileFlammability(IntEnum):
     UNDEFINED = 3
 
 
-@dataclass
+@dataclass(slots=True)
 class BlendTileTexture:
     """Represents a blend tile texture (inline data structure, not an asset)."""
 
@@ -68,7 +79,7 @@ class BlendTileTexture:
         context.stream.writeUInt16PrefixedAsciiString(self.name)
 
 
-@dataclass
+@dataclass(slots=True)
 class BlendDescription:
     """Represents a blend description (inline data structure, not an asset)."""
 
@@ -119,7 +130,7 @@ class BlendDescription:
         context.stream.writeUInt32(0x7ADA0000)
 
 
-@dataclass
+@dataclass(slots=True)
 class CliffTextureMapping:
     """Represents a cliff texture mapping (inline data structure, not an asset)."""
 
@@ -176,7 +187,41 @@ def get_blend_bit_size(version: int) -> int:
         return 16
 
 
-@dataclass
+def build_texture_index_table(textures: list[BlendTileTexture], cell_count: int = 0) -> np.ndarray:
+    """Build a flat lookup table mapping every global cell to the index of its owning texture.
+
+    Cells not owned by any texture map to -1. When ranges overlap the first texture wins,
+    matching a linear scan over ``textures``.
+    """
+    size = max([cell_count] + [tex.cell_start + tex.cell_count for tex in textures])
+    table = np.full(size, -1, dtype=np.int32)
+    for index in range(len(textures) - 1, -1, -1):
+        tex = textures[index]
+        table[tex.cell_start : tex.cell_start + tex.cell_count] = index
+    return table
+
+
+def lookup_texture_indices(tiles, table: np.ndarray) -> np.ndarray:
+    """Return the texture index of every tile value in ``tiles`` (-1 when unowned)."""
+    cells = np.asarray(tiles, dtype=np.int64) // 4
+    if table.size == 0:
+        return np.full(cells.shape, -1, dtype=np.int32)
+    in_range = (cells >= 0) & (cells < table.size)
+    return np.where(in_range, table[np.clip(cells, 0, table.size - 1)], -1).astype(np.int32)
+
+
+def encode_texture_tiles(tile_tex: np.ndarray, textures: list[BlendTileTexture]) -> np.ndarray:
+    """Encode a grid of texture indices as the tile values of their positions, the inverse of ``lookup_texture_indices``."""
+    cell_size = np.array([tex.cell_size for tex in textures], dtype=np.int64)[tile_tex]
+    cell_start = np.array([tex.cell_start for tex in textures], dtype=np.int64)[tile_tex]
+    rows = np.arange(tile_tex.shape[0])[:, None]
+    cols = np.arange(tile_tex.shape[1])[None, :]
+    global_cell = cell_start + (cols // 2 % cell_size) * cell_size + rows // 2 % cell_size
+    # value = global_cell * 4 + sub_c * 2 + sub_r
+    return global_cell * 4 + cols % 2 * 2 + rows % 2
+
+
+@dataclass(slots=True)
 class BlendTileData:
     asset_name = "BlendTileData"
 
@@ -354,6 +399,95 @@ class BlendTileData:
             end_pos=asset_ctx.end_pos,
         )
 
+    def texture_index_table(self) -> np.ndarray:
+        """Flat ``global cell -> texture index`` table for the current texture list."""
+        return build_texture_index_table(self.textures, self.texture_cell_count)
+
+    def texture_index_grid(self) -> np.ndarray:
+        """Per-tile texture index layer with the same ``[x][y]`` layout as ``tiles`` (-1 when unowned)."""
+        return lookup_texture_indices(self.tiles, self.texture_index_table())
+
+    def rebuild_blend_descriptions(self):
+        """Recompute blend descriptions from the current tiles and deduplicate them.
+
+        Each blend description's secondary_texture_tile references a tile value from the
+        neighbour cell it blends towards. After tiles are re-encoded those values change
+        with position, so every non-zero cell of ``blends`` and ``three_way_blends`` gets a
+        description rebuilt from its neighbour's current tile. Identical descriptions are
+        shared and numbered in first-seen order (``blends`` then ``three_way_blends``, row
+        by row), so the result is stable across runs.
+        """
+        old_descriptions = self.blend_descriptions
+        tiles = np.asarray(self.tiles, dtype=np.int64)
+        rows, cols = tiles.shape
+
+        # Descriptions sharing everything but secondary_texture_tile share an attribute id.
+        attribute_ids = {}
+        representatives = []
+        desc_attribute = np.empty(len(old_descriptions), dtype=np.int64)
+        desc_secondary = np.empty(len(old_descriptions), dtype=np.int64)
+        desc_offset = np.empty((len(old_descriptions), 2), dtype=np.int64)
+        for i, desc in enumerate(old_descriptions):
+            key = (bytes(desc.raw_blend_direction), desc.flags, desc.two_sided, desc.magic_value1)
+            if key not in attribute_ids:
+                attribute_ids[key] = len(representatives)
+                representatives.append(desc)
+            desc_attribute[i] = attribute_ids[key]
+            desc_secondary[i] = desc.secondary_texture_tile
+            desc_offset[i] = BLEND_DIRECTION_OFFSETS[desc.blend_direction]
+
+        grids = [np.asarray(self.blends, dtype=np.int64), np.asarray(self.three_way_blends, dtype=np.int64)]
+        masks = [grid != 0 for grid in grids]
+
+        key_dtype = np.dtype([("secondary", np.int64), ("attribute", np.int64)])
+        key_parts = []
+        for grid, mask in zip(grids, masks):
+            r, c = np.nonzero(mask)
+            desc_index = grid[mask] - 1
+            nr = r + desc_offset[desc_index, 0]
+            nc = c + desc_offset[desc_index, 1]
+            in_bounds = (nr >= 0) & (nr < rows) & (nc >= 0) & (nc < cols)
+
+            part = np.empty(len(desc_index), dtype=key_dtype)
+            part["secondary"] = np.where(
+                in_bounds, tiles[np.clip(nr, 0, rows - 1), np.clip(nc, 0, cols - 1)], desc_secondary[desc_index]
+            )
+            part["attribute"] = desc_attribute[desc_index]
+            key_parts.append(part)
+
+        keys = np.concatenate(key_parts)
+        unique_keys, first_index, inverse = np.unique(keys, return_index=True, return_inverse=True)
+
+        # np.unique sorts its output; renumber the keys in first-seen order instead.
+        order = np.argsort(first_index, kind="stable")
+        rank = np.empty(len(order), dtype=np.int64)
+        rank[order] = np.arange(len(order))
+        new_indices = rank[inverse.reshape(-1)] + 1
+
+        self.blend_descriptions = []
+        for secondary, attribute in unique_keys[order].tolist():
+            desc = representatives[attribute]
+            self.blend_descriptions.append(
+                BlendDescription(
+                    secondary_texture_tile=secondary,
+                    raw_blend_direction=desc.raw_blend_direction,
+                    flags=desc.flags,
+                    two_sided=desc.two_sided,
+                    magic_value1=desc.magic_value1,
+                )
+            )
+
+        new_grids = []
+        offset = 0
+        for grid, mask in zip(grids, masks):
+            count = int(mask.sum())
+            new_grid = np.zeros_like(grid)
+            new_grid[mask] = new_indices[offset : offset + count]
+            new_grids.append(new_grid.tolist())
+            offset += count
+
+        self.blends, self.three_way_blends = new_grids
+
     def write(self, context: "WritingContext"):
         with context.write_asset(self.asset_name, self.version):
             context.stream.writeUInt32(len(self.tiles) * len(self.tiles[0]))
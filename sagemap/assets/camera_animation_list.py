@@ -5,7 +5,7 @@ if TYPE_CHECKING:
     from ..context import ParsingContext, WritingContext
 
 
-@dataclass
+@dataclass(slots=True)
 class FreeCameraAnimationCameraFrame:
     frame_index: int
     interpolation_type: str
@@ -40,7 +40,7 @@ class FreeCameraAnimationCameraFrame:
         context.stream.writeFloat(self.fov)
 
 
-@dataclass
+@dataclass(slots=True)
 class FreeCameraAnimationFrameData:
     frames: list[FreeCameraAnimationCameraFrame]
 
@@ -61,7 +61,7 @@ class FreeCameraAnimationFrameData:
             frame.write(context)
 
 
-@dataclass
+@dataclass(slots=True)
 class LookAtCameraAnimationLookAtFrame:
     frame_index: int
     interpolation_type: str
@@ -88,7 +88,7 @@ class LookAtCameraAnimationLookAtFrame:
         context.stream.writeVector3(self.look_at_point)
 
 
-@dataclass
+@dataclass(slots=True)
 class LookAtCameraAnimationCameraFrame:
     frame_index: int
     interpolation_type: str
@@ -123,7 +123,7 @@ class LookAtCameraAnimationCameraFrame:
         context.stream.writeFloat(self.fov)
 
 
-@dataclass
+@dataclass(slots=True)
 class LookAtCameraAnimationFrameData:
     camera_frames: list[LookAtCameraAnimationCameraFrame]
     look_at_frames: list[LookAtCameraAnimationLookAtFrame]
@@ -155,7 +155,7 @@ class LookAtCameraAnimationFrameData:
             frame.write(context)
 
 
-@dataclass
+@dataclass(slots=True)
 class CameraAnimation:
     animation_type: str
     name: str
@@ -200,7 +200,7 @@ class CameraAnimation:
         self.frame_data.write(context)
 
 
-@dataclass
+@dataclass(slots=True)
 class CameraAnimationList:
     asset_name = "CameraAnimationList"
 
@@ -5,7 +5,7 @@ if TYPE_CHECKING:
     from ..context import ParsingContext, WritingContext
 
 
-@dataclass
+@dataclass(slots=True)
 class CastleTemplate:
     name: str
     template_name: str
@@ -47,7 +47,7 @@ class CastleTemplate:
             context.stream.writeUInt32(self.phase)
 
 
-@dataclass
+@dataclass(slots=True)
 class PerimeterPoint:
     x: float
     y: float
@@ -80,7 +80,7 @@ class PerimeterPoint:
             context.stream.writeInt32(int(self.z))
 
 
-@dataclass
+@dataclass(slots=True)
 class CastlePerimeter:
     has_perimeter: bool
     name: str | None
@@ -121,7 +121,7 @@ class CastlePerimeter:
                 point.write(context, version)
 
 
-@dataclass
+@dataclass(slots=True)
 class CastleTemplates:
     asset_name = "CastleTemplates"
 
@@ -5,7 +5,7 @@ if TYPE_CHECKING:
     from ..context import ParsingContext, WritingContext
 
 
-@dataclass
+@dataclass(slots=True)
 class EnvironmentData:
     asset_name = "EnvironmentData"
 
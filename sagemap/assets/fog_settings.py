@@ -5,7 +5,7 @@ if TYPE_CHECKING:
     from ..context import ParsingContext, WritingContext
 
 
-@dataclass
+@dataclass(slots=True)
 class FogSettings:
     asset_name = "FogSettings"
 
@@ -23,7 +23,7 @@ class TimeOfTheDay(enum.Enum):
         return times[self]
 
 
-@dataclass
+@dataclass(slots=True)
 class MapColorArgb:
     a: int
     r: int
@@ -50,7 +50,7 @@ class MapColorArgb:
         context.stream.writeUInt32(value)
 
 
-@dataclass
+@dataclass(slots=True)
 class GlobalLight:
     ambient: tuple[float, float, float]
     color: tuple[float, float, float]
@@ -74,7 +74,7 @@ class GlobalLight:
         context.stream.writeVector3(self.direction)
 
 
-@dataclass
+@dataclass(slots=True)
 class GlobalLightingConfiguration:
     terrain_sun: GlobalLight
     object_sun: GlobalLight | None
@@ -156,7 +156,7 @@ class GlobalLightingConfiguration:
                 self.infantry_accent2.write(context)
 
 
-@dataclass
+@dataclass(slots=True)
 class GlobalLighting:
     asset_name = "GlobalLighting"
 
@@ -1,11 +1,13 @@
 from dataclasses import dataclass
 from typing import TYPE_CHECKING
 
+import numpy as np
+
 if TYPE_CHECKING:
     from ..context import ParsingContext, WritingContext
 
 
-@dataclass
+@dataclass(slots=True)
 class HeightMapBorder:
     corner1: tuple[int, int]
     position: tuple[int, int]
@@ -33,7 +35,7 @@ class HeightMapBorder:
         context.stream.writeUInt32(self.position[1])
 
 
-@dataclass
+@dataclass(slots=True)
 class HeightMapData:
     asset_name = "HeightMapData"
 
@@ -65,21 +67,11 @@ class HeightMapData:
             if area != width * height:
                 raise ValueError(f"Invalid area: {area}, expected: {width * height}")
 
-            min_height = None
-            max_height = None
-            elevations = [[0 for _ in range(width)] for _ in range(height)]
-            for y in range(height):
-                for x in range(width):
-                    if asset_ctx.version >= 5:
-                        elevation = context.stream.readUInt16()
-                    else:
-                        elevation = context.stream.readUChar()
-                    flipped_y = height - 1 - y
-                    elevations[flipped_y][x] = elevation
-                    if min_height is None or elevation < min_height:
-                        min_height = elevation
-                    if max_height is None or elevation > max_height:
-                        max_height = elevation
+            # Rows are stored from the bottom of the map; the nested lists are top-down
+            cells = context.stream.readArray("<u2" if asset_ctx.version >= 5 else "u1", area)
+            elevations = cells.reshape(height, width)[::-1].tolist()
+            min_height = int(cells.min()) if area else None
+            max_height = int(cells.max()) if area else None
 
         context.logger.debug(f"Finished parsing {cls.asset_name}")
         return cls(
@@ -108,11 +100,13 @@ class HeightMapData:
 
             context.stream.writeUInt32(self.area)
 
-            for y in range(self.height):
-                for x in range(self.width):
-                    flipped_y = self.height - 1 - y
-                    elevation = self.elevations[flipped_y][x]
-                    if self.version >= 5:
-                        context.stream.writeUInt16(elevation)
-                    else:
-                        context.stream.writeUChar(elevation)
+            # Rows are stored from the bottom, the nested lists from the top
+            elevations = np.asarray(self.elevations)[::-1]
+            limit = 0xFFFF if self.version >= 5 else 0xFF
+            # Casting would wrap values around rather than fail
+            if elevations.size and (elevations.min() < 0 or elevations.max() > limit):
+                raise ValueError(
+                    f"Elevations out of range (0..{limit}) for version {self.version}: "
+                    f"{elevations.min()}..{elevations.max()}"
+                )
+            context.stream.writeBytes(elevations.astype("<u2" if self.version >= 5 else "u1").tobytes())
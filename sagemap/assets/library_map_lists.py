@@ -5,7 +5,7 @@ if TYPE_CHECKING:
     from ..context import ParsingContext, WritingContext
 
 
-@dataclass
+@dataclass(slots=True)
 class LibraryMaps:
     asset_name = "LibraryMaps"
 
@@ -38,7 +38,7 @@ class LibraryMaps:
                 context.stream.writeUInt16PrefixedAsciiString(value)
 
 
-@dataclass
+@dataclass(slots=True)
 class LibraryMapLists:
     asset_name = "LibraryMapLists"
 
@@ -5,7 +5,7 @@ if TYPE_CHECKING:
     from ..context import ParsingContext, WritingContext
 
 
-@dataclass
+@dataclass(slots=True)
 class MissionHotSpot:
     id: str
     title: str
@@ -29,7 +29,7 @@ class MissionHotSpot:
         context.stream.writeUInt16PrefixedAsciiString(self.description)
 
 
-@dataclass
+@dataclass(slots=True)
 class MissionHotSpots:
     asset_name = "MissionHotSpots"
 
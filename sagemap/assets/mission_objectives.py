@@ -15,7 +15,7 @@ class MissionObjectiveType(enum.IntEnum):
     Protect = 5
 
 
-@dataclass
+@dataclass(slots=True)
 class MissionObjective:
     id: str
     text: str
@@ -47,7 +47,7 @@ class MissionObjective:
         context.stream.writeUInt32(self.objective_type.value)
 
 
-@dataclass
+@dataclass(slots=True)
 class MissionObjectives:
     asset_name = "MissionObjectives"
 
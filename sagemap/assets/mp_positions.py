@@ -5,7 +5,7 @@ if TYPE_CHECKING:
     from ..context import ParsingContext, WritingContext
 
 
-@dataclass
+@dataclass(slots=True)
 class MPPosition:
     asset_name = "MPPositionInfo"
 
@@ -60,7 +60,7 @@ class MPPosition:
                     context.stream.writeUInt16PrefixedAsciiString(restriction)
 
 
-@dataclass
+@dataclass(slots=True)
 class MPPositionList:
     asset_name = "MPPositionList"
 
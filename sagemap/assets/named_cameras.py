@@ -5,7 +5,7 @@ if TYPE_CHECKING:
     from ..context import ParsingContext, WritingContext
 
 
-@dataclass
+@dataclass(slots=True)
 class NamedCamera:
     look_at_point: tuple[float, float, float]
     name: str
@@ -52,7 +52,7 @@ class NamedCamera:
         context.stream.writeFloat(self.unknown)
 
 
-@dataclass
+@dataclass(slots=True)
 class NamedCameras:
     asset_name = "NamedCameras"
 
@@ -5,7 +5,7 @@ if TYPE_CHECKING:
     from ..context import ParsingContext, Property, WritingContext
 
 
-@dataclass
+@dataclass(slots=True)
 class Object:
     asset_name = "Object"
 
@@ -24,7 +24,7 @@ class Object:
             position = context.stream.readVector3()
             angle = context.stream.readFloat()
             road_type = context.stream.readUInt32()
-            type_name = context.stream.readUInt16PrefixedAsciiString()
+            type_name = context.stream.readUInt16PrefixedAsciiString(intern=True)
             properties = context.properties_to_dict(context.parse_properties())
 
         context.logger.debug(f"Finished parsing {cls.asset_name}")
@@ -48,7 +48,7 @@ class Object:
             context.write_properties(context.dict_to_properties(self.properties))
 
 
-@dataclass
+@dataclass(slots=True)
 class ObjectsList:
     asset_name = "ObjectsList"
 
@@ -1,3 +1,4 @@
+import struct
 from dataclasses import dataclass, field
 from enum import IntEnum
 from typing import TYPE_CHECKING
@@ -75,8 +76,25 @@ class ScriptArgumentType(IntEnum):
     OBJECTIVE_COMPLETE = 77
 
 
-@dataclass
+ARGUMENT_TYPES = {member.value: member for member in ScriptArgumentType}
+
+_UINT32 = struct.Struct("<I")
+_VECTOR3 = struct.Struct("<3f")
+# int_value, float_value (as its raw bits) and the length of string_value
+_ARGUMENT = struct.Struct("<iIH")
+_ARGUMENT_FLOAT = struct.Struct("<4xf2x")
+_ARGUMENT_WRITE = struct.Struct("<IifH")
+
+
+@dataclass(slots=True)
 class ScriptArgument:
+    """A condition or action argument.
+
+    Campaign maps hold hundreds of thousands of these, so the class is slotted, strings
+    are interned in the stream's table and the common 0.0 float is shared rather than
+    allocated per argument.
+    """
+
     type: ScriptArgumentType
     int_value: int | None = None
     float_value: float | None = None
@@ -85,49 +103,39 @@ class ScriptArgument:
 
     @classmethod
     def parse(cls, context: "ParsingContext"):
-        argument_type = ScriptArgumentType(context.stream.readUInt32())
-        int_value = None
-        float_value = None
-        string_value = None
-        position_value = None
-
-        if argument_type == ScriptArgumentType.POSITION_COORDINATE:
-            position_value = (
-                context.stream.readFloat(),
-                context.stream.readFloat(),
-                context.stream.readFloat(),
-            )
-        else:
-            int_value = context.stream.readInt32()
-            float_value = context.stream.readFloat()
-            string_value = context.stream.readUInt16PrefixedAsciiString()
-
-        return cls(
-            type=argument_type,
-            int_value=int_value,
-            float_value=float_value,
-            string_value=string_value,
-            position_value=position_value,
-        )
+        stream = context.stream
+        raw_type = _UINT32.unpack(stream.readBytes(4))[0]
+        argument_type = ARGUMENT_TYPES.get(raw_type)
+        if argument_type is None:
+            raise ValueError(f"{raw_type} is not a valid ScriptArgumentType")
+
+        if argument_type is ScriptArgumentType.POSITION_COORDINATE:
+            return cls(argument_type, position_value=_VECTOR3.unpack(stream.readBytes(12)))
+
+        data = stream.readBytes(_ARGUMENT.size)
+        int_value, float_bits, length = _ARGUMENT.unpack(data)
+        float_value = _ARGUMENT_FLOAT.unpack(data)[0] if float_bits else 0.0
+        raw = stream.readBytes(length)
+        string_value = stream.interned.get(raw)
+        if string_value is None:
+            string_value = stream.interned[raw] = raw.decode(stream.encoding)
+        return cls(argument_type, int_value, float_value, string_value)
 
     def write(self, context: "WritingContext"):
-        context.stream.writeUInt32(self.type.value)
-
         if self.type == ScriptArgumentType.POSITION_COORDINATE:
             if self.position_value is None:
                 raise ValueError("position_value must be set for Coordinate arguments")
-            context.stream.writeFloat(self.position_value[0])
-            context.stream.writeFloat(self.position_value[1])
-            context.stream.writeFloat(self.position_value[2])
+            context.stream.writeBytes(_UINT32.pack(self.type) + _VECTOR3.pack(*self.position_value))
         else:
             if self.int_value is None or self.float_value is None or self.string_value is None:
                 raise ValueError("int_value, float_value, and string_value must be set for non-Coordinate arguments")
-            context.stream.writeInt32(self.int_value)
-            context.stream.writeFloat(self.float_value)
-            context.stream.writeUInt16PrefixedAsciiString(self.string_value)
+            encoded = self.string_value.encode(context.stream.encoding)
+            context.stream.writeBytes(
+                _ARGUMENT_WRITE.pack(self.type, self.int_value, self.float_value, len(encoded)) + encoded
+            )
 
 
-@dataclass
+@dataclass(slots=True)
 class ScriptDerived:
     asset_name_true = "ScriptAction"
     asset_name_false = "ScriptActionFalse"
@@ -158,9 +166,8 @@ class ScriptDerived:
                 internal_name = context.parse_asset_property_key()
 
             num_arguments = context.stream.readUInt32()
-            arguments = []
-            for _ in range(num_arguments):
-                arguments.append(ScriptArgument.parse(context))
+            parse_argument = ScriptArgument.parse
+            arguments = [parse_argument(context) for _ in range(num_arguments)]
 
             is_enabled = None
             is_inverted = None
@@ -201,7 +208,7 @@ class ScriptDerived:
                     context.stream.writeBoolUInt32(self.is_inverted)
 
 
-@dataclass
+@dataclass(slots=True)
 class OrCondition:
     asset_name = "OrCondition"
 
@@ -235,7 +242,7 @@ class OrCondition:
                 condition.write(context, "Condition")
 
 
-@dataclass
+@dataclass(slots=True)
 class Script:
     asset_name = "Script"
 
@@ -416,7 +423,7 @@ class Script:
                 action.write(context, ScriptDerived.asset_name_false)
 
 
-@dataclass
+@dataclass(slots=True)
 class ScriptGroup:
     asset_name = "ScriptGroup"
 
@@ -480,7 +487,7 @@ class ScriptGroup:
                     item.write(context)
 
 
-@dataclass
+@dataclass(slots=True)
 class ScriptList:
     asset_name = "ScriptList"
 
@@ -520,8 +527,98 @@ class ScriptList:
                     item.write(context)
 
 
+@dataclass(slots=True)
+class ScriptLocation:
+    """Where a script or script group sits in a ``PlayerScriptsList``."""
+
+    player_index: int
+    group_path: tuple[str, ...]
+    script: Script | ScriptGroup
+
+
+@dataclass(slots=True)
+class ScriptReference:
+    """A condition or action argument naming something (a script, team, waypoint...)."""
+
+    location: ScriptLocation
+    content: ScriptDerived
+    argument_index: int
+
+    @property
+    def argument(self) -> ScriptArgument:
+        return self.content.arguments[self.argument_index]
+
+
+class ScriptIndex:
+    """Lookup tables over every script of a ``PlayerScriptsList``.
+
+    Built in one traversal of the script trees, after which finding a script by name or
+    the arguments referring to a name are dictionary lookups. Names are not unique across
+    players, so each table maps a name to every match in tree order.
+    """
+
+    def __init__(self, script_lists: list[ScriptList]):
+        self.scripts: dict[str, list[ScriptLocation]] = {}
+        self.groups: dict[str, list[ScriptLocation]] = {}
+        self.subroutines: dict[str, list[ScriptLocation]] = {}
+        self.references: dict[str, list[ScriptReference]] = {}
+
+        for player_index, script_list in enumerate(script_lists):
+            stack = [((), item) for item in reversed(script_list.items)]
+            while stack:
+                group_path, item = stack.pop()
+                location = ScriptLocation(player_index, group_path, item)
+
+                if isinstance(item, ScriptGroup):
+                    self.groups.setdefault(item.name, []).append(location)
+                    path = (*group_path, item.name)
+                    stack.extend((path, child) for child in reversed(item.items))
+                    continue
+
+                self.scripts.setdefault(item.name, []).append(location)
+                if item.is_subroutine:
+                    self.subroutines.setdefault(item.name, []).append(location)
+
+                contents = [condition for or_condition in item.or_conditions for condition in or_condition.conditions]
+                contents.extend(item.actions_if_true)
+                contents.extend(item.actions_if_false)
+                for content in contents:
+                    for argument_index, argument in enumerate(content.arguments):
+                        if argument.string_value:
+                            self.references.setdefault(argument.string_value, []).append(
+                                ScriptReference(location, content, argument_index)
+                            )
+
+    def find_script(self, name: str) -> ScriptLocation | None:
+        """First script called ``name``, or None."""
+        locations = self.scripts.get(name)
+        return locations[0] if locations else None
+
+    def find_group(self, name: str) -> ScriptLocation | None:
+        """First script group called ``name``, or None."""
+        locations = self.groups.get(name)
+        return locations[0] if locations else None
+
+    def references_to(self, name: str, *argument_types: ScriptArgumentType) -> list[ScriptReference]:
+        """Arguments whose value is ``name``, optionally only those of the given types."""
+        references = self.references.get(name, [])
+        if argument_types:
+            return [reference for reference in references if reference.argument.type in argument_types]
+        return list(references)
+
+
 @dataclass
 class PlayerScriptsList:
+    """Scripts of every player, one ``ScriptList`` per entry of ``SidesList.players``.
+
+    ``index`` is built on first use and dropped whenever ``script_lists`` is replaced or
+    changed through ``add_item`` and ``remove_script``. Call ``invalidate_index`` after
+    editing the script trees in place.
+
+    Unlike the records it holds, this class is not slotted: the cached index lives in the
+    instance ``__dict__`` so it stays out of ``asdict`` and ``Map.to_dict``.
+    """
+
     asset_name = "PlayerScriptsList"
 
     version: int
@@ -529,6 +626,47 @@ class PlayerScriptsList:
     start_pos: int
     end_pos: int
 
+    def __setattr__(self, name, value):
+        if name == "script_lists":
+            self.__dict__.pop("_index", None)
+        super().__setattr__(name, value)
+
+    @property
+    def index(self) -> ScriptIndex:
+        index = self.__dict__.get("_index")
+        if index is None:
+            index = self.__dict__["_index"] = ScriptIndex(self.script_lists)
+        return index
+
+    def invalidate_index(self):
+        self.__dict__.pop("_index", None)
+
+    def _container(self, player_index: int, group_path: tuple[str, ...]) -> ScriptList | ScriptGroup:
+        container = self.script_lists[player_index]
+        for name in group_path:
+            container = next(
+                (item for item in container.items if isinstance(item, ScriptGroup) and item.name == name), None
+            )
+            if container is None:
+                raise ValueError(f"No script group at {'/'.join(group_path)} for player {player_index}")
+        return container
+
+    def add_item(self, player_index: int, item: Script | ScriptGroup, group_path: tuple[str, ...] = ()):
+        """Append a script or group to a player's script list or to one of its groups."""
+        self._container(player_index, group_path).items.append(item)
+        self.invalidate_index()
+
+    def remove_script(self, name: str) -> Script:
+        """Remove the first script called ``name`` and return it."""
+        location = self.index.find_script(name)
+        if location is None:
+            raise ValueError(f"No script named {name}")
+
+        items = self._container(location.player_index, location.group_path).items
+        del items[next(i for i, item in enumerate(items) if item is location.script)]
+        self.invalidate_index()
+        return location.script
+
     @classmethod
     def parse(cls, context: "ParsingContext"):
         with context.read_asset() as asset_ctx:
@@ -5,7 +5,7 @@ if TYPE_CHECKING:
     from ..context import ParsingContext, WritingContext
 
 
-@dataclass
+@dataclass(slots=True)
 class PolygonTrigger:
     asset_name = "PolygonTrigger"
 
@@ -147,7 +147,7 @@ class PolygonTrigger:
             context.stream.writeInt32(point[2])
 
 
-@dataclass
+@dataclass(slots=True)
 class PolygonTriggers:
     asset_name = "PolygonTriggers"
 
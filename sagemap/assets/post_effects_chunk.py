@@ -5,7 +5,7 @@ if TYPE_CHECKING:
     from ..context import ParsingContext, WritingContext
 
 
-@dataclass
+@dataclass(slots=True)
 class PostEffectParameter:
     name: str
     type: str
@@ -57,7 +57,7 @@ class PostEffectParameter:
             raise ValueError(f"Unknown effect parameter type '{self.type}' for parameter name '{self.name}'.")
 
 
-@dataclass
+@dataclass(slots=True)
 class PostEffect:
     name: str
     parameters: list[PostEffectParameter] | None
@@ -99,7 +99,7 @@ class PostEffect:
             context.stream.writeUInt16PrefixedAsciiString(self.lookup_image)
 
 
-@dataclass
+@dataclass(slots=True)
 class PostEffectsChunk:
     asset_name = "PostEffectsChunk"
 
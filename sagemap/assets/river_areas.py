@@ -5,7 +5,7 @@ if TYPE_CHECKING:
     from ..context import ParsingContext, WritingContext
 
 
-@dataclass
+@dataclass(slots=True)
 class RiverArea:
     asset_name = "RiverArea"
 
@@ -111,7 +111,7 @@ class RiverArea:
             context.stream.writeVector2(line[1])
 
 
-@dataclass
+@dataclass(slots=True)
 class RiverAreas:
     asset_name = "RiverAreas"
 
@@ -7,7 +7,7 @@ if TYPE_CHECKING:
     from ..context import ParsingContext, WritingContext
 
 
-@dataclass
+@dataclass(slots=True)
 class BuildListInfo:
     build_name: str
     template_name: str
@@ -76,7 +76,7 @@ class BuildListInfo:
         context.stream.writeBool(self.repairable)
 
 
-@dataclass
+@dataclass(slots=True)
 class BuildList:
     asset_name = "BuildList"
 
@@ -120,7 +120,7 @@ class BuildList:
             item.write(context, has_asset_list)
 
 
-@dataclass
+@dataclass(slots=True)
 class BuildLists:
     asset_name = "BuildLists"
 
@@ -153,7 +153,7 @@ class BuildLists:
                 item.write(context, has_asset_list)
 
 
-@dataclass
+@dataclass(slots=True)
 class Player:
     properties: dict
     build_list_items: dict[str, BuildListInfo]
@@ -182,7 +182,7 @@ class Player:
             item.write(context, has_asset_list)
 
 
-@dataclass
+@dataclass(slots=True)
 class SidesList:
     asset_name = "SidesList"
 
@@ -5,7 +5,7 @@ if TYPE_CHECKING:
     from ..context import ParsingContext
 
 
-@dataclass
+@dataclass(slots=True)
 class SkippedAsset:
     asset_name = "SkippedAsset"
 
@@ -5,7 +5,7 @@ if TYPE_CHECKING:
     from ..context import ParsingContext, WritingContext
 
 
-@dataclass
+@dataclass(slots=True)
 class StandingWaterArea:
     asset_name = "StandingWaterArea"
 
@@ -72,7 +72,7 @@ class StandingWaterArea:
         context.stream.writeUInt16PrefixedAsciiString(self.depth_color)
 
 
-@dataclass
+@dataclass(slots=True)
 class StandingWaterAreas:
     asset_name = "StandingWaterAreas"
 
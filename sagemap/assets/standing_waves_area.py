@@ -5,7 +5,7 @@ if TYPE_CHECKING:
     from ..context import ParsingContext, WritingContext
 
 
-@dataclass
+@dataclass(slots=True)
 class StandingWaveArea:
     asset_name = "StandingWaveArea"
 
@@ -130,7 +130,7 @@ class StandingWaveArea:
             context.stream.writeUInt16PrefixedAsciiString(self.wave_particle_fx_name)
 
 
-@dataclass
+@dataclass(slots=True)
 class StandingWaveAreas:
     asset_name = "StandingWaveAreas"
 
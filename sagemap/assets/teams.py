@@ -5,7 +5,7 @@ if TYPE_CHECKING:
     from sagemap.context import ParsingContext, Property, WritingContext
 
 
-@dataclass
+@dataclass(slots=True)
 class Team:
     properties: dict[str, "Property"]
 
@@ -21,7 +21,7 @@ class Team:
         context.write_properties(context.dict_to_properties(self.properties))
 
 
-@dataclass
+@dataclass(slots=True)
 class Teams:
     asset_name = "Teams"
 
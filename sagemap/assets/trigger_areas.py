@@ -5,7 +5,7 @@ if TYPE_CHECKING:
     from ..context import ParsingContext, WritingContext
 
 
-@dataclass
+@dataclass(slots=True)
 class TriggerArea:
     asset_name = "TriggerArea"
 
@@ -50,7 +50,7 @@ class TriggerArea:
         context.stream.writeUInt32(self.unknown2)
 
 
-@dataclass
+@dataclass(slots=True)
 class TriggerAreas:
     asset_name = "TriggerAreas"
 
@@ -3,7 +3,7 @@ from dataclasses import dataclass
 from sagemap.context import ParsingContext, WritingContext
 
 
-@dataclass
+@dataclass(slots=True)
 class WaypointsList:
     asset_name = "WaypointsList"
 
@@ -5,7 +5,7 @@ if TYPE_CHECKING:
     from ..context import ParsingContext, Property, WritingContext
 
 
-@dataclass
+@dataclass(slots=True)
 class WorldInfo:
     asset_name = "WorldInfo"
 
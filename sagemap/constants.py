@@ -0,0 +1,18 @@
+"""Constants of the map format shared across modules."""
+
+# World units per height-map cell
+CELL_SIZE = 10
+
+# Players a multiplayer map defines for each skirmish faction
+REQUIRED_PLAYERS = [
+    "SkirmishMen",
+    "SkirmishRohan",
+    "SkirmishElves",
+    "SkirmishDwarves",
+    "SkirmishIsengard",
+    "SkirmishMordor",
+    "SkirmishImladris",
+    "SkirmishWild",
+    "SkirmishAngmar",
+    "SkirmishEvilmen",
+]
@@ -1,9 +1,11 @@
+import io
 import logging
 from contextlib import contextmanager
 from dataclasses import dataclass
 from enum import IntEnum
 from typing import Iterator, TypedDict
 
+from .profiling import ParseProfiler
 from .stream import BinaryStream
 
 
@@ -41,9 +43,15 @@ class ParsingContext:
         self.logger = logging.getLogger(__name__)
         self.logger.addHandler(logging.NullHandler())
 
+        self.profiler: ParseProfiler | None = None
+        self.pending_asset_name = None
+
     def set_logger(self, logger):
         self.logger = logger
 
+    def set_profiler(self, profiler: ParseProfiler | None):
+        self.profiler = profiler
+
     def parse_properties(self):
         properties = []
         property_count = self.stream.readUInt16()
@@ -77,9 +85,9 @@ class ParsingContext:
         elif property_key_type == AssetPropertyType.RealNumber:
             value = self.stream.readFloat()
         elif property_key_type in (AssetPropertyType.AsciiString, AssetPropertyType.Unknown):
-            value = self.stream.readUInt16PrefixedAsciiString()
+            value = self.stream.readUInt16PrefixedAsciiString(intern=True)
         elif property_key_type == AssetPropertyType.UnicodeString:
-            value = self.stream.readUInt16PrefixedUnicodeString()
+            value = self.stream.readUInt16PrefixedUnicodeString(intern=True)
         else:
             raise ValueError(f"Unexpected property type: {property_key_type}")
 
@@ -107,6 +115,7 @@ class ParsingContext:
         asset_index = self.stream.readUInt32()
         asset_name = self.assets[asset_index]
         self.logger.debug(f"Parsing asset: {asset_name} (Index: {asset_index})")
+        self.pending_asset_name = asset_name
         return asset_name
 
     def parse_asset_header(self):
@@ -114,19 +123,37 @@ class ParsingContext:
         datasize = self.stream.readUInt32()
         return asset_version, datasize
 
-    @contextmanager
-    def read_asset(self) -> Iterator[AssetContext]:
+    def skip_asset(self) -> tuple[int, int]:
+        """Seek past the asset whose name was just read, returning its version and datasize."""
+        self.pending_asset_name = None
         version, datasize = self.parse_asset_header()
-        start_pos = self.stream.tell()
+        self.stream.seek(datasize, io.SEEK_CUR)
+        return version, datasize
 
-        asset_context = AssetContext(version, datasize, start_pos, start_pos + datasize)
-
-        yield asset_context
-
-        if asset_context.end_pos - asset_context.start_pos != asset_context.datasize:
-            raise ValueError(
-                f"Asset data size mismatch: expected {asset_context.datasize} bytes, read {asset_context.end_pos - asset_context.start_pos} bytes"
-            )
+    @contextmanager
+    def read_asset(self) -> Iterator[AssetContext]:
+        if self.profiler is not None:
+            # Assets are read right after their name, so the last name read is this asset's
+            self.profiler.begin(self.pending_asset_name or "Unknown", self.stream.tell())
+            self.pending_asset_name = None
+
+        version = None
+        try:
+            version, datasize = self.parse_asset_header()
+            start_pos = self.stream.tell()
+
+            asset_context = AssetContext(version, datasize, start_pos, start_pos + datasize)
+
+            yield asset_context
+
+            if asset_context.end_pos - asset_context.start_pos != asset_context.datasize:
+                raise ValueError(
+                    f"Asset data size mismatch: expected {asset_context.datasize} bytes, read {asset_context.end_pos - asset_context.start_pos} bytes"
+                )
+        finally:
+            # Close the node even when the asset fails to parse, so the profiler stack stays balanced
+            if self.profiler is not None:
+                self.profiler.end(self.stream.tell(), version)
 
 
 class WritingContext:
@@ -0,0 +1,394 @@
+"""Chunk-level diff between two versions of a map, decoding only the chunks whose bytes changed.
+
+Grid cells are reported with ``x`` from the left and ``y`` in file order (from the bottom of the map).
+"""
+
+import hashlib
+import io
+from collections import deque
+from dataclasses import asdict, dataclass, field, fields, is_dataclass
+
+import numpy as np
+
+from .assets.player_scripts import ScriptIndex
+from .context import ParsingContext
+from .map import ASSET_ATTRIBUTES, ASSET_DEPENDENCIES, Map
+from .stream import BinaryStream
+from .validation import AssetHeader, decompress_map, validate_decompressed
+
+# Fields that record where an asset was in the file rather than what it contains
+POSITION_FIELDS = frozenset(("start_pos", "end_pos"))
+
+BLEND_TILE_LAYERS = (
+    "tiles",
+    "blends",
+    "three_way_blends",
+    "cliff_textures",
+    "impassability",
+    "impassability_to_players",
+    "passage_widths",
+    "taintability",
+    "extra_passability",
+    "flammability",
+    "visibility",
+    "buildability",
+    "impassability_to_air_units",
+    "tiberium_growability",
+    "dynamic_shrubbery_density",
+)
+
+
+@dataclass
+class ChunkDiff:
+    """A top-level chunk. ``status`` is one of "added", "removed", "changed" or "unchanged".
+
+    A chunk whose bytes differ but decodes to the same content (for example because the
+    asset table was reordered) is "unchanged".
+    """
+
+    name: str
+    status: str
+    old_digest: str | None = None
+    new_digest: str | None = None
+    old_size: int | None = None
+    new_size: int | None = None
+    fields: list[str] = field(default_factory=list)
+
+
+@dataclass
+class ObjectDiff:
+    key: str
+    status: str
+    type_name: str
+    old_position: tuple[float, float, float] | None = None
+    new_position: tuple[float, float, float] | None = None
+    changes: list[str] = field(default_factory=list)
+
+
+@dataclass
+class ScriptDiff:
+    name: str
+    status: str
+    old_location: tuple[int, tuple[str, ...]] | None = None
+    new_location: tuple[int, tuple[str, ...]] | None = None
+    changes: list[str] = field(default_factory=list)
+
+
+@dataclass
+class GridRegion:
+    """Inclusive bounding box of a cluster of changed cells."""
+
+    x0: int
+    y0: int
+    x1: int
+    y1: int
+    cells: int
+
+
+@dataclass
+class GridDiff:
+    """Changed cells of one grid. Grids that changed size have no regions."""
+
+    chunk: str
+    layer: str
+    old_shape: tuple[int, int] | None
+    new_shape: tuple[int, int] | None
+    changed_cells: int | None
+    regions: list[GridRegion] = field(default_factory=list)
+
+
+@dataclass
+class MapDiff:
+    chunks: list[ChunkDiff] = field(default_factory=list)
+    objects: list[ObjectDiff] = field(default_factory=list)
+    scripts: list[ScriptDiff] = field(default_factory=list)
+    grids: list[GridDiff] = field(default_factory=list)
+
+    @property
+    def changed(self) -> bool:
+        return any(chunk.status != "unchanged" for chunk in self.chunks)
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def _equal(a, b) -> bool:
+    """Compare decoded assets, ignoring where they were in their files."""
+    # Plain equality settles grids and unmoved assets without walking them
+    if a == b:
+        return True
+    if is_dataclass(a) and type(a) is type(b):
+        return all(_equal(getattr(a, f.name), getattr(b, f.name)) for f in fields(a) if f.name not in POSITION_FIELDS)
+    if isinstance(a, (list, tuple)) and isinstance(b, (list, tuple)):
+        return len(a) == len(b) and all(_equal(x, y) for x, y in zip(a, b))
+    return False
+
+
+def differing_fields(a, b) -> list[str]:
+    """Names of the fields of two dataclasses of the same type whose content differs."""
+    return [
+        f.name
+        for f in fields(a)
+        if f.name not in POSITION_FIELDS and not _equal(getattr(a, f.name), getattr(b, f.name))
+    ]
+
+
+def _label_blocks(blocks: np.ndarray) -> np.ndarray:
+    """8-connected component labels of a small boolean grid, 0 for unset cells."""
+    labels = np.zeros(blocks.shape, dtype=np.int64)
+    rows, cols = blocks.shape
+    label = 0
+    for start in zip(*np.nonzero(blocks)):
+        if labels[start]:
+            continue
+        label += 1
+        labels[start] = label
+        queue = deque([start])
+        while queue:
+            y, x = queue.popleft()
+            for ny in range(max(y - 1, 0), min(y + 2, rows)):
+                for nx in range(max(x - 1, 0), min(x + 2, cols)):
+                    if blocks[ny, nx] and not labels[ny, nx]:
+                        labels[ny, nx] = label
+                        queue.append((ny, nx))
+    return labels
+
+
+def changed_regions(mask: np.ndarray, block_size: int = 16) -> list[GridRegion]:
+    """Bounding boxes of the changed cells of a ``[y][x]`` mask.
+
+    Cells are grouped into ``block_size`` square blocks, and blocks with changes that
+    touch (including diagonally) form one region, so nearby edits are reported together.
+    Each region is the tight bounding box of its changed cells.
+    """
+    ys, xs = np.nonzero(mask)
+    if len(ys) == 0:
+        return []
+
+    rows, cols = mask.shape
+    block_rows, block_cols = -(-rows // block_size), -(-cols // block_size)
+    blocks = np.zeros((block_rows, block_cols), dtype=bool)
+    blocks[ys // block_size, xs // block_size] = True
+    labels = _label_blocks(blocks)[ys // block_size, xs // block_size]
+
+    order = np.argsort(labels, kind="stable")
+    labels, xs, ys = labels[order], xs[order], ys[order]
+    starts = np.flatnonzero(np.r_[True, labels[1:] != labels[:-1]])
+    counts = np.diff(np.r_[starts, len(labels)])
+    boxes = zip(
+        np.minimum.reduceat(xs, starts),
+        np.minimum.reduceat(ys, starts),
+        np.maximum.reduceat(xs, starts),
+        np.maximum.reduceat(ys, starts),
+        counts,
+    )
+    return [GridRegion(int(x0), int(y0), int(x1), int(y1), int(cells)) for x0, y0, x1, y1, cells in boxes]
+
+
+def diff_grid(chunk: str, layer: str, old: np.ndarray | None, new: np.ndarray | None) -> GridDiff | None:
+    """Diff two ``[y][x]`` grids, returning None when they are identical."""
+    old_shape = old.shape if old is not None else None
+    new_shape = new.shape if new is not None else None
+    if old_shape != new_shape:
+        return GridDiff(chunk, layer, old_shape, new_shape, None)
+    if old is None:
+        return None
+
+    mask = old != new
+    changed_cells = int(np.count_nonzero(mask))
+    if not changed_cells:
+        return None
+    return GridDiff(chunk, layer, old_shape, new_shape, changed_cells, changed_regions(mask))
+
+
+def _elevations(height_map) -> np.ndarray:
+    # Stored top row first; flip so rows are in file order like the blend tile layers
+    return np.asarray(height_map.elevations)[::-1]
+
+
+def _layer(blend_tile_data, name: str) -> np.ndarray | None:
+    layer = getattr(blend_tile_data, name)
+    if layer is None:
+        return None
+    # Enum layers compare by value once converted to plain integers
+    return np.asarray(layer, dtype=np.int64 if name == "flammability" else None).T
+
+
+def diff_objects(old_objects: list, new_objects: list) -> list[ObjectDiff]:
+    """Match objects by ``uniqueID`` (or type name) and report what changed."""
+
+    def by_key(objects):
+        keyed = {}
+        for obj in objects:
+            base = obj.properties.get("uniqueID", {}).get("value") or obj.type_name
+            key, occurrence = base, 1
+            while key in keyed:
+                occurrence += 1
+                key = f"{base}#{occurrence}"
+            keyed[key] = obj
+        return keyed
+
+    old, new = by_key(old_objects), by_key(new_objects)
+    result = []
+    for key, obj in old.items():
+        other = new.get(key)
+        if other is None:
+            result.append(ObjectDiff(key, "removed", obj.type_name, old_position=obj.position))
+            continue
+
+        changes = [
+            name
+            for name in ("type_name", "position", "angle", "road_type")
+            if not _equal(getattr(obj, name), getattr(other, name))
+        ]
+        changes.extend(
+            name
+            for name in sorted(obj.properties.keys() | other.properties.keys(), key=str)
+            if obj.properties.get(name) != other.properties.get(name)
+        )
+        if changes:
+            result.append(ObjectDiff(key, "changed", other.type_name, obj.position, other.position, changes))
+
+    result.extend(
+        ObjectDiff(key, "added", obj.type_name, new_position=obj.position) for key, obj in new.items() if key not in old
+    )
+    return result
+
+
+def diff_scripts(old_script_lists: list, new_script_lists: list) -> list[ScriptDiff]:
+    """Match scripts by name and report what changed, including moves between players or groups."""
+    old_index, new_index = ScriptIndex(old_script_lists), ScriptIndex(new_script_lists)
+    result = []
+    for name, old_locations in old_index.scripts.items():
+        new_locations = new_index.scripts.get(name, [])
+        for old, new in zip(old_locations, new_locations):
+            changes = differing_fields(old.script, new.script)
+            old_location = (old.player_index, old.group_path)
+            new_location = (new.player_index, new.group_path)
+            if old_location != new_location:
+                changes.append("location")
+            if changes:
+                result.append(ScriptDiff(name, "changed", old_location, new_location, changes))
+
+        for old in old_locations[len(new_locations) :]:
+            result.append(ScriptDiff(name, "removed", old_location=(old.player_index, old.group_path)))
+        for new in new_locations[len(old_locations) :]:
+            result.append(ScriptDiff(name, "added", new_location=(new.player_index, new.group_path)))
+
+    for name, new_locations in new_index.scripts.items():
+        if name not in old_index.scripts:
+            result.extend(
+                ScriptDiff(name, "added", new_location=(new.player_index, new.group_path)) for new in new_locations
+            )
+    return result
+
+
+def _top_level_headers(data: bytes) -> dict[tuple[str, int], AssetHeader]:
+    report = validate_decompressed(data)
+    if not report.valid:
+        issue = report.issues[0]
+        raise ValueError(f"Structurally invalid map: {issue.message} (offset {issue.offset})")
+
+    headers: dict[tuple[str, int], AssetHeader] = {}
+    occurrences = {}
+    for header in report.assets:
+        occurrence = occurrences[header.name] = occurrences.get(header.name, 0) + 1
+        headers[(header.name, occurrence)] = header
+    return headers
+
+
+def _digest(data: bytes, header: AssetHeader) -> str:
+    # Version, datasize and body: the asset index depends on the asset table
+    return hashlib.blake2b(
+        memoryview(data)[header.offset + 4 : header.offset + 10 + header.datasize], digest_size=16
+    ).hexdigest()
+
+
+def chunk_digests(data: bytes) -> dict[tuple[str, int], str]:
+    """Hashes of the top-level chunks of decompressed map data, by asset name and occurrence.
+
+    Raises:
+        ValueError: If the map fails ``sagemap.validation`` checks
+    """
+    return {key: _digest(data, header) for key, header in _top_level_headers(data).items()}
+
+
+class _MapChunks:
+    """Decompressed map data with its top-level asset headers, decoding chunks on demand."""
+
+    def __init__(self, data: bytes):
+        self.data, _ = decompress_map(data)
+        self.headers = _top_level_headers(self.data)
+
+        self.context = ParsingContext(BinaryStream(io.BytesIO(self.data)))
+        self.context.parse_assets()
+        self.map = Map()
+        self.map.assets = self.context.assets
+
+    def digest(self, header: AssetHeader) -> str:
+        return _digest(self.data, header)
+
+    def decode(self, key: tuple[str, int]):
+        name = key[0]
+        for dependency in ASSET_DEPENDENCIES.get(name, ()):
+            if (dependency, 1) in self.headers and getattr(self.map, ASSET_ATTRIBUTES[dependency]) is None:
+                self.decode((dependency, 1))
+
+        self.context.stream.seek(self.headers[key].offset)
+        self.map.parse_asset(self.context.parse_asset_name(), self.context)
+        return getattr(self.map, ASSET_ATTRIBUTES[name])
+
+
+def diff_maps(old_data: bytes, new_data: bytes) -> MapDiff:
+    """Diff two map files' contents, compressed or not.
+
+    Raises:
+        ValueError: If either map fails ``sagemap.validation`` checks
+    """
+    old, new = _MapChunks(old_data), _MapChunks(new_data)
+    result = MapDiff()
+
+    for key, header in old.headers.items():
+        if key not in new.headers:
+            result.chunks.append(ChunkDiff(key[0], "removed", old.digest(header), old_size=header.datasize))
+            continue
+
+        new_header = new.headers[key]
+        chunk = ChunkDiff(
+            key[0], "unchanged", old.digest(header), new.digest(new_header), header.datasize, new_header.datasize
+        )
+        result.chunks.append(chunk)
+        if chunk.old_digest == chunk.new_digest or key[0] not in ASSET_ATTRIBUTES:
+            if chunk.old_digest != chunk.new_digest:
+                chunk.status = "changed"
+            continue
+
+        old_asset, new_asset = old.decode(key), new.decode(key)
+        chunk.fields = differing_fields(old_asset, new_asset)
+        if not chunk.fields:
+            continue
+
+        chunk.status = "changed"
+        if key[0] == "ObjectsList":
+            result.objects.extend(diff_objects(old_asset.object_list, new_asset.object_list))
+        elif key[0] == "PlayerScriptsList":
+            result.scripts.extend(diff_scripts(old_asset.script_lists, new_asset.script_lists))
+        elif key[0] == "HeightMapData":
+            grid = diff_grid(key[0], "elevations", _elevations(old_asset), _elevations(new_asset))
+            result.grids.extend([grid] if grid is not None else [])
+        elif key[0] == "BlendTileData":
+            for layer in BLEND_TILE_LAYERS:
+                grid = diff_grid(key[0], layer, _layer(old_asset, layer), _layer(new_asset, layer))
+                result.grids.extend([grid] if grid is not None else [])
+
+    for key, header in new.headers.items():
+        if key not in old.headers:
+            result.chunks.append(ChunkDiff(key[0], "added", new_digest=new.digest(header), new_size=header.datasize))
+
+    return result
+
+
+def diff_map_files(old_path: str, new_path: str) -> MapDiff:
+    """Diff two map files. See ``diff_maps``."""
+    with open(old_path, "rb") as old_file, open(new_path, "rb") as new_file:
+        return diff_maps(old_file.read(), new_file.read())
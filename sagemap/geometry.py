@@ -0,0 +1,292 @@
+"""Point-in-polygon queries and rasterization for the polygons of a map.
+
+Masks are indexed ``[y][x]`` in file order (rows from the bottom of the map), flipped from ``HeightMapData.elevations``.
+"""
+
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import TYPE_CHECKING, Iterable
+
+import numpy as np
+
+from .constants import CELL_SIZE
+
+if TYPE_CHECKING:
+    from .assets import HeightMapData, Object
+    from .map import Map
+
+# Upper bound on the edges x points matrix of one vectorized even-odd test
+_MAX_TEST_SIZE = 1 << 20
+
+# World height of one elevation step; HeightMapData version 5 and later store 16-bit
+# elevations with sixteen steps to each of these
+ELEVATION_SCALE = CELL_SIZE / 16
+
+
+class PolygonKind(IntEnum):
+    TRIGGER_AREA = 0
+    POLYGON_TRIGGER = 1
+    STANDING_WATER = 2
+    STANDING_WAVE = 3
+
+
+def object_positions(objects: list["Object"]) -> np.ndarray:
+    """Positions of objects as an ``(N, 3)`` float array."""
+    return np.array([obj.position for obj in objects], dtype=np.float64).reshape(-1, 3)
+
+
+def _edges(vertices: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    closed = np.roll(vertices, -1, axis=0)
+    return vertices[:, 0], vertices[:, 1], closed[:, 0], closed[:, 1]
+
+
+def point_in_polygon(vertices: np.ndarray, points: np.ndarray) -> np.ndarray:
+    """Even-odd test of ``points`` (``(N, 2+)``) against one polygon (``(V, 2)``).
+
+    Returns:
+        Boolean mask of the points inside the polygon
+    """
+    x1, y1, x2, y2 = _edges(np.asarray(vertices, dtype=np.float64))
+    slope = np.divide(x2 - x1, y2 - y1, out=np.zeros_like(x1), where=y2 != y1)[:, None]
+    inside = np.zeros(len(points), dtype=bool)
+
+    chunk = max(1, _MAX_TEST_SIZE // max(len(x1), 1))
+    for start in range(0, len(points), chunk):
+        x = points[start : start + chunk, 0]
+        y = points[start : start + chunk, 1]
+        # Edges straddling the horizontal ray from each point, crossed to its right
+        straddles = (y1[:, None] > y) != (y2[:, None] > y)
+        crossings = straddles & (x < x1[:, None] + (y - y1[:, None]) * slope)
+        inside[start : start + chunk] = np.count_nonzero(crossings, axis=0) % 2 == 1
+
+    return inside
+
+
+def _first_column_at(x: np.ndarray, width: int, border: int, cell_size: float) -> np.ndarray:
+    """First grid columns whose world x is at least ``x``, clipped to ``[0, width]``."""
+    column = np.clip(np.ceil(x / cell_size) + border, -1, width + 1).astype(np.int64)
+    # Division can round either way; settle the column on the world coordinates themselves
+    column -= (column - 1 - border) * cell_size >= x
+    column += (column - border) * cell_size < x
+    return np.clip(column, 0, width)
+
+
+def rasterize_polygon(
+    vertices: np.ndarray, width: int, height: int, border: int = 0, cell_size: float = CELL_SIZE
+) -> np.ndarray:
+    """Scanline fill of a polygon in world units onto a ``(height, width)`` grid.
+
+    A cell is set when its grid point, at world ``((x - border) * cell_size, (y - border) *
+    cell_size)``, is inside the polygon by the same even-odd rule as ``point_in_polygon``.
+    """
+    mask = np.zeros((height, width), dtype=bool)
+    vertices = np.asarray(vertices, dtype=np.float64)
+    if len(vertices) < 3:
+        return mask
+
+    # Crossings are computed in world units exactly as ``point_in_polygon`` does, so grid
+    # points lying on an edge are classified the same way by both
+    cells = vertices[:, 1] / cell_size + border
+    low = max(int(np.ceil(cells.min())) - 1, 0)
+    high = min(int(np.floor(cells.max())) + 1, height - 1)
+    if low > high:
+        return mask
+
+    x1, y1, x2, y2 = _edges(vertices)
+    rows = ((np.arange(low, high + 1) - border) * cell_size)[:, None]
+    straddles = (y1 > rows) != (y2 > rows)
+    slope = np.divide(x2 - x1, y2 - y1, out=np.zeros_like(x1), where=y2 != y1)
+    crossings = np.where(straddles, x1 + (rows - y1) * slope, np.inf)
+    crossings.sort(axis=1)
+
+    # Every row has an even number of crossings; cells from each even one up to the next are inside
+    starts, ends = crossings[:, 0::2], crossings[:, 1 : 2 * (crossings.shape[1] // 2) : 2]
+    starts = starts[:, : ends.shape[1]]
+    row_index, span = np.nonzero(np.isfinite(starts))
+    first = _first_column_at(starts[row_index, span], width, border, cell_size)
+    last = _first_column_at(ends[row_index, span], width, border, cell_size)
+
+    coverage = np.zeros((len(rows), width + 1), dtype=np.int32)
+    np.add.at(coverage, (row_index, first), 1)
+    np.add.at(coverage, (row_index, last), -1)
+    mask[low : high + 1] = np.cumsum(coverage[:, :width], axis=1) > 0
+    return mask
+
+
+@dataclass
+class PolygonSet:
+    """Polygons of a map in world units.
+
+    Polygon ``i`` has kind ``kinds[i]``, name ``names[i]``, comes from the asset
+    ``sources[i]`` and has the vertices ``vertices[offsets[i]:offsets[i + 1]]``.
+    ``bounds[i]`` is its ``(min_x, min_y, max_x, max_y)`` bounding box.
+    """
+
+    kinds: np.ndarray
+    names: list[str]
+    sources: list
+    offsets: np.ndarray
+    vertices: np.ndarray
+    bounds: np.ndarray
+
+    @classmethod
+    def from_polygons(cls, polygons: Iterable[tuple[PolygonKind, str, list, object]]) -> "PolygonSet":
+        """Build a set from ``(kind, name, points, source)`` tuples; points beyond x and y are dropped."""
+        kinds, names, sources, arrays = [], [], [], []
+        for kind, name, points, source in polygons:
+            kinds.append(kind)
+            names.append(name)
+            sources.append(source)
+            arrays.append(np.asarray(points, dtype=np.float64).reshape(len(points), -1)[:, :2])
+
+        offsets = np.zeros(len(arrays) + 1, dtype=np.int64)
+        np.cumsum([len(array) for array in arrays], out=offsets[1:])
+        vertices = np.concatenate(arrays) if arrays else np.zeros((0, 2))
+        bounds = np.array(
+            [
+                (*array.min(axis=0), *array.max(axis=0)) if len(array) else (np.inf, np.inf, -np.inf, -np.inf)
+                for array in arrays
+            ],
+            dtype=np.float64,
+        ).reshape(-1, 4)
+        return cls(np.array(kinds, dtype=np.int8), names, sources, offsets, vertices, bounds)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def polygon(self, index: int) -> np.ndarray:
+        return self.vertices[self.offsets[index] : self.offsets[index + 1]]
+
+    def of_kinds(self, *kinds: PolygonKind) -> np.ndarray:
+        """Indices of the polygons of the given kinds, or of every polygon."""
+        if not kinds:
+            return np.arange(len(self))
+        return np.flatnonzero(np.isin(self.kinds, [int(kind) for kind in kinds]))
+
+    def contains(self, index: int, points: np.ndarray) -> np.ndarray:
+        """Boolean mask of the points (``(N, 2+)``, world units) inside polygon ``index``."""
+        points = np.asarray(points, dtype=np.float64)
+        min_x, min_y, max_x, max_y = self.bounds[index]
+        candidates = np.flatnonzero(
+            (points[:, 0] >= min_x) & (points[:, 0] <= max_x) & (points[:, 1] >= min_y) & (points[:, 1] <= max_y)
+        )
+        inside = np.zeros(len(points), dtype=bool)
+        if len(candidates) and len(self.polygon(index)) >= 3:
+            inside[candidates] = point_in_polygon(self.polygon(index), points[candidates])
+        return inside
+
+    def locate(self, points: np.ndarray, *kinds: PolygonKind) -> tuple[np.ndarray, np.ndarray]:
+        """Every (point, polygon) pair where the point lies inside the polygon.
+
+        Args:
+            points: ``(N, 2+)`` array of world positions, e.g. from ``object_positions``
+            kinds: Only test polygons of these kinds
+
+        Returns:
+            Parallel arrays of point indices and polygon indices, ordered by polygon
+        """
+        points = np.asarray(points, dtype=np.float64)
+        order = np.argsort(points[:, 0], kind="stable")
+        sorted_x = points[order, 0]
+
+        point_indices, polygon_indices = [], []
+        for index in self.of_kinds(*kinds):
+            if self.offsets[index + 1] - self.offsets[index] < 3:
+                continue
+            min_x, min_y, max_x, max_y = self.bounds[index]
+            start = np.searchsorted(sorted_x, min_x, side="left")
+            end = np.searchsorted(sorted_x, max_x, side="right")
+            candidates = order[start:end]
+            y = points[candidates, 1]
+            candidates = candidates[(y >= min_y) & (y <= max_y)]
+            if not len(candidates):
+                continue
+
+            inside = candidates[point_in_polygon(self.polygon(index), points[candidates])]
+            point_indices.append(inside)
+            polygon_indices.append(np.full(len(inside), index, dtype=np.int64))
+
+        if not point_indices:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        return np.concatenate(point_indices), np.concatenate(polygon_indices)
+
+    def inside_any(self, points: np.ndarray, *kinds: PolygonKind) -> np.ndarray:
+        """Boolean mask of the points inside at least one polygon of the given kinds."""
+        inside = np.zeros(len(points), dtype=bool)
+        inside[self.locate(points, *kinds)[0]] = True
+        return inside
+
+    def rasterize(self, index: int, width: int, height: int, border: int = 0) -> np.ndarray:
+        return rasterize_polygon(self.polygon(index), width, height, border)
+
+    def terrain_mask(self, index: int, height_map_data: "HeightMapData") -> np.ndarray:
+        """Height map cells inside polygon ``index``, indexed ``[y][x]`` in file order."""
+        hmd = height_map_data
+        return self.rasterize(index, hmd.width, hmd.height, hmd.border_width)
+
+
+def polygons_from_map(map_obj: "Map", *kinds: PolygonKind) -> PolygonSet:
+    """Collect the polygons of a map, optionally only those of the given kinds."""
+    wanted = set(kinds or PolygonKind)
+
+    def collect():
+        if PolygonKind.TRIGGER_AREA in wanted and map_obj.trigger_areas is not None:
+            for area in map_obj.trigger_areas.trigger_areas:
+                yield PolygonKind.TRIGGER_AREA, area.name, area.points, area
+        if PolygonKind.POLYGON_TRIGGER in wanted and map_obj.polygon_triggers is not None:
+            for trigger in map_obj.polygon_triggers.polygon_triggers:
+                yield PolygonKind.POLYGON_TRIGGER, trigger.name, trigger.points, trigger
+        if PolygonKind.STANDING_WATER in wanted and map_obj.standing_water_areas is not None:
+            for area in map_obj.standing_water_areas.areas:
+                yield PolygonKind.STANDING_WATER, area.name, area.points, area
+        if PolygonKind.STANDING_WAVE in wanted and map_obj.standing_wave_areas is not None:
+            for area in map_obj.standing_wave_areas.areas:
+                yield PolygonKind.STANDING_WAVE, area.name, area.points, area
+
+    return PolygonSet.from_polygons(collect())
+
+
+def terrain_heights(height_map_data: "HeightMapData") -> np.ndarray:
+    """World heights of the height map cells, indexed ``[y][x]`` in file order."""
+    hmd = height_map_data
+    scale = ELEVATION_SCALE / 16 if hmd.version >= 5 else ELEVATION_SCALE
+    return np.asarray(hmd.elevations, dtype=np.float64)[::-1] * scale
+
+
+def river_quads(lines: list[tuple[tuple[float, float], tuple[float, float]]]) -> list[np.ndarray]:
+    """Quads of the strip between consecutive ``(left bank, right bank)`` lines of a river."""
+    banks = np.asarray(lines, dtype=np.float64).reshape(-1, 2, 2)
+    return [np.concatenate((banks[i], banks[i + 1][::-1])) for i in range(len(banks) - 1)]
+
+
+def water_mask(map_obj: "Map") -> np.ndarray:
+    """Height map cells under water, indexed ``[y][x]`` in file order.
+
+    A cell is under water when it lies inside a standing water area, a river strip or a
+    water or river polygon trigger, and its terrain is below the height of that water.
+    Polygon triggers store their water height as the z of their points.
+    """
+    hmd = map_obj.height_map_data
+    heights = terrain_heights(hmd)
+    mask = np.zeros((hmd.height, hmd.width), dtype=bool)
+
+    def flood(points, water_height: float):
+        covered = rasterize_polygon(points, hmd.width, hmd.height, hmd.border_width)
+        rows = np.flatnonzero(covered.any(axis=1))
+        if len(rows):
+            window = slice(rows[0], rows[-1] + 1)
+            mask[window] |= covered[window] & (heights[window] < water_height)
+
+    if map_obj.standing_water_areas is not None:
+        for area in map_obj.standing_water_areas.areas:
+            flood(area.points, area.water_height)
+    if map_obj.river_areas is not None:
+        for river in map_obj.river_areas.areas:
+            for quad in river_quads(river.lines):
+                flood(quad, river.water_height)
+    if map_obj.polygon_triggers is not None:
+        for trigger in map_obj.polygon_triggers.polygon_triggers:
+            if (trigger.is_water or trigger.is_river) and trigger.points:
+                flood([point[:2] for point in trigger.points], trigger.points[0][2])
+
+    return mask
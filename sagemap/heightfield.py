@@ -0,0 +1,248 @@
+"""Array-backed editing of a height map, with dirty-region tracking.
+
+Cells are indexed ``[y][x]`` in file order (rows from the bottom of the map) and regions are half-open.
+"""
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from .assets import HeightMapData
+
+# Dirty regions kept before they are merged into their bounding box
+MAX_DIRTY_REGIONS = 64
+
+
+@dataclass(frozen=True)
+class Region:
+    """Half-open rectangle of cells."""
+
+    x0: int
+    y0: int
+    x1: int
+    y1: int
+
+    def union(self, other: "Region") -> "Region":
+        return Region(min(self.x0, other.x0), min(self.y0, other.y0), max(self.x1, other.x1), max(self.y1, other.y1))
+
+
+class HeightField:
+    """Elevations of a height map in an array buffer, edited by region.
+
+    Args:
+        height_map_data: The height map to edit; its ``elevations`` are kept in sync
+        on_change: Called after every edit that changed a cell
+    """
+
+    def __init__(self, height_map_data: "HeightMapData", on_change: Callable[[], None] | None = None):
+        self.height_map_data = height_map_data
+        self.on_change = on_change
+        self.width = height_map_data.width
+        self.height = height_map_data.height
+        self.max_value = 0xFFFF if height_map_data.version >= 5 else 0xFF
+        self._values = np.array(height_map_data.elevations, dtype=np.int64)[::-1].copy()
+        self._row_min = self._values.min(axis=1)
+        self._row_max = self._values.max(axis=1)
+        self.dirty: list[Region] = []
+        self._update_extremes()
+
+    @property
+    def values(self) -> np.ndarray:
+        """Read-only view of the elevations, ``[y][x]`` in file order, after a ``sync``."""
+        self.sync()
+        view = self._values.view()
+        view.flags.writeable = False
+        return view
+
+    @property
+    def min_height(self) -> int:
+        return self.height_map_data.min_height
+
+    @property
+    def max_height(self) -> int:
+        return self.height_map_data.max_height
+
+    @property
+    def dirty_bounds(self) -> Region | None:
+        """Bounding box of every dirty region."""
+        bounds = None
+        for region in self.dirty:
+            bounds = region if bounds is None else bounds.union(region)
+        return bounds
+
+    def clear_dirty(self):
+        self.dirty = []
+
+    def sync(self) -> int:
+        """Read back edits made directly to ``elevations``, recording them as dirty.
+
+        Returns:
+            The number of cells that differed from the buffer
+        """
+        return self._refresh(0, self.height)
+
+    def _refresh(self, y0: int, y1: int) -> int:
+        """Read back rows ``y0:y1`` from ``elevations`` where they were edited directly."""
+        y0, y1 = max(y0, 0), min(y1, self.height)
+        if y0 >= y1:
+            return 0
+        # The nested lists are top-down
+        rows = np.array(self.height_map_data.elevations[self.height - y1 : self.height - y0], dtype=np.int64)[::-1]
+        current = self._values[y0:y1]
+        changed = rows != current
+        if not changed.any():
+            return 0
+        current[...] = rows
+        self._record(Region(0, y0, self.width, y1), changed)
+        return int(np.count_nonzero(changed))
+
+    def _clip(self, x0: int, y0: int, x1: int, y1: int) -> Region:
+        region = Region(max(x0, 0), max(y0, 0), min(x1, self.width), min(y1, self.height))
+        self._refresh(region.y0, region.y1)
+        return region
+
+    def _update_extremes(self):
+        self.height_map_data.min_height = int(self._row_min.min())
+        self.height_map_data.max_height = int(self._row_max.max())
+
+    def _commit(self, region: Region, block: np.ndarray) -> int:
+        """Store new values for a region, returning the number of cells that changed."""
+        block = np.clip(np.rint(block), 0, self.max_value).astype(np.int64)
+        current = self._values[region.y0 : region.y1, region.x0 : region.x1]
+        changed = block != current
+        if not changed.any():
+            return 0
+
+        current[...] = block
+        dirty = self._record(region, changed)
+
+        elevations = self.height_map_data.elevations
+        for y in range(dirty.y0, dirty.y1):
+            # The nested lists are top-down
+            elevations[self.height - 1 - y] = self._values[y].tolist()
+        return int(np.count_nonzero(changed))
+
+    def _record(self, region: Region, changed: np.ndarray) -> Region:
+        """Track cells of a region that changed in the buffer, returning their bounding box."""
+        rows = np.flatnonzero(changed.any(axis=1))
+        columns = np.flatnonzero(changed.any(axis=0))
+        y0, y1 = region.y0 + int(rows[0]), region.y0 + int(rows[-1]) + 1
+        x0, x1 = region.x0 + int(columns[0]), region.x0 + int(columns[-1]) + 1
+
+        self._row_min[y0:y1] = self._values[y0:y1].min(axis=1)
+        self._row_max[y0:y1] = self._values[y0:y1].max(axis=1)
+        self._update_extremes()
+
+        dirty = Region(x0, y0, x1, y1)
+        self.dirty.append(dirty)
+        if len(self.dirty) > MAX_DIRTY_REGIONS:
+            self.dirty = [self.dirty_bounds]
+        if self.on_change is not None:
+            self.on_change()
+        return dirty
+
+    def region(self, x0: int, y0: int, x1: int, y1: int) -> np.ndarray:
+        """Copy of the elevations of a region, clipped to the map."""
+        region = self._clip(x0, y0, x1, y1)
+        return self._values[region.y0 : region.y1, region.x0 : region.x1].copy()
+
+    def fill(self, x0: int, y0: int, x1: int, y1: int, value: int) -> int:
+        """Set every cell of a region to ``value``. Returns the number of cells changed."""
+        region = self._clip(x0, y0, x1, y1)
+        if region.x0 >= region.x1 or region.y0 >= region.y1:
+            return 0
+        return self._commit(region, np.full((region.y1 - region.y0, region.x1 - region.x0), value))
+
+    def _disk(self, x: int, y: int, radius: float) -> tuple[Region, np.ndarray, np.ndarray]:
+        """Bounding region of a disk clipped to the map, the disk mask and distances within it."""
+        extent = int(radius) + 1
+        region = self._clip(x - extent, y - extent, x + extent + 1, y + extent + 1)
+        dy, dx = np.ogrid[region.y0 - y : region.y1 - y, region.x0 - x : region.x1 - x]
+        distance = np.hypot(dx, dy)
+        return region, distance <= radius, distance
+
+    def flatten_disk(self, x: int, y: int, radius: float, value: int | None = None) -> int:
+        """Set the cells within ``radius`` of a cell to ``value``, by default the elevation of that cell."""
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return 0
+        region, inside, _ = self._disk(x, y, radius)
+        value = self._values[y, x] if value is None else value
+        block = self._values[region.y0 : region.y1, region.x0 : region.x1].copy()
+        block[inside] = value
+        return self._commit(region, block)
+
+    def brush(self, x: int, y: int, radius: float, amount: float) -> int:
+        """Raise the cells within ``radius`` of a cell, or lower them with a negative ``amount``.
+
+        The change falls off linearly from ``amount`` at the centre to nothing at the edge.
+        """
+        region, inside, distance = self._disk(x, y, radius)
+        if not inside.any():
+            return 0
+        block = self._values[region.y0 : region.y1, region.x0 : region.x1].astype(np.float64)
+        block += np.where(inside, amount * (1 - distance / max(radius, 1)), 0)
+        return self._commit(region, block)
+
+    def smooth(self, x0: int, y0: int, x1: int, y1: int, iterations: int = 1) -> int:
+        """Replace every cell of a region with the mean of its 3x3 neighbourhood.
+
+        Neighbours outside the region are read but not changed; the edge of the map repeats.
+        """
+        region = self._clip(x0, y0, x1, y1)
+        if region.x0 >= region.x1 or region.y0 >= region.y1:
+            return 0
+
+        # One ring of neighbours around the region, repeating the edge of the map
+        self._refresh(region.y0 - 1, region.y1 + 1)
+        rows = np.clip(np.arange(region.y0 - 1, region.y1 + 1), 0, self.height - 1)
+        columns = np.clip(np.arange(region.x0 - 1, region.x1 + 1), 0, self.width - 1)
+        window = self._values[np.ix_(rows, columns)].astype(np.float64)
+        for _ in range(iterations):
+            total = sum(
+                window[dy : dy + window.shape[0] - 2, dx : dx + window.shape[1] - 2]
+                for dy in range(3)
+                for dx in range(3)
+            )
+            window[1:-1, 1:-1] = total / 9
+        return self._commit(region, window[1:-1, 1:-1])
+
+    def paste(self, x: int, y: int, patch: np.ndarray) -> int:
+        """Copy a ``[y][x]`` patch with its first cell at ``(x, y)``, clipped to the map."""
+        patch = np.asarray(patch)
+        region = self._clip(x, y, x + patch.shape[1], y + patch.shape[0])
+        if region.x0 >= region.x1 or region.y0 >= region.y1:
+            return 0
+        return self._commit(region, patch[region.y0 - y : region.y1 - y, region.x0 - x : region.x1 - x])
+
+    def set_cells(self, xs: np.ndarray, ys: np.ndarray, values: np.ndarray | int) -> int:
+        """Set scattered cells at once; where a cell is given more than once, the last value wins."""
+        xs, ys = np.asarray(xs), np.asarray(ys)
+        if not len(xs):
+            return 0
+        region = Region(int(xs.min()), int(ys.min()), int(xs.max()) + 1, int(ys.max()) + 1)
+        self._refresh(region.y0, region.y1)
+        block = self._values[region.y0 : region.y1, region.x0 : region.x1].copy()
+        block[ys - region.y0, xs - region.x0] = values
+        return self._commit(region, block)
+
+    def patch(self, chunk: bytes) -> bytearray:
+        """The original encoding of the height map with the elevations of the dirty regions rewritten.
+
+        Args:
+            chunk: The chunk as parsed, from its version to its end, with the same dimensions
+        """
+        height_map = self.height_map_data
+        data = bytearray(chunk)
+        # Version and datasize, then width, height, border width and border count
+        offset = 6 + 16 + len(height_map.borders) * (16 if height_map.version >= 6 else 8) + 4
+        cell_size = 2 if height_map.version >= 5 else 1
+        dtype = "<u2" if cell_size == 2 else "u1"
+        for region in self.dirty:
+            for y in range(region.y0, region.y1):
+                start = offset + (y * self.width + region.x0) * cell_size
+                data[start : start + (region.x1 - region.x0) * cell_size] = (
+                    self._values[y, region.x0 : region.x1].astype(dtype).tobytes()
+                )
+        return data
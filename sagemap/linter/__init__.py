@@ -1,4 +1,5 @@
+from .engine import Linter, LintReport, Rule
 from .errors import LintError, Severity
-from .linter import lint_map
+from .linter import lint_map, lint_map_report
 
-__all__ = ["lint_map", "LintError", "Severity"]
+__all__ = ["lint_map", "lint_map_report", "Linter", "LintReport", "Rule", "LintError", "Severity"]
@@ -2,18 +2,27 @@
 
 import argparse
 import inspect
+import io
 import sys
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 from typing import TYPE_CHECKING, Type
 
-from ..map import parse_map_from_path
+from ..map import parse_map, parse_map_from_path, write_map_to_path
 from . import errors as errors_module
-from .errors import LintError, Severity
-from .linter import lint_map
+from .engine import Linter, LintReport
+from .errors import LintError, MapParsingError, Severity
+from .fixes import apply_fixes
+from .formats import FORMATTERS
+from .linter import default_rules
+from .watch import IncrementalLinter, LintDelta, MapWatcher, iter_map_files
 
 if TYPE_CHECKING:
     from .errors import LintError
 
+SEVERITY_ORDER = {"INFO": 0, "WARNING": 1, "ERROR": 2}
+
 
 def format_error(error: "LintError", verbose: bool = False) -> str:
     """Format a lint error for display."""
@@ -33,7 +42,7 @@ def format_error(error: "LintError", verbose: bool = False) -> str:
         return str(error)
 
 
-def main():
+def main(argv: list[str] | None = None):
     """Main entry point for the CLI."""
     parser = argparse.ArgumentParser(
         description="Lint BFME map files for common issues and best practices.",
@@ -41,13 +50,23 @@ def main():
         epilog="""
 Examples:
   %(prog)s map.map
+  %(prog)s maps/ --format sarif > lint.sarif
   %(prog)s map.map --exclude MAP-013 MAP-014
   %(prog)s map.map --severity ERROR
   %(prog)s map.map --no-color --quiet
+  %(prog)s map.map --timings --jobs 4 --processes 2
+  %(prog)s maps/ --watch
+  %(prog)s map.map --fix
         """,
     )
 
-    parser.add_argument("map_file", type=Path, help="Path to the .map file to lint")
+    parser.add_argument(
+        "map_files",
+        type=Path,
+        nargs="+",
+        metavar="map_file",
+        help="Paths to .map files, or folders to lint all .map files in",
+    )
 
     parser.add_argument(
         "-e", "--exclude", nargs="+", metavar="CODE", help="Error codes to exclude from results (e.g., MAP-013 MAP-014)"
@@ -57,6 +76,14 @@ Examples:
         "-s", "--severity", choices=["ERROR", "WARNING", "INFO"], help="Only show errors of this severity or higher"
     )
 
+    parser.add_argument(
+        "-f",
+        "--format",
+        choices=["text", *FORMATTERS],
+        default="text",
+        help="Output format; all but text write one record per error to stdout, map by map (default: text)",
+    )
+
     parser.add_argument("--no-color", action="store_true", help="Disable colored output")
 
     parser.add_argument("-q", "--quiet", action="store_true", help="Only show error count, not individual errors")
@@ -65,30 +92,201 @@ Examples:
 
     parser.add_argument("--list-codes", action="store_true", help="List all possible error codes and exit")
 
-    args = parser.parse_args()
+    parser.add_argument(
+        "-j", "--jobs", type=int, default=1, metavar="N", help="Run the rules on N threads (default: 1)"
+    )
+
+    parser.add_argument(
+        "-p",
+        "--processes",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Run the rules that spend their time in Python on N processes, pickling the map for each (default: 0)",
+    )
+
+    parser.add_argument(
+        "--fix",
+        action="store_true",
+        help="Apply the automatic fixes of the errors found, write each map back once and report what remains",
+    )
+
+    parser.add_argument(
+        "-w",
+        "--watch",
+        action="store_true",
+        help="Keep running and lint maps again when they are saved, printing the errors that appeared or were fixed",
+    )
+
+    parser.add_argument(
+        "--timings", action="store_true", help="Show the time spent in each rule and the objects it checked"
+    )
+
+    args = parser.parse_args(argv)
 
     if args.list_codes:
         print_error_codes()
         return 0
 
-    if not args.map_file.exists():
-        print(f"Error: Map file not found: {args.map_file}", file=sys.stderr)
-        return 1
+    for path in args.map_files:
+        if not path.exists():
+            print(f"Error: Map file not found: {path}", file=sys.stderr)
+            return 1
+
+    if args.watch and args.format != "text":
+        parser.error("--watch only supports the text format")
+    if args.watch and args.fix:
+        parser.error("--watch cannot be combined with --fix")
+
+    linter = Linter(default_rules(), exclude_codes=args.exclude)
 
+    if args.watch:
+        return watch(args, linter)
+
+    formatter = FORMATTERS[args.format](sys.stdout) if args.format != "text" else None
+    executor, process_executor = create_executors(args)
+    failed = False
+
+    if formatter:
+        formatter.start()
     try:
-        print(f"Linting {args.map_file}...")
-        map_obj = parse_map_from_path(str(args.map_file))
-    except Exception as e:
-        print(f"Error: Failed to parse map file: {e}", file=sys.stderr)
-        return 1
+        for path in iter_map_files(args.map_files):
+            lint = fix_file if args.fix else lint_file
+            errors, report = lint(path, linter, executor, verbose=formatter is None, process_executor=process_executor)
+
+            if args.severity:
+                min_severity = SEVERITY_ORDER[args.severity]
+                errors = [err for err in errors if SEVERITY_ORDER.get(err.severity, 0) >= min_severity]
+            failed |= report is None or any(err.severity == Severity.ERROR for err in errors)
+
+            if formatter:
+                formatter.write(str(path), errors)
+                if args.timings and report:
+                    print(f"{path}:\n{format_timings(report)}", file=sys.stderr)
+            elif report:
+                print_text_report(errors, args)
+                if args.timings:
+                    print()
+                    print(format_timings(report))
+    finally:
+        if formatter:
+            formatter.finish()
+        shutdown_executors(executor, process_executor)
+
+    return 1 if failed else 0
+
+
+def watch(args: argparse.Namespace, linter: Linter) -> int:
+    """Lint the maps again every time they are saved, until interrupted."""
+    incremental = IncrementalLinter(linter)
+    watcher = MapWatcher(args.map_files)
+    executor, process_executor = create_executors(args)
+    print(f"Watching {', '.join(map(str, args.map_files))} for changes, press Ctrl+C to stop...")
+    try:
+        for paths in watcher.watch():
+            for path in incremental.states.keys() - watcher.stats.keys():
+                incremental.forget(path)
+            for path in paths:
+                print_delta(incremental.lint(path, executor=executor, process_executor=process_executor), args)
+    except KeyboardInterrupt:
+        return 0
+    finally:
+        shutdown_executors(executor, process_executor)
+
 
-    errors = lint_map(map_obj, exclude_codes=args.exclude)
+def create_executors(args: argparse.Namespace) -> tuple[ThreadPoolExecutor | None, ProcessPoolExecutor | None]:
+    """The thread and process executors requested with ``--jobs`` and ``--processes``."""
+    executor = ThreadPoolExecutor(args.jobs) if args.jobs > 1 else None
+    process_executor = ProcessPoolExecutor(args.processes) if args.processes > 0 else None
+    return executor, process_executor
 
+
+def shutdown_executors(*executors: Executor | None):
+    for executor in executors:
+        if executor:
+            executor.shutdown()
+
+
+def print_delta(delta: LintDelta, args: argparse.Namespace):
+    """Print the errors of a map that appeared (+) and were fixed (-) since it was last linted."""
     if args.severity:
-        severity_order = {"INFO": 0, "WARNING": 1, "ERROR": 2}
-        min_severity = severity_order[args.severity]
-        errors = [err for err in errors if severity_order.get(err.severity, 0) >= min_severity]
+        min_severity = SEVERITY_ORDER[args.severity]
+        delta.added, delta.removed = (
+            [err for err in errors if SEVERITY_ORDER.get(err.severity, 0) >= min_severity]
+            for errors in (delta.added, delta.removed)
+        )
+
+    rules = ", ".join(result.name for result in delta.rules) or "none"
+    print(
+        f"\n[{time.strftime('%H:%M:%S')}] {delta.path}: {len(delta.added)} new, {len(delta.removed)} fixed (rules run: {rules})"
+    )
+    if not args.quiet:
+        for sign, errors in (("-", delta.removed), ("+", delta.added)):
+            for error in errors:
+                print(f"  {sign} {str(error) if args.no_color else format_error(error, args.verbose)}")
+    if args.timings and delta.rules:
+        print(format_timings(LintReport(delta.errors, delta.rules)))
+
+
+def lint_file(
+    path: Path,
+    linter: Linter,
+    executor: ThreadPoolExecutor | None,
+    verbose: bool,
+    process_executor: ProcessPoolExecutor | None = None,
+) -> tuple[list["LintError"], "LintReport | None"]:
+    """Parse and lint a map. A map that fails to parse is reported as a ``MapParsingError``."""
+    try:
+        if verbose:
+            print(f"Linting {path}...")
+        # Only the assets the rules read are decoded
+        map_obj = parse_map_from_path(str(path), assets=linter.assets)
+    except Exception as e:
+        print(f"Error: Failed to parse map file {path}: {e}", file=sys.stderr)
+        return [MapParsingError(e)], None
 
+    report = linter.run(map_obj, executor=executor, process_executor=process_executor)
+    return report.errors, report
+
+
+def fix_file(
+    path: Path,
+    linter: Linter,
+    executor: ThreadPoolExecutor | None,
+    verbose: bool,
+    process_executor: ProcessPoolExecutor | None = None,
+) -> tuple[list["LintError"], "LintReport | None"]:
+    """Apply the fixes of a map's errors, write it back once and lint it again."""
+    try:
+        if verbose:
+            print(f"Fixing {path}...")
+        data = path.read_bytes()
+        # Every asset is decoded, since the map is written back
+        map_obj = parse_map(io.BytesIO(data))
+    except Exception as e:
+        print(f"Error: Failed to parse map file {path}: {e}", file=sys.stderr)
+        return [MapParsingError(e)], None
+
+    report = linter.run(map_obj, executor=executor, process_executor=process_executor)
+    summary = apply_fixes(map_obj, [error.fix for error in report.errors if error.fix is not None])
+    if summary.assets:
+        # Uncompressed maps are parsed from the file contents as they are
+        try:
+            write_map_to_path(map_obj, str(path), compress=map_obj.source != data, incremental=True)
+        except Exception as e:
+            print(f"Error: Failed to write fixed map file {path}: {e}", file=sys.stderr)
+            return report.errors, None
+        report = linter.run(map_obj, executor=executor, process_executor=process_executor)
+
+    print(
+        f"Applied {summary.fixes} fix(es) to {path}: {summary.cells} height map cell(s), "
+        f"{summary.objects} object(s) and {summary.properties} propert(y/ies) modified",
+        file=sys.stdout if verbose else sys.stderr,
+    )
+    return report.errors, report
+
+
+def print_text_report(errors: list["LintError"], args: argparse.Namespace):
     if not args.quiet:
         if errors:
             for error in errors:
@@ -105,7 +303,19 @@ Examples:
 
     print(f"\nSummary: {error_count} error(s), {warning_count} warning(s), {info_count} info")
 
-    return 1 if error_count > 0 else 0
+
+def format_timings(report: "LintReport") -> str:
+    """Format the time spent in each rule as a table, slowest first."""
+    results = sorted(report.rules, key=lambda result: result.seconds, reverse=True)
+    width = max([len("Rule"), *(len(result.name) for result in results)])
+    lines = [f"{'Rule':<{width}} {'Time (ms)':>10} {'Objects':>8} {'Errors':>7}"]
+    for result in results:
+        lines.append(
+            f"{result.name:<{width}} {result.seconds * 1000:>10.1f} {result.objects:>8} {len(result.errors):>7}"
+        )
+    total = sum(result.seconds for result in results)
+    lines.append(f"{'Total':<{width}} {total * 1000:>10.1f}")
+    return "\n".join(lines)
 
 
 def print_error_codes():
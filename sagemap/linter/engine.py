@@ -0,0 +1,247 @@
+"""Rule engine of the linter: rules, the single-pass object dispatch and entry point rule packs."""
+
+import logging
+import time
+from concurrent.futures import Executor
+from dataclasses import dataclass, field
+from functools import lru_cache
+from importlib.metadata import entry_points
+from typing import TYPE_CHECKING, Iterable
+
+from ..map import required_assets
+from .errors import LintError, MapParsingError
+
+if TYPE_CHECKING:
+    from ..assets import Object
+    from ..map import Map
+
+ENTRY_POINT_GROUP = "sagemap.lint_rules"
+
+
+class Rule:
+    """A lint rule, instantiated once for every map it checks.
+
+    Subclasses set up their state in ``__init__``, receive the objects they subscribe to
+    in ``visit``, in file order, and run map-wide checks in ``finish``. Problems are
+    reported with ``report``.
+    """
+
+    name: str
+    # Codes the rule can report; a rule whose codes are all excluded is not run
+    codes: tuple[str, ...] = ()
+    # Map attributes the rule reads, so maps can be parsed with only those; none means every asset
+    assets: tuple[str, ...] = ()
+    # Objects passed to ``visit``, by exact type name or by type name prefix; "" matches every object
+    object_types: tuple[str, ...] = ()
+    object_prefixes: tuple[str, ...] = ()
+    # Spends its time in Python code rather than NumPy, so it runs on a process executor if given one
+    holds_gil: bool = False
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if "name" not in cls.__dict__:
+            cls.name = cls.__name__
+
+    def __init__(self, map_obj: "Map"):
+        self.map = map_obj
+        self.errors: list[LintError] = []
+
+    def report(self, error: LintError):
+        self.errors.append(error)
+
+    def visit(self, obj: "Object"):
+        pass
+
+    def finish(self):
+        pass
+
+
+def rule_assets(rule: type[Rule]) -> set[str] | None:
+    """Map attributes a rule reads, with their dependencies, or None if it needs every asset."""
+    return required_assets(rule.assets) if rule.assets else None
+
+
+class _TypeTrie:
+    """Rules subscribed to object types, matched by exact name or by prefix.
+
+    Matches are memoized per type name, since maps hold many objects of few types.
+    """
+
+    def __init__(self):
+        self.root: dict = {}
+        self.exact: dict[str, set[int]] = {}
+        self.matches: dict[str, tuple[int, ...]] = {}
+
+    def add_prefix(self, prefix: str, rule: int):
+        node = self.root
+        for char in prefix:
+            node = node.setdefault(char, {})
+        node.setdefault(None, set()).add(rule)
+
+    def add_type(self, type_name: str, rule: int):
+        self.exact.setdefault(type_name, set()).add(rule)
+
+    def match(self, type_name: str) -> tuple[int, ...]:
+        matched = self.matches.get(type_name)
+        if matched is None:
+            rules = set(self.exact.get(type_name, ()))
+            node = self.root
+            rules.update(node.get(None, ()))
+            for char in type_name:
+                node = node.get(char)
+                if node is None:
+                    break
+                rules.update(node.get(None, ()))
+            matched = self.matches[type_name] = tuple(sorted(rules))
+        return matched
+
+
+@dataclass
+class RuleResult:
+    """Errors a rule reported, the seconds spent in it and how many objects it visited."""
+
+    name: str
+    errors: list[LintError]
+    seconds: float = 0.0
+    objects: int = 0
+
+
+@dataclass
+class LintReport:
+    """Errors found by a ``Linter`` run, in rule order, with the result of every rule."""
+
+    errors: list[LintError]
+    rules: list[RuleResult] = field(default_factory=list)
+
+    @property
+    def timings(self) -> dict[str, float]:
+        """Seconds spent in each rule, by rule name."""
+        timings = {}
+        for result in self.rules:
+            timings[result.name] = timings.get(result.name, 0.0) + result.seconds
+        return timings
+
+
+def _build_trie(rules: list[type[Rule]]) -> _TypeTrie:
+    trie = _TypeTrie()
+    for index, rule in enumerate(rules):
+        for type_name in rule.object_types:
+            trie.add_type(type_name, index)
+        for prefix in rule.object_prefixes:
+            trie.add_prefix(prefix, index)
+    return trie
+
+
+def _run_rules(map_obj: "Map", rule_classes: list[type[Rule]], trie: _TypeTrie | None = None) -> list[RuleResult]:
+    """Run rules over a map with a single pass over its objects."""
+    trie = trie or _build_trie(rule_classes)
+    rules: list[Rule | None] = [None] * len(rule_classes)
+    results = [RuleResult(rule.name, []) for rule in rule_classes]
+
+    def call(index: int, function, *args):
+        start = time.perf_counter()
+        try:
+            function(*args)
+        except Exception as e:
+            logging.getLogger("sagemap").debug(f"Lint rule {results[index].name} failed", exc_info=True)
+            results[index].errors.append(MapParsingError(e))
+            rules[index] = None
+        results[index].seconds += time.perf_counter() - start
+
+    def create(index: int):
+        rules[index] = rule_classes[index](map_obj)
+        results[index].errors = rules[index].errors
+
+    for index in range(len(rule_classes)):
+        call(index, create, index)
+
+    if (trie.root or trie.exact) and map_obj.objects_list is not None:
+        match = trie.match
+        for obj in map_obj.objects_list.object_list:
+            for index in match(obj.type_name):
+                if rules[index] is not None:
+                    results[index].objects += 1
+                    call(index, rules[index].visit, obj)
+
+    for index in range(len(rule_classes)):
+        if rules[index] is not None:
+            call(index, rules[index].finish)
+
+    return results
+
+
+class Linter:
+    """Runs a set of rules over maps.
+
+    Args:
+        rules: Rule classes, run and reported in this order
+        exclude_codes: Codes to leave out of the report
+    """
+
+    def __init__(self, rules: Iterable[type[Rule]], exclude_codes: Iterable[str] | None = None):
+        self.exclude_codes = set(exclude_codes or ())
+        self.rules = [rule for rule in rules if not rule.codes or not set(rule.codes) <= self.exclude_codes]
+        self.trie = _build_trie(self.rules)
+
+    @property
+    def assets(self) -> set[str] | None:
+        """Map attributes the rules read, with the assets those need to be parsed.
+
+        None, meaning every asset, if any rule does not declare the assets it reads.
+        """
+        if not all(rule.assets for rule in self.rules):
+            return None
+        return required_assets(asset for rule in self.rules for asset in rule.assets)
+
+    def run(
+        self, map_obj: "Map", executor: Executor | None = None, process_executor: Executor | None = None
+    ) -> LintReport:
+        """Lint a map.
+
+        Args:
+            map_obj: The map to lint
+            executor: Run every rule as its own task on this executor instead of all of
+                them in one pass. Threads suit rules that spend their time in NumPy, which
+                releases the GIL.
+            process_executor: Run the rules that hold the GIL (``Rule.holds_gil``) on this
+                executor instead, typically a process pool; the map is pickled for every
+                rule. Rules left without an executor run in one pass in the calling thread
+                while the others run. Results are gathered in rule order either way.
+        """
+        # Rules see edits made directly to the elevations since the map's terrain was cached
+        map_obj.sync_elevations()
+        if executor is None and process_executor is None:
+            results = _run_rules(map_obj, self.rules, self.trie)
+        else:
+            futures = []
+            for rule in self.rules:
+                target = process_executor if rule.holds_gil and process_executor is not None else executor
+                futures.append(target.submit(_run_rules, map_obj, [rule]) if target is not None else None)
+            inline = iter(_run_rules(map_obj, [rule for rule, future in zip(self.rules, futures) if future is None]))
+            results = [next(inline) if future is None else future.result()[0] for future in futures]
+
+        if self.exclude_codes:
+            for result in results:
+                result.errors = [error for error in result.errors if error.code not in self.exclude_codes]
+        return LintReport([error for result in results for error in result.errors], results)
+
+
+@lru_cache(maxsize=1)
+def load_plugin_rules() -> tuple[type[Rule], ...]:
+    """Rule classes registered by installed packages in the ``sagemap.lint_rules`` entry point group.
+
+    Entry points are loaded once per process; rule packs that fail to load are logged and skipped.
+    """
+    rules = []
+    for entry_point in entry_points(group=ENTRY_POINT_GROUP):
+        try:
+            loaded = entry_point.load()
+            pack = [loaded] if isinstance(loaded, type) else list(loaded)
+            for rule in pack:
+                if not (isinstance(rule, type) and issubclass(rule, Rule)):
+                    raise ValueError(f"Expected a Rule subclass, got: {rule!r}")
+        except Exception:
+            logging.getLogger("sagemap").warning(f"Failed to load lint rules from {entry_point.value}", exc_info=True)
+            continue
+        rules.extend(pack)
+    return tuple(rules)
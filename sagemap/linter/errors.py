@@ -1,5 +1,7 @@
 from typing import TYPE_CHECKING
 
+from .fixes import Fix, FlattenTerrain, RotateObject, SetProperty
+
 if TYPE_CHECKING:
     from sagemap.assets.object_list import Object
 
@@ -15,12 +17,15 @@ class LintError:
     message_template = "An unspecified lint error occurred."
     code = "MAP-000"
     extra: dict
+    # Change that resolves the error, see ``sagemap.linter.fixes``
+    fix: Fix | None = None
 
-    def __init__(self, *, code=None, message_template=None, severity=None, extra=None):
+    def __init__(self, *, code=None, message_template=None, severity=None, extra=None, fix=None):
         self.code = code or self.code
         self.message_template = message_template or self.message_template
         self.severity = severity or self.severity
         self.extra = extra or {}
+        self.fix = fix
 
     @property
     def message(self):
@@ -66,8 +71,10 @@ class RotatedPlotFlagError(LintError):
     code = "MAP-005"
 
     def __init__(self, obj: "Object"):
+        object_id = obj.properties["uniqueID"]["value"]
         super().__init__(
-            extra={"flag_type": obj.type_name, "position": obj.position, "id": obj.properties["uniqueID"]["value"]}
+            extra={"flag_type": obj.type_name, "position": obj.position, "id": object_id},
+            fix=RotateObject(object_id),
         )
 
 
@@ -121,7 +128,8 @@ class NonFlatPlotFlagError(LintError):
                 "position": obj.position,
                 "radius": radius,
                 "id": obj.properties["uniqueID"]["value"],
-            }
+            },
+            fix=FlattenTerrain(obj.position[:2], radius),
         )
 
 
@@ -188,9 +196,40 @@ class CameraMaxHeightTooLowError(LintError):
     severity = Severity.ERROR
     message_template = "Map cameraMaxHeight is {height}, which is below the minimum of 533."
     code = "MAP-017"
+    minimum = 533.0
 
     def __init__(self, height):
-        super().__init__(extra={"height": height})
+        super().__init__(
+            extra={"height": height},
+            fix=SetProperty("world_info", "cameraMaxHeight", self.minimum),
+        )
+
+
+class MissingTeamError(LintError):
+    severity = Severity.ERROR
+    message_template = "Team {team} is referenced by script(s) {scripts} but does not exist."
+    code = "MAP-018"
+
+    def __init__(self, team, scripts):
+        super().__init__(extra={"team": team, "scripts": scripts})
+
+
+class UndefinedWaypointError(LintError):
+    severity = Severity.ERROR
+    message_template = "Waypoint {waypoint} is referenced by script(s) {scripts} but does not exist."
+    code = "MAP-019"
+
+    def __init__(self, waypoint, scripts):
+        super().__init__(extra={"waypoint": waypoint, "scripts": scripts})
+
+
+class UnreachableSubroutineWarning(LintError):
+    severity = Severity.WARNING
+    message_template = "Subroutine {script} is never called by any script, team or object."
+    code = "MAP-020"
+
+    def __init__(self, script):
+        super().__init__(extra={"script": script})
 
 
 class MapParsingError(LintError):
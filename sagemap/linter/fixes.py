@@ -0,0 +1,124 @@
+"""Automatic fixes for lint errors, attached to errors as ``LintError.fix``."""
+
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Iterable
+
+import numpy as np
+
+from ..constants import CELL_SIZE
+
+if TYPE_CHECKING:
+    from ..map import Map
+
+
+@dataclass(frozen=True)
+class Fix:
+    """A change to a map that resolves a lint error."""
+
+
+@dataclass(frozen=True)
+class FlattenTerrain(Fix):
+    """Level the cells within ``radius`` cells of a world position to the elevation of its cell."""
+
+    position: tuple[float, float]
+    radius: float
+
+
+@dataclass(frozen=True)
+class RotateObject(Fix):
+    """Set the angle of the objects with this ``uniqueID``."""
+
+    object_id: str
+    angle: float = 0.0
+
+
+@dataclass(frozen=True)
+class SetProperty(Fix):
+    """Set the value of a property of the asset held by a ``Map`` attribute."""
+
+    attribute: str
+    name: str
+    value: Any
+
+
+@dataclass
+class FixSummary:
+    """What ``apply_fixes`` changed."""
+
+    fixes: int = 0
+    cells: int = 0
+    objects: int = 0
+    properties: int = 0
+    assets: set[str] = field(default_factory=set)
+
+
+def _flatten_terrain(map_obj: "Map", fixes: list[FlattenTerrain]) -> int:
+    """Apply terrain fixes in a single pass, returning the number of cells changed."""
+    height_map = map_obj.height_map_data
+    border = height_map.border_width
+    world_height = height_map.height - 2 * border
+    field = map_obj.height_field
+    elevations = field.values
+
+    rows, columns, values = [], [], []
+    for fix in fixes:
+        # Centre as in ``height_utils``, converted from rows from the top to file order
+        x, y = fix.position[0] / CELL_SIZE, fix.position[1] / CELL_SIZE
+        center_x, center_y = round(x + border), height_map.height - 1 - round(border + world_height - y - 1)
+        if not (0 <= center_x < height_map.width and 0 <= center_y < height_map.height):
+            continue
+
+        ys, xs = map_obj.terrain.disk(center_x, center_y, fix.radius)
+        rows.append(ys)
+        columns.append(xs)
+        values.append(np.full(len(xs), elevations[center_y, center_x]))
+
+    if not rows:
+        return 0
+    return field.set_cells(np.concatenate(columns), np.concatenate(rows), np.concatenate(values))
+
+
+def apply_fixes(map_obj: "Map", fixes: Iterable[Fix]) -> FixSummary:
+    """Apply fixes to a fully parsed map and mark the assets they modified.
+
+    Terrain fixes are applied in one ``Map.height_field`` edit, each levelling its disk to the
+    elevation its centre had before any fix; where disks overlap, later fixes win.
+
+    Raises:
+        ValueError: For a fix of an unknown type
+    """
+    summary = FixSummary()
+    terrain_fixes, rotations = [], {}
+    for fix in fixes:
+        summary.fixes += 1
+        if isinstance(fix, FlattenTerrain):
+            terrain_fixes.append(fix)
+        elif isinstance(fix, RotateObject):
+            rotations[fix.object_id] = fix.angle
+        elif isinstance(fix, SetProperty):
+            prop = getattr(map_obj, fix.attribute).properties[fix.name]
+            if prop["value"] != fix.value:
+                prop["value"] = fix.value
+                summary.properties += 1
+                summary.assets.add(fix.attribute)
+        else:
+            raise ValueError(f"Unknown fix: {fix!r}")
+
+    if terrain_fixes:
+        summary.cells = _flatten_terrain(map_obj, terrain_fixes)
+        if summary.cells:
+            summary.assets.add("height_map_data")
+
+    if rotations:
+        for obj in map_obj.objects_list.object_list:
+            angle = rotations.get(obj.properties.get("uniqueID", {}).get("value"))
+            if angle is not None and obj.angle != angle:
+                obj.angle = angle
+                summary.objects += 1
+        if summary.objects:
+            summary.assets.add("objects_list")
+
+    # Height map edits go through ``Map.height_field``, which tracks them itself
+    if summary.assets - {"height_map_data"}:
+        map_obj.mark_dirty(*(summary.assets - {"height_map_data"}))
+    return summary
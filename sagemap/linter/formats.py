@@ -0,0 +1,148 @@
+"""Machine-readable output of the linter, written map by map as maps are linted."""
+
+import json
+from abc import ABC, abstractmethod
+from typing import Any, Iterable, TextIO
+from xml.sax.saxutils import escape, quoteattr
+
+from .errors import LintError, Severity
+
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+SARIF_LEVELS = {Severity.ERROR: "error", Severity.WARNING: "warning", Severity.INFO: "note"}
+
+
+def _to_json(value: Any) -> Any:
+    """Fallback for values JSON has no type for: sets to sorted lists, NumPy values to Python ones."""
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=str)
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    return str(value)
+
+
+def error_record(path: str, error: LintError) -> dict:
+    """JSON-ready record of an error found in the map at ``path``."""
+    return {
+        "file": path,
+        "code": error.code,
+        "severity": error.severity,
+        "message": error.message,
+        "extra": error.extra,
+    }
+
+
+class Formatter(ABC):
+    """Writes lint errors to a stream as they are reported, map by map."""
+
+    def __init__(self, stream: TextIO):
+        self.stream = stream
+
+    def start(self):
+        pass
+
+    @abstractmethod
+    def write(self, path: str, errors: Iterable[LintError]):
+        """Write the errors found in the map at ``path``."""
+
+    def finish(self):
+        pass
+
+    def _dump(self, record: dict) -> str:
+        return json.dumps(record, default=_to_json)
+
+
+class JsonLinesFormatter(Formatter):
+    """One JSON object per line and per error."""
+
+    def write(self, path: str, errors: Iterable[LintError]):
+        for error in errors:
+            self.stream.write(self._dump(error_record(path, error)) + "\n")
+        self.stream.flush()
+
+
+class JsonFormatter(Formatter):
+    """A JSON array of error records, written one element at a time."""
+
+    def start(self):
+        self.stream.write("[")
+        self.separator = "\n"
+
+    def write(self, path: str, errors: Iterable[LintError]):
+        for error in errors:
+            self.stream.write(self.separator + self._dump(error_record(path, error)))
+            self.separator = ",\n"
+        self.stream.flush()
+
+    def finish(self):
+        self.stream.write("\n]\n" if self.separator != "\n" else "]\n")
+        self.stream.flush()
+
+
+class SarifFormatter(Formatter):
+    """A SARIF 2.1.0 log with one run.
+
+    Results are written as they come; the tool description listing the codes that were
+    reported follows them, which JSON allows since object members are unordered.
+    """
+
+    def start(self):
+        self.rules: dict[str, str] = {}
+        self.stream.write(f'{{"version": "2.1.0", "$schema": "{SARIF_SCHEMA}", "runs": [{{"results": [')
+        self.separator = "\n"
+
+    def write(self, path: str, errors: Iterable[LintError]):
+        for error in errors:
+            self.rules.setdefault(error.code, error.message_template.split("{")[0].strip() or error.message_template)
+            result = {
+                "ruleId": error.code,
+                "level": SARIF_LEVELS.get(error.severity, "none"),
+                "message": {"text": error.message},
+                "locations": [{"physicalLocation": {"artifactLocation": {"uri": path}}}],
+                "properties": error.extra,
+            }
+            self.stream.write(self.separator + self._dump(result))
+            self.separator = ",\n"
+        self.stream.flush()
+
+    def finish(self):
+        rules = [{"id": code, "shortDescription": {"text": text}} for code, text in sorted(self.rules.items())]
+        tool = {"driver": {"name": "sagemap", "rules": rules}}
+        self.stream.write(f'\n], "tool": {self._dump(tool)}}}]}}\n')
+        self.stream.flush()
+
+
+class JUnitFormatter(Formatter):
+    """A JUnit XML report with a test suite per map and a failed test case per error.
+
+    Maps without errors get a single passing test case, so every linted map shows up.
+    """
+
+    def start(self):
+        self.stream.write('<?xml version="1.0" encoding="utf-8"?>\n<testsuites name="sagemap.linter">\n')
+
+    def write(self, path: str, errors: Iterable[LintError]):
+        errors = list(errors)
+        name = quoteattr(path)
+        self.stream.write(f'  <testsuite name={name} tests="{max(len(errors), 1)}" failures="{len(errors)}">\n')
+        if not errors:
+            self.stream.write(f'    <testcase classname={name} name="lint"/>\n')
+        for error in errors:
+            self.stream.write(
+                f"    <testcase classname={name} name={quoteattr(error.code)}>"
+                f"<failure type={quoteattr(error.severity)} message={quoteattr(error.message)}>"
+                f"{escape(self._dump(error.extra))}</failure></testcase>\n"
+            )
+        self.stream.write("  </testsuite>\n")
+        self.stream.flush()
+
+    def finish(self):
+        self.stream.write("</testsuites>\n")
+        self.stream.flush()
+
+
+FORMATTERS: dict[str, type[Formatter]] = {
+    "json": JsonFormatter,
+    "jsonl": JsonLinesFormatter,
+    "sarif": SarifFormatter,
+    "junit": JUnitFormatter,
+}
@@ -2,10 +2,24 @@
 
 from typing import TYPE_CHECKING
 
+from ..constants import CELL_SIZE
+from .fixes import FlattenTerrain, apply_fixes
+
 if TYPE_CHECKING:
     from ..map import Map
 
 
+def _flatness(map_obj: "Map", hm_x: int, hm_y: int, radius: float) -> float:
+    """Fraction of the cells within ``radius`` of a heightmap cell at its elevation, read from ``elevations``."""
+    height_map = map_obj.height_map_data
+    elevations = height_map.elevations
+    # The disk is in file order, rows from the bottom; read the current cells rather than
+    # the cached terrain, which does not see direct edits
+    ys, xs = map_obj.terrain.disk(hm_x, height_map.height - 1 - hm_y, radius)
+    center = elevations[hm_y][hm_x]
+    return sum(elevations[height_map.height - 1 - y][x] == center for y, x in zip(ys.tolist(), xs.tolist())) / len(ys)
+
+
 def is_flat_at_position(map_obj: "Map", obj_x: float, obj_y: float, radius: float) -> bool:
     """
     Check if all height data within a radius of an object's position is at the same level.
@@ -37,60 +51,27 @@ def is_flat_at_position(map_obj: "Map", obj_x: float, obj_y: float, radius: floa
     if not (0 <= center_x_int < height_map.width and 0 <= center_y_int < height_map.height):
         return False
 
-    center_height = height_map.elevations[center_y_int][center_x_int]
-
-    radius_int = int(radius) + 1
-
-    for dy in range(-radius_int, radius_int + 1):
-        for dx in range(-radius_int, radius_int + 1):
-            distance = (dx**2 + dy**2) ** 0.5
-            if distance > radius:
-                continue
+    return _flatness(map_obj, center_x_int, center_y_int, radius) == 1.0
 
-            sample_x = center_x_int + dx
-            sample_y = center_y_int + dy
 
-            if not (0 <= sample_x < height_map.width and 0 <= sample_y < height_map.height):
-                continue
-
-            if height_map.elevations[sample_y][sample_x] != center_height:
-                return False
-
-    return True
-
-
-def flatten_position_in_radius(map_obj: "Map", obj_x: float, obj_y: float, radius: float) -> bool:
-    height_map = map_obj.height_map_data
-    border = height_map.border_width
-    world_height = height_map.height - 2 * border
-
-    hm_x = obj_x + border
-    hm_y = border + (world_height - obj_y - 1)
-
-    center_x_int = int(round(hm_x))
-    center_y_int = int(round(hm_y))
-
-    if not (0 <= center_x_int < height_map.width and 0 <= center_y_int < height_map.height):
-        return
-
-    center_height = height_map.elevations[center_y_int][center_x_int]
-
-    radius_int = int(radius) + 1
-
-    for dy in range(-radius_int, radius_int + 1):
-        for dx in range(-radius_int, radius_int + 1):
-            distance = (dx**2 + dy**2) ** 0.5
-            if distance > radius:
-                continue
+def flatten_position_in_radius(map_obj: "Map", obj_x: float, obj_y: float, radius: float) -> int:
+    """
+    Level all height data within a radius of an object's position to the height at its center.
 
-            sample_x = center_x_int + dx
-            sample_y = center_y_int + dy
+    Args:
+        map_obj: The Map object containing height map data
+        obj_x: Object's x position in world coordinates (bottom-left origin)
+        obj_y: Object's y position in world coordinates (bottom-left origin)
+        radius: Radius in world units to level around the position
 
-            if not (0 <= sample_x < height_map.width and 0 <= sample_y < height_map.height):
-                continue
+    Returns:
+        The number of height map cells changed
 
-            if height_map.elevations[sample_y][sample_x] != center_height:
-                map_obj.height_map_data.elevations[sample_y][sample_x] = center_height
+    Note:
+        To level many positions, pass their ``FlattenTerrain`` fixes to ``apply_fixes`` at once
+    """
+    summary = apply_fixes(map_obj, [FlattenTerrain((obj_x * CELL_SIZE, obj_y * CELL_SIZE), radius)])
+    return summary.cells
 
 
 def get_height_at_position(map_obj: "Map", obj_x: float, obj_y: float) -> int | None:
@@ -166,30 +147,4 @@ def get_flatness_percentage(map_obj: "Map", obj_x: float, obj_y: float, radius:
     if not (0 <= center_x_int < height_map.width and 0 <= center_y_int < height_map.height):
         return 0.0
 
-    center_height = height_map.elevations[center_y_int][center_x_int]
-
-    radius_int = int(radius) + 1
-    total_points = 0
-    matching_points = 0
-
-    for dy in range(-radius_int, radius_int + 1):
-        for dx in range(-radius_int, radius_int + 1):
-            distance = (dx**2 + dy**2) ** 0.5
-            if distance > radius:
-                continue
-
-            sample_x = center_x_int + dx
-            sample_y = center_y_int + dy
-
-            if not (0 <= sample_x < height_map.width and 0 <= sample_y < height_map.height):
-                continue
-
-            total_points += 1
-
-            if height_map.elevations[sample_y][sample_x] == center_height:
-                matching_points += 1
-
-    if total_points == 0:
-        return 0.0
-
-    return matching_points / total_points
+    return _flatness(map_obj, center_x_int, center_y_int, radius)
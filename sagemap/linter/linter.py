@@ -1,5 +1,11 @@
-from typing import TYPE_CHECKING
+from concurrent.futures import Executor
+from typing import TYPE_CHECKING, Iterable
 
+import numpy as np
+
+from ..constants import REQUIRED_PLAYERS
+from ..xref import NodeKind, build_reference_graph
+from .engine import Linter, LintReport, Rule, load_plugin_rules
 from .errors import (
     CameraMaxHeightTooLowError,
     ContainsExpansionFlagError,
@@ -7,36 +13,28 @@ from .errors import (
     InsufficientTreesNearWirtschaftError,
     LintError,
     LowExpansionPlotFlagCountInfo,
-    MapParsingError,
     MissingFarmTemplateError,
     MissingGollumSpawnPointError,
     MissingGollumSpawnScriptError,
     MissingPlayerTypesError,
     MissingSpawnWaypointError,
+    MissingTeamError,
     NonFlatPlotFlagError,
     PlotFlagTooCloseToBoderError,
     RotatedPlotFlagError,
     SpawnWaypointForNonExistentPlayerError,
     StartWaypointForNonExistentPlayerError,
+    UndefinedWaypointError,
     UnevenFarmTemplateWarning,
+    UnreachableSubroutineWarning,
 )
 from .height_utils import get_flatness_percentage, is_flat_at_position
 
 if TYPE_CHECKING:
+    from ..assets import Object
     from ..map import Map
 
-REQUIRED_PLAYERS = [
-    "SkirmishMen",
-    "SkirmishRohan",
-    "SkirmishElves",
-    "SkirmishDwarves",
-    "SkirmishIsengard",
-    "SkirmishMordor",
-    "SkirmishImladris",
-    "SkirmishWild",
-    "SkirmishAngmar",
-    "SkirmishEvilmen",
-]
+CASTLE_FLAG_PREFIXES = ("FestungPlotFlag", "LagerPlotFlag", "HalfCastlePlotFlag")
 
 FLATNESS_RADIUS = {
     "FestungPlotFlag": 50,
@@ -47,86 +45,106 @@ FLATNESS_RADIUS = {
 }
 
 
-def lint_map_validation(map_obj: "Map") -> list[LintError]:
-    errors = []
-
-    try:
-        player_points = {str(x): {"exists": False, "has_spawn": False} for x in range(1, 9)}
-        expansion_plot_flag_count = 0
-        is_wotr = not any(
-            obj.type_name.startswith(("FestungPlotFlag", "LagerPlotFlag", "HalfCastlePlotFlag"))
-            for obj in map_obj.objects_list.object_list
-        )
-        gollum = has_farm_templates = has_gollum_spawn = is_wotr
-
-        for obj in map_obj.objects_list.object_list:
-            obj_type = obj.type_name
-
-            if obj_type == "ExpansionFlag":
-                errors.append(ContainsExpansionFlagError(obj))
-            elif obj_type == "ExpansionPlotFlag":
-                expansion_plot_flag_count += 1
-                if obj.angle != 0:
-                    errors.append(RotatedPlotFlagError(obj))
-            elif obj_type == "FarmTemplate":
-                has_farm_templates = True
-            elif obj_type == "*Waypoints/Waypoint":
-                waypoint_name = obj.properties["waypointName"]["value"]
-                paths = [
-                    obj.properties[f"waypointPathLabel{x}"]["value"]
-                    for x in range(1, 4)
-                    if f"waypointPathLabel{x}" in obj.properties
-                ]
-
-                if waypoint_name.startswith("Player_") and waypoint_name.endswith("_Start"):
-                    player_num = waypoint_name[7:-6]
-                    try:
-                        player_points[player_num]["exists"] = True
-                    except KeyError:
-                        errors.append(StartWaypointForNonExistentPlayerError(waypoint_name))
-                    continue
-
-                if waypoint_name.startswith("Player_") and waypoint_name.endswith("_Spawn") and "Player_Path" in paths:
-                    player_num = waypoint_name[7:-6]
-                    try:
-                        player_points[player_num]["has_spawn"] = True
-                    except KeyError:
-                        errors.append(SpawnWaypointForNonExistentPlayerError(waypoint_name))
-                    continue
-
-                if waypoint_name.startswith("SpawnPoint_SkirmishGollum_"):
-                    gollum = True
-            elif obj.type_name.startswith(("FestungPlotFlag", "LagerPlotFlag", "HalfCastlePlotFlag")):
-                if obj.angle != 0:
-                    errors.append(RotatedPlotFlagError(obj))
-
-        if expansion_plot_flag_count <= 1:
-            errors.append(LowExpansionPlotFlagCountInfo(expansion_plot_flag_count))
+class ValidationRule(Rule):
+    """Players, start and spawn waypoints, plot flags, farms, Gollum and camera settings."""
+
+    codes = (
+        "MAP-002",
+        "MAP-003",
+        "MAP-004",
+        "MAP-005",
+        "MAP-006",
+        "MAP-007",
+        "MAP-008",
+        "MAP-009",
+        "MAP-010",
+        "MAP-016",
+        "MAP-017",
+    )
+    assets = ("objects_list", "world_info", "sides_list", "player_scripts_list", "library_map_lists")
+    holds_gil = True
+    object_types = ("ExpansionFlag", "ExpansionPlotFlag", "FarmTemplate", "*Waypoints/Waypoint")
+    object_prefixes = CASTLE_FLAG_PREFIXES
+
+    def __init__(self, map_obj: "Map"):
+        super().__init__(map_obj)
+        self.player_points = {str(x): {"exists": False, "has_spawn": False} for x in range(1, 9)}
+        self.expansion_plot_flag_count = 0
+        self.has_castle_flags = False
+        self.has_farm_templates = False
+        self.has_gollum_spawn_point = False
+
+    def visit(self, obj: "Object"):
+        obj_type = obj.type_name
+
+        if obj_type == "ExpansionFlag":
+            self.report(ContainsExpansionFlagError(obj))
+        elif obj_type == "ExpansionPlotFlag":
+            self.expansion_plot_flag_count += 1
+            if obj.angle != 0:
+                self.report(RotatedPlotFlagError(obj))
+        elif obj_type == "FarmTemplate":
+            self.has_farm_templates = True
+        elif obj_type == "*Waypoints/Waypoint":
+            waypoint_name = obj.properties["waypointName"]["value"]
+            paths = [
+                obj.properties[f"waypointPathLabel{x}"]["value"]
+                for x in range(1, 4)
+                if f"waypointPathLabel{x}" in obj.properties
+            ]
+
+            if waypoint_name.startswith("Player_") and waypoint_name.endswith("_Start"):
+                player_num = waypoint_name[7:-6]
+                try:
+                    self.player_points[player_num]["exists"] = True
+                except KeyError:
+                    self.report(StartWaypointForNonExistentPlayerError(waypoint_name))
+                return
+
+            if waypoint_name.startswith("Player_") and waypoint_name.endswith("_Spawn") and "Player_Path" in paths:
+                player_num = waypoint_name[7:-6]
+                try:
+                    self.player_points[player_num]["has_spawn"] = True
+                except KeyError:
+                    self.report(SpawnWaypointForNonExistentPlayerError(waypoint_name))
+                return
+
+            if waypoint_name.startswith("SpawnPoint_SkirmishGollum_"):
+                self.has_gollum_spawn_point = True
+        elif obj_type.startswith(CASTLE_FLAG_PREFIXES):
+            self.has_castle_flags = True
+            if obj.angle != 0:
+                self.report(RotatedPlotFlagError(obj))
+
+    def finish(self):
+        map_obj = self.map
+        # War of the Ring maps have no castle plot flags and need neither farms nor Gollum
+        is_wotr = not self.has_castle_flags
+
+        if self.expansion_plot_flag_count <= 1:
+            self.report(LowExpansionPlotFlagCountInfo(self.expansion_plot_flag_count))
 
         camera_max_height = map_obj.world_info.properties.get("cameraMaxHeight", {}).get("value")
-        if camera_max_height is not None and camera_max_height < 533:
-            errors.append(CameraMaxHeightTooLowError(camera_max_height))
+        if camera_max_height is not None and camera_max_height < CameraMaxHeightTooLowError.minimum:
+            self.report(CameraMaxHeightTooLowError(camera_max_height))
 
-        if not has_farm_templates:
-            errors.append(MissingFarmTemplateError())
+        if not (self.has_farm_templates or is_wotr):
+            self.report(MissingFarmTemplateError())
 
-        if not gollum:
-            errors.append(MissingGollumSpawnPointError())
+        if not (self.has_gollum_spawn_point or is_wotr):
+            self.report(MissingGollumSpawnPointError())
 
-        missing_spawns = [num for num, p in player_points.items() if p["exists"] and not p["has_spawn"]]
-        if missing_spawns:
-            errors.extend(MissingSpawnWaypointError(num) for num in missing_spawns)
+        missing_spawns = [num for num, p in self.player_points.items() if p["exists"] and not p["has_spawn"]]
+        for num in missing_spawns:
+            self.report(MissingSpawnWaypointError(num))
 
         players = {player.properties["playerName"]["value"] for player in map_obj.sides_list.players}
         missing_players = [p for p in REQUIRED_PLAYERS if p not in players]
         if missing_players:
-            errors.append(MissingPlayerTypesError(missing_players))
+            self.report(MissingPlayerTypesError(missing_players))
 
         if not is_wotr:
-            for script_list in map_obj.player_scripts_list.script_lists:
-                if any(script.name == "SkirmishGollum_Spawn" for script in script_list.items):
-                    has_gollum_spawn = True
-                    break
+            has_gollum_spawn = map_obj.player_scripts_list.index.find_script("SkirmishGollum_Spawn") is not None
 
             if not has_gollum_spawn:
                 for library in map_obj.library_map_lists.lists:
@@ -135,117 +153,201 @@ def lint_map_validation(map_obj: "Map") -> list[LintError]:
                         break
 
             if not has_gollum_spawn:
-                errors.append(MissingGollumSpawnScriptError())
-    except Exception as e:
-        errors.append(MapParsingError(e))
+                self.report(MissingGollumSpawnScriptError())
 
-    return errors
 
+class FlatnessRule(Rule):
+    """Plot flags on flat terrain away from the border, and farms on mostly flat terrain."""
 
-def lint_map_flatness(map_obj: "Map") -> list[LintError]:
-    errors = []
+    codes = ("MAP-011", "MAP-012", "MAP-014")
+    assets = ("objects_list", "height_map_data")
+    object_types = ("FarmTemplate",)
+    object_prefixes = tuple(FLATNESS_RADIUS)
 
-    height_map = map_obj.height_map_data
-    border_width = height_map.border_width
-    world_width = height_map.width - 2 * border_width
-    world_height = height_map.height - 2 * border_width
     min_border_distance = 10
+    farm_check_radius = 30
+    flatness_threshold = 0.67
 
-    flags = [
-        obj
-        for obj in map_obj.objects_list.object_list
-        if any(obj.type_name.startswith(prefix) for prefix in FLATNESS_RADIUS)
-    ]
-    for flag in flags:
-        radius = next(FLATNESS_RADIUS[prefix] for prefix in FLATNESS_RADIUS if flag.type_name.startswith(prefix))
+    def __init__(self, map_obj: "Map"):
+        super().__init__(map_obj)
+        height_map = map_obj.height_map_data
+        self.world_width = height_map.width - 2 * height_map.border_width
+        self.world_height = height_map.height - 2 * height_map.border_width
+        self.farm_templates = []
 
-        flag_x, flag_y, _ = flag.position
+    def visit(self, obj: "Object"):
+        if obj.type_name == "FarmTemplate":
+            # Farms are reported after every plot flag
+            self.farm_templates.append(obj)
+            return
+
+        radius = next(FLATNESS_RADIUS[prefix] for prefix in FLATNESS_RADIUS if obj.type_name.startswith(prefix))
+
+        flag_x, flag_y, _ = obj.position
         flag_x = flag_x / 10.0
         flag_y = flag_y / 10.0
 
         if (
-            flag_x < min_border_distance
-            or flag_y < min_border_distance
-            or flag_x > world_width - min_border_distance
-            or flag_y > world_height - min_border_distance
+            flag_x < self.min_border_distance
+            or flag_y < self.min_border_distance
+            or flag_x > self.world_width - self.min_border_distance
+            or flag_y > self.world_height - self.min_border_distance
         ):
-            errors.append(PlotFlagTooCloseToBoderError(flag))
+            self.report(PlotFlagTooCloseToBoderError(obj))
 
-        if not is_flat_at_position(map_obj, flag_x, flag_y, radius):
-            errors.append(NonFlatPlotFlagError(flag, radius))
+        if not is_flat_at_position(self.map, flag_x, flag_y, radius):
+            self.report(NonFlatPlotFlagError(obj, radius))
 
-    farm_templates = [obj for obj in map_obj.objects_list.object_list if obj.type_name == "FarmTemplate"]
-    farm_check_radius = 30
-    flatness_threshold = 0.67
+    def finish(self):
+        for farm in self.farm_templates:
+            farm_x, farm_y, _ = farm.position
+            farm_x = farm_x / 10.0
+            farm_y = farm_y / 10.0
 
-    for farm in farm_templates:
-        farm_x, farm_y, _ = farm.position
-        farm_x = farm_x / 10.0
-        farm_y = farm_y / 10.0
+            flat_percentage = get_flatness_percentage(self.map, farm_x, farm_y, self.farm_check_radius)
 
-        flat_percentage = get_flatness_percentage(map_obj, farm_x, farm_y, farm_check_radius)
+            if flat_percentage < self.flatness_threshold:
+                self.report(UnevenFarmTemplateWarning(obj=farm, flat_percentage=flat_percentage * 100))
 
-        if flat_percentage < flatness_threshold:
-            errors.append(UnevenFarmTemplateWarning(obj=farm, flat_percentage=flat_percentage * 100))
 
-    return errors
+class ResourcesRule(Rule):
+    """Enough trees around every WirtschaftPlotFlag."""
 
-
-def lint_map_resources(map_obj: "Map") -> list[LintError]:
-    errors = []
-
-    wirtschaft_flags = [
-        obj for obj in map_obj.objects_list.object_list if obj.type_name.startswith("WirtschaftPlotFlag")
-    ]
-    tree_objects = [obj for obj in map_obj.objects_list.object_list if "tree" in obj.type_name.lower()]
+    codes = ("MAP-013",)
+    assets = ("objects_list",)
+    # Trees are matched anywhere in the type name, so every object is visited
+    object_prefixes = ("",)
+    holds_gil = True
 
     required_trees = 30
     search_radius = 30
 
-    for flag in wirtschaft_flags:
-        flag_x, flag_y, _ = flag.position
-        flag_x = flag_x / 10.0
-        flag_y = flag_y / 10.0
+    def __init__(self, map_obj: "Map"):
+        super().__init__(map_obj)
+        self.wirtschaft_flags = []
+        self.tree_positions = []
 
-        tree_count = 0
-        for tree in tree_objects:
-            tree_x, tree_y, _ = tree.position
-            tree_x = tree_x / 10.0
-            tree_y = tree_y / 10.0
+    def visit(self, obj: "Object"):
+        if obj.type_name.startswith("WirtschaftPlotFlag"):
+            self.wirtschaft_flags.append(obj)
+        if "tree" in obj.type_name.lower():
+            self.tree_positions.append(obj.position[:2])
 
-            distance = ((flag_x - tree_x) ** 2 + (flag_y - tree_y) ** 2) ** 0.5
+    def finish(self):
+        if not self.wirtschaft_flags:
+            return
 
-            if distance <= search_radius:
-                tree_count += 1
+        trees = np.array(self.tree_positions, dtype=np.float64).reshape(-1, 2) / 10.0
+        for flag in self.wirtschaft_flags:
+            flag_x, flag_y, _ = flag.position
+            distances = np.sqrt((flag_x / 10.0 - trees[:, 0]) ** 2 + (flag_y / 10.0 - trees[:, 1]) ** 2)
+            tree_count = int(np.count_nonzero(distances <= self.search_radius))
 
-        if tree_count < required_trees:
-            errors.append(InsufficientTreesNearWirtschaftError(obj=flag, tree_count=tree_count))
+            if tree_count < self.required_trees:
+                self.report(InsufficientTreesNearWirtschaftError(obj=flag, tree_count=tree_count))
 
-    return errors
 
+class PerformanceRule(Rule):
+    """Object count within what the engine handles well."""
 
-def lint_map_performance(map_obj: "Map") -> list[LintError]:
-    errors = []
+    codes = ("MAP-015",)
+    assets = ("objects_list",)
 
-    object_count = len(map_obj.objects_list.object_list)
     max_recommended_objects = 2000
 
-    if object_count > max_recommended_objects:
-        errors.append(ExcessiveObjectCountWarning(object_count=object_count, limit=max_recommended_objects))
+    def finish(self):
+        object_count = len(self.map.objects_list.object_list)
+        if object_count > self.max_recommended_objects:
+            self.report(ExcessiveObjectCountWarning(object_count=object_count, limit=self.max_recommended_objects))
+
+
+class ReferencesRule(Rule):
+    """Teams and waypoints named by scripts exist, and every subroutine is called."""
 
-    return errors
+    codes = ("MAP-018", "MAP-019", "MAP-020")
+    assets = (
+        "sides_list",
+        "teams",
+        "trigger_areas",
+        "polygon_triggers",
+        "objects_list",
+        "waypoints_list",
+        "player_scripts_list",
+    )
+    # The graph is built by walking every script in Python
+    holds_gil = True
 
+    def finish(self):
+        graph = build_reference_graph(self.map)
 
-def lint_map(map_obj: "Map", exclude_codes: list[str] | None = None) -> list[LintError]:
-    errors: list[LintError] = []
+        def referrers(node):
+            return sorted({graph.names[source] for source in graph.predecessors(node)})
 
-    errors.extend(lint_map_validation(map_obj))
-    errors.extend(lint_map_flatness(map_obj))
-    errors.extend(lint_map_resources(map_obj))
-    errors.extend(lint_map_performance(map_obj))
+        for node in graph.dangling(NodeKind.TEAM):
+            self.report(MissingTeamError(team=graph.names[node], scripts=referrers(node)))
 
-    if exclude_codes:
-        exclude_set = set(exclude_codes)
-        errors = [err for err in errors if err.code not in exclude_set]
+        for node in graph.dangling(NodeKind.WAYPOINT, NodeKind.WAYPOINT_PATH):
+            self.report(UndefinedWaypointError(waypoint=graph.names[node], scripts=referrers(node)))
 
-    return errors
+        for node in graph.unreachable_subroutines():
+            self.report(UnreachableSubroutineWarning(script=graph.names[node]))
+
+
+BUILTIN_RULES: list[type[Rule]] = [ValidationRule, FlatnessRule, ResourcesRule, PerformanceRule, ReferencesRule]
+
+
+def default_rules(plugins: bool = True) -> list[type[Rule]]:
+    """The built-in rules, followed by the rules of installed rule packs unless ``plugins`` is False."""
+    return BUILTIN_RULES + (list(load_plugin_rules()) if plugins else [])
+
+
+def lint_map_validation(map_obj: "Map") -> list[LintError]:
+    return Linter([ValidationRule]).run(map_obj).errors
+
+
+def lint_map_flatness(map_obj: "Map") -> list[LintError]:
+    return Linter([FlatnessRule]).run(map_obj).errors
+
+
+def lint_map_resources(map_obj: "Map") -> list[LintError]:
+    return Linter([ResourcesRule]).run(map_obj).errors
+
+
+def lint_map_performance(map_obj: "Map") -> list[LintError]:
+    return Linter([PerformanceRule]).run(map_obj).errors
+
+
+def lint_map_references(map_obj: "Map") -> list[LintError]:
+    return Linter([ReferencesRule]).run(map_obj).errors
+
+
+def lint_map_report(
+    map_obj: "Map",
+    exclude_codes: list[str] | None = None,
+    rules: Iterable[type[Rule]] | None = None,
+    executor: Executor | None = None,
+    process_executor: Executor | None = None,
+) -> LintReport:
+    """Lint a map, returning the errors along with the time spent in each rule.
+
+    Args:
+        map_obj: The map to lint
+        exclude_codes: Codes to leave out
+        rules: Rule classes to run instead of ``default_rules()``
+        executor: Run the rules concurrently on this executor, see ``Linter.run``
+        process_executor: Run the rules that hold the GIL on this executor, see ``Linter.run``
+    """
+    linter = Linter(default_rules() if rules is None else rules, exclude_codes=exclude_codes)
+    return linter.run(map_obj, executor=executor, process_executor=process_executor)
+
+
+def lint_map(
+    map_obj: "Map",
+    exclude_codes: list[str] | None = None,
+    rules: Iterable[type[Rule]] | None = None,
+    executor: Executor | None = None,
+    process_executor: Executor | None = None,
+) -> list[LintError]:
+    return lint_map_report(
+        map_obj, exclude_codes=exclude_codes, rules=rules, executor=executor, process_executor=process_executor
+    ).errors
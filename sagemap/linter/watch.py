@@ -0,0 +1,188 @@
+"""Watch mode of the linter: re-lint maps as they are saved, re-running only the rules a save affects."""
+
+import io
+import time
+from collections import Counter
+from concurrent.futures import Executor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Iterable, Iterator
+
+from ..diff import chunk_digests
+from ..map import ASSET_ATTRIBUTES, parse_map
+from ..validation import decompress_map
+from .engine import Linter, RuleResult, rule_assets
+from .errors import LintError, MapParsingError
+
+
+def iter_map_files(paths: Iterable[Path | str]) -> Iterator[Path]:
+    """Yield the given map files, and the .map files inside given folders, in sorted order."""
+    for path in map(Path, paths):
+        if path.is_dir():
+            yield from sorted(child for child in path.rglob("*") if child.suffix.lower() == ".map")
+        else:
+            yield path
+
+
+def _error_key(error: LintError) -> tuple[str, str]:
+    return error.code, error.message
+
+
+def _difference(errors: list[LintError], others: list[LintError]) -> list[LintError]:
+    """Errors not in ``others``, compared by code and message and counting duplicates."""
+    remaining = Counter(map(_error_key, others))
+    difference = []
+    for error in errors:
+        key = _error_key(error)
+        if remaining[key]:
+            remaining[key] -= 1
+        else:
+            difference.append(error)
+    return difference
+
+
+@dataclass
+class LintDelta:
+    """Errors of a map, with those that appeared and disappeared since it was last linted."""
+
+    path: Path
+    errors: list[LintError]
+    added: list[LintError] = field(default_factory=list)
+    removed: list[LintError] = field(default_factory=list)
+    rules: list[RuleResult] = field(default_factory=list)
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.added or self.removed)
+
+
+@dataclass
+class _MapState:
+    digests: dict[tuple[str, int], str]
+    results: list[RuleResult] | None
+    errors: list[LintError]
+
+
+class IncrementalLinter:
+    """Lints maps again after they change, re-running only the rules affected by the change.
+
+    Args:
+        linter: The rules to run and the codes to exclude
+    """
+
+    def __init__(self, linter: Linter):
+        self.linter = linter
+        self.rule_assets = [rule_assets(rule) for rule in linter.rules]
+        self.states: dict[Path, _MapState] = {}
+
+    def changed_assets(self, path: Path, digests: dict[tuple[str, int], str]) -> set[str] | None:
+        """Attributes of the assets whose chunks changed since ``path`` was linted, None if it never was."""
+        state = self.states.get(path)
+        if state is None or state.results is None:
+            return None
+        keys = digests.keys() | state.digests.keys()
+        return {
+            ASSET_ATTRIBUTES[key[0]]
+            for key in keys
+            if key[0] in ASSET_ATTRIBUTES and digests.get(key) != state.digests.get(key)
+        }
+
+    def lint(
+        self, path: Path | str, executor: Executor | None = None, process_executor: Executor | None = None
+    ) -> LintDelta:
+        """Lint a map again. A map that fails to parse is reported as a ``MapParsingError``."""
+        path = Path(path)
+        previous = self.states.get(path)
+        previous_errors = previous.errors if previous else []
+
+        try:
+            data, _ = decompress_map(path.read_bytes())
+            digests = chunk_digests(data)
+            changed = self.changed_assets(path, digests)
+            stale = [
+                index
+                for index, assets in enumerate(self.rule_assets)
+                if changed is None or (changed if assets is None else assets & changed)
+            ]
+
+            results = list(previous.results) if changed is not None else [None] * len(self.linter.rules)
+            rerun = []
+            if stale:
+                needed = [self.rule_assets[index] for index in stale]
+                assets = None if None in needed else set().union(*needed)
+                map_obj = parse_map(io.BytesIO(data), assets=assets)
+                linter = Linter([self.linter.rules[index] for index in stale], self.linter.exclude_codes)
+                rerun = linter.run(map_obj, executor=executor, process_executor=process_executor).rules
+                for index, result in zip(stale, rerun):
+                    results[index] = result
+        except Exception as e:
+            # Typically a map read while it is being written; lint it in full on the next save
+            errors = [MapParsingError(e)]
+            self.states[path] = _MapState({}, None, errors)
+            return LintDelta(path, errors, _difference(errors, previous_errors), _difference(previous_errors, errors))
+
+        errors = [error for result in results for error in result.errors]
+        self.states[path] = _MapState(digests, results, errors)
+        return LintDelta(
+            path, errors, _difference(errors, previous_errors), _difference(previous_errors, errors), rerun
+        )
+
+    def forget(self, path: Path | str):
+        self.states.pop(Path(path), None)
+
+
+class MapWatcher:
+    """Detects saved maps by polling their modification time and size.
+
+    Polling works on Windows, where World Builder runs, and costs one ``stat`` per map and interval.
+
+    Args:
+        paths: Map files, and folders whose .map files are watched, including maps created later
+        debounce: Seconds a map must stay unchanged before it counts as saved
+        clock: Source of the current time in seconds
+    """
+
+    def __init__(self, paths: Iterable[Path | str], debounce: float = 0.5, clock: Callable[[], float] = time.monotonic):
+        self.paths = list(paths)
+        self.debounce = debounce
+        self.clock = clock
+        self.stats: dict[Path, tuple[int, int]] = {}
+        self.pending: dict[Path, float] = {}
+
+    def scan(self) -> dict[Path, tuple[int, int]]:
+        """Modification time and size of every watched map."""
+        stats = {}
+        for path in iter_map_files(self.paths):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            stats[path] = (stat.st_mtime_ns, stat.st_size)
+        return stats
+
+    def poll(self) -> list[Path]:
+        """Maps that changed and then stayed unchanged for ``debounce`` seconds, in sorted order.
+
+        Every map is reported on the first poll that follows the debounce delay.
+        """
+        now = self.clock()
+        stats = self.scan()
+        for path, stat in stats.items():
+            if self.stats.get(path) != stat:
+                self.pending[path] = now
+        for path in self.pending.keys() - stats.keys():
+            del self.pending[path]
+        self.stats = stats
+
+        saved = sorted(path for path, changed in self.pending.items() if now - changed >= self.debounce)
+        for path in saved:
+            del self.pending[path]
+        return saved
+
+    def watch(self, interval: float = 0.5) -> Iterator[list[Path]]:
+        """Poll every ``interval`` seconds, yielding the maps saved since the last poll. Runs forever."""
+        while True:
+            saved = self.poll()
+            if saved:
+                yield saved
+            time.sleep(interval)
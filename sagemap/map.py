@@ -1,9 +1,15 @@
 import base64
 import io
 import logging
+import mmap
+import os
+import shutil
+import tempfile
 from dataclasses import asdict, is_dataclass
 from enum import Enum
+from typing import Iterable
 
+import numpy as np
 from reversebox.compression.compression_refpack import RefpackHandler
 
 from .assets import (
@@ -37,8 +43,26 @@ from .assets import (
     WaypointsList,
     WorldInfo,
 )
+from .constants import CELL_SIZE
 from .context import ParsingContext, WritingContext
+from .geometry import water_mask
+from .heightfield import HeightField
+from .profiling import ParseProfiler, ProfileNode
 from .stream import BinaryStream
+from .terrain import TerrainAnalysis
+
+# Leading bytes of an uncompressed map, as opposed to the "EAR" header or refpack data of a compressed one
+MAP_MAGIC = b"CkMp"
+
+# Attributes ``Map.water_mask`` is computed from
+WATER_ATTRIBUTES = ("height_map_data", "standing_water_areas", "river_areas", "polygon_triggers")
+
+# Instance dict keys of the caches derived from assets, with the attributes each is computed from
+DERIVED_CACHES = {
+    "_water_mask": WATER_ATTRIBUTES,
+    "_terrain": ("height_map_data", "blend_tile_data"),
+    "_height_field": ("height_map_data",),
+}
 
 
 class Map:
@@ -77,6 +101,14 @@ class Map:
         self.asset_count = None
         self.assets = {}
         self.ea_compression_header = None
+        self.profile: ProfileNode | None = None
+
+        # Decompressed data the map was parsed from, and the byte range of every top-level
+        # chunk in it that has not been replaced or marked dirty since (see ``write``)
+        self.source: bytes | mmap.mmap | None = None
+        # File ``source`` maps, when it is a memory map
+        self.source_path: str | None = None
+        self.chunk_ranges: dict[str, tuple[int, int]] = {}
 
         # assets
         self.global_version = None
@@ -101,21 +133,158 @@ class Map:
         self.named_cameras = None
         self.camera_animation_list = None
         self.library_map_lists = None
+        self.teams = None
+        self.mp_positions_list = None
         self.fog_settings = None
         self.mission_hotspots = None
         self.mission_objectives = None
         self.castle_templates = None
         self.skybox_settings = None
 
-    def parse(self, context: ParsingContext):
+    def __setattr__(self, name, value):
+        chunk_ranges = self.__dict__.get("chunk_ranges")
+        if chunk_ranges:
+            chunk_ranges.pop(name, None)
+            if name == "asset_list":
+                # Both are encoded differently depending on whether the map has an AssetList
+                chunk_ranges.pop("sides_list", None)
+                chunk_ranges.pop("build_lists", None)
+        self._drop_caches(name)
+        super().__setattr__(name, value)
+
+    def __getstate__(self):
+        # Derived caches are rebuilt on demand rather than pickled
+        state = {key: value for key, value in self.__dict__.items() if key not in DERIVED_CACHES}
+        if isinstance(self.source, mmap.mmap):
+            state["source"] = bytes(self.source)
+            state["source_path"] = None
+        height_field = self.__dict__.get("_height_field")
+        if height_field is not None and height_field.dirty:
+            # The dirty regions are not pickled, so the chunk cannot be patched
+            state["chunk_ranges"] = {k: v for k, v in self.chunk_ranges.items() if k != "height_map_data"}
+        return state
+
+    def _drop_caches(self, attribute: str | None = None):
+        """Drop the caches derived from an asset attribute, or every cache."""
+        for key, attributes in DERIVED_CACHES.items():
+            if attribute is None or attribute in attributes:
+                self.__dict__.pop(key, None)
+
+    def mark_dirty(self, *attributes: str):
+        """Mark chunks as modified so an incremental ``write`` re-encodes them.
+
+        Replacing an asset (``map.objects_list = ...``) marks it automatically; editing
+        one in place does not. Without arguments, every chunk is marked. Caches derived
+        from the marked assets, such as ``water_mask`` and ``terrain``, are dropped as well.
+
+        Args:
+            attributes: Names of the asset attributes, e.g. ``"objects_list"``
+        """
+        if not attributes:
+            self.chunk_ranges.clear()
+            self._drop_caches()
+        for attribute in attributes:
+            if attribute not in ASSET_ATTRIBUTES.values():
+                raise ValueError(f"Unknown asset attribute: {attribute}")
+            self.chunk_ranges.pop(attribute, None)
+            self._drop_caches(attribute)
+
+    def is_dirty(self, attribute: str) -> bool:
+        """Whether an incremental ``write`` would re-encode this chunk."""
+        return self.source is None or attribute not in self.chunk_ranges
+
+    @property
+    def water_mask(self) -> np.ndarray:
+        """Height map cells under water, indexed ``[y][x]`` in file order (see ``geometry.water_mask``).
+
+        Computed on first use and cached until one of ``WATER_ATTRIBUTES`` is replaced or
+        marked with ``mark_dirty``; ``sync_elevations`` drops it after direct edits to the height map.
+        """
+        mask = self.__dict__.get("_water_mask")
+        if mask is None:
+            mask = self.__dict__["_water_mask"] = water_mask(self)
+        return mask
+
+    @property
+    def terrain(self) -> TerrainAnalysis:
+        """Slope and cliff layers of the height map, cached like ``water_mask``."""
+        terrain = self.__dict__.get("_terrain")
+        if terrain is None:
+            terrain = self.__dict__["_terrain"] = TerrainAnalysis(self.height_map_data, self.blend_tile_data)
+        return terrain
+
+    @property
+    def height_field(self) -> HeightField:
+        """Array-backed editor of the height map, kept until the height map is replaced.
+
+        Edits through it update ``height_map_data`` and drop ``terrain`` and ``water_mask``;
+        an incremental ``write`` then rewrites only the regions it changed, including cells
+        of ``elevations`` edited directly since the field was created (see ``HeightField.sync``).
+        """
+        height_field = self.__dict__.get("_height_field")
+        if height_field is None:
+            height_field = self.__dict__["_height_field"] = HeightField(
+                self.height_map_data, on_change=self._height_field_changed
+            )
+        return height_field
+
+    def sync_elevations(self) -> int:
+        """Pick up edits made directly to ``height_map_data.elevations``.
+
+        The height field, if one was created, reads them back and records them as dirty.
+        ``terrain`` and ``water_mask`` are rebuilt on next use. ``Linter.run`` calls this
+        before every run.
+
+        Returns:
+            The number of cells the height field read back, 0 without a height field
+        """
+        height_field = self.__dict__.get("_height_field")
+        if height_field is not None:
+            # Drops the derived caches through _height_field_changed when cells changed
+            return height_field.sync()
+        self._height_field_changed()
+        return 0
+
+    def _height_field_changed(self):
+        for key, attributes in DERIVED_CACHES.items():
+            if key != "_height_field" and "height_map_data" in attributes:
+                self.__dict__.pop(key, None)
+
+    def is_underwater(self, x: float, y: float) -> bool:
+        """Whether the height map cell nearest to a world position is under water."""
+        border = self.height_map_data.border_width
+        cell_x, cell_y = round(x / CELL_SIZE) + border, round(y / CELL_SIZE) + border
+        mask = self.water_mask
+        return 0 <= cell_y < mask.shape[0] and 0 <= cell_x < mask.shape[1] and bool(mask[cell_y, cell_x])
+
+    def parse(self, context: ParsingContext, assets: Iterable[str] | None = None):
+        """Decode the map from a context positioned at its asset table.
+
+        Args:
+            context: Context to parse from
+            assets: Attributes of the assets to decode, e.g. ``("objects_list",)``; the
+                assets they depend on are decoded too (see ``required_assets``). Other
+                chunks are skipped and left as None, so a partially decoded map can be
+                inspected but not written. Every asset is decoded by default.
+        """
+        wanted = None if assets is None else required_assets(assets)
         context.parse_assets()
         self.assets = context.assets
         self.compression_bytes = context.compression_bytes
+        self.source = context.stream.getvalue()
+        self.chunk_ranges = {}
 
-        while context.stream.tell() < len(context.stream.getvalue()):
+        while context.stream.tell() < len(self.source):
             asset_name = context.parse_asset_name()
+            if wanted is not None and ASSET_ATTRIBUTES.get(asset_name) not in wanted:
+                context.logger.info(f"Skipping asset: {asset_name}")
+                context.skip_asset()
+                continue
+
             context.logger.info(f"Processing asset: {asset_name}")
+            start = context.stream.tell()
             self.parse_asset(asset_name, context)
+            self.chunk_ranges[ASSET_ATTRIBUTES[asset_name]] = (start, context.stream.tell())
 
     def parse_asset(self, asset_name: str, context: ParsingContext):
         if asset_name == AssetList.asset_name:
@@ -184,6 +353,8 @@ class Map:
         result = {}
 
         for key, value in self.__dict__.items():
+            if key in ("profile", "source", "source_path", "chunk_ranges") or key in DERIVED_CACHES:
+                continue
             result[key] = self._serialize(value)
 
         return result
@@ -205,119 +376,115 @@ class Map:
         else:
             return obj
 
-    def write(self, context: WritingContext) -> bytes:
+    def _write_chunk(self, context: WritingContext, attribute: str, incremental: bool, *args):
+        asset = getattr(self, attribute)
+        context.write_asset_name(asset.asset_name)
+        span = self.chunk_ranges.get(attribute) if incremental and self.source is not None else None
+        if span is None:
+            asset.write(context, *args)
+            return
+
+        # Original indices are kept by seeding the table below, so the bytes stay valid
+        chunk = memoryview(self.source)[span[0] : span[1]]
+        height_field = self.__dict__.get("_height_field")
+        if attribute == "height_map_data" and height_field is not None:
+            # Direct edits of the elevations are patched along with the field's own
+            height_field.sync()
+            if height_field.dirty:
+                chunk = height_field.patch(chunk)
+        context.stream.writeBytes(chunk)
+
+    def write(self, context: WritingContext, incremental: bool = False) -> bytes:
+        """Encode the map.
+
+        Args:
+            context: Context to write to
+            incremental: Copy the original bytes of every chunk that was not replaced or
+                marked with ``mark_dirty`` since parsing, instead of re-encoding it
+        """
         if self.assets:
             context.assets_by_index = self.assets.copy()
             context.index_by_asset = {name: idx for idx, name in self.assets.items()}
 
         if self.asset_list is not None:
-            context.write_asset_name(AssetList.asset_name)
-            self.asset_list.write(context)
+            self._write_chunk(context, "asset_list", incremental)
 
         if self.global_version is not None:
-            context.write_asset_name(GlobalVersion.asset_name)
-            self.global_version.write(context)
+            self._write_chunk(context, "global_version", incremental)
 
-        context.write_asset_name(HeightMapData.asset_name)
-        self.height_map_data.write(context)
+        self._write_chunk(context, "height_map_data", incremental)
 
-        context.write_asset_name(BlendTileData.asset_name)
-        self.blend_tile_data.write(context)
+        self._write_chunk(context, "blend_tile_data", incremental)
 
-        context.write_asset_name(WorldInfo.asset_name)
-        self.world_info.write(context)
+        self._write_chunk(context, "world_info", incremental)
 
         if self.mp_positions_list is not None:
-            context.write_asset_name(MPPositionList.asset_name)
-            self.mp_positions_list.write(context)
+            self._write_chunk(context, "mp_positions_list", incremental)
 
-        context.write_asset_name(SidesList.asset_name)
-        self.sides_list.write(context, self.asset_list is not None)
+        self._write_chunk(context, "sides_list", incremental, self.asset_list is not None)
 
         if self.library_map_lists is not None:
-            context.write_asset_name(LibraryMapLists.asset_name)
-            self.library_map_lists.write(context)
+            self._write_chunk(context, "library_map_lists", incremental)
 
         if self.teams is not None:
-            context.write_asset_name(Teams.asset_name)
-            self.teams.write(context)
+            self._write_chunk(context, "teams", incremental)
 
         if self.player_scripts_list is not None:
-            context.write_asset_name(PlayerScriptsList.asset_name)
-            self.player_scripts_list.write(context)
+            self._write_chunk(context, "player_scripts_list", incremental)
 
         if self.build_lists is not None:
-            context.write_asset_name(BuildLists.asset_name)
-            self.build_lists.write(context, self.asset_list is not None)
+            self._write_chunk(context, "build_lists", incremental, self.asset_list is not None)
 
-        context.write_asset_name(ObjectsList.asset_name)
-        self.objects_list.write(context)
+        self._write_chunk(context, "objects_list", incremental)
 
         if self.polygon_triggers is not None:
-            context.write_asset_name(PolygonTriggers.asset_name)
-            self.polygon_triggers.write(context)
+            self._write_chunk(context, "polygon_triggers", incremental)
 
         if self.trigger_areas is not None:
-            context.write_asset_name(TriggerAreas.asset_name)
-            self.trigger_areas.write(context)
+            self._write_chunk(context, "trigger_areas", incremental)
 
         if self.water_settings is not None:
-            context.write_asset_name(WaterSettings.asset_name)
-            self.water_settings.write(context)
+            self._write_chunk(context, "water_settings", incremental)
 
         if self.fog_settings is not None:
-            context.write_asset_name(FogSettings.asset_name)
-            self.fog_settings.write(context)
+            self._write_chunk(context, "fog_settings", incremental)
 
         if self.mission_hotspots is not None:
-            context.write_asset_name(MissionHotSpots.asset_name)
-            self.mission_hotspots.write(context)
+            self._write_chunk(context, "mission_hotspots", incremental)
 
         if self.mission_objectives is not None:
-            context.write_asset_name(MissionObjectives.asset_name)
-            self.mission_objectives.write(context)
+            self._write_chunk(context, "mission_objectives", incremental)
 
         if self.standing_water_areas is not None:
-            context.write_asset_name(StandingWaterAreas.asset_name)
-            self.standing_water_areas.write(context)
+            self._write_chunk(context, "standing_water_areas", incremental)
 
         if self.river_areas is not None:
-            context.write_asset_name(RiverAreas.asset_name)
-            self.river_areas.write(context)
+            self._write_chunk(context, "river_areas", incremental)
 
         if self.standing_wave_areas is not None:
-            context.write_asset_name(StandingWaveAreas.asset_name)
-            self.standing_wave_areas.write(context)
+            self._write_chunk(context, "standing_wave_areas", incremental)
 
-        context.write_asset_name(GlobalLighting.asset_name)
-        self.global_lighting.write(context)
+        self._write_chunk(context, "global_lighting", incremental)
 
         if self.post_effects_chunk is not None:
-            context.write_asset_name(PostEffectsChunk.asset_name)
-            self.post_effects_chunk.write(context)
+            self._write_chunk(context, "post_effects_chunk", incremental)
 
         if self.environment_data is not None:
-            context.write_asset_name(EnvironmentData.asset_name)
-            self.environment_data.write(context)
+            self._write_chunk(context, "environment_data", incremental)
 
         if self.named_cameras is not None:
-            context.write_asset_name(NamedCameras.asset_name)
-            self.named_cameras.write(context)
+            self._write_chunk(context, "named_cameras", incremental)
 
         if self.camera_animation_list is not None:
-            context.write_asset_name(CameraAnimationList.asset_name)
-            self.camera_animation_list.write(context)
+            self._write_chunk(context, "camera_animation_list", incremental)
 
         if self.castle_templates is not None:
-            context.write_asset_name(CastleTemplates.asset_name)
-            self.castle_templates.write(context)
+            self._write_chunk(context, "castle_templates", incremental)
 
-        context.write_asset_name(WaypointsList.asset_name)
-        self.waypoints_list.write(context)
+        self._write_chunk(context, "waypoints_list", incremental)
 
         if self.skybox_settings is not None:
-            context.write_asset_name(SkyboxSettings.asset_name)
-            self.skybox_settings.write(context)
+            self._write_chunk(context, "skybox_settings", incremental)
 
         asset_data = context.stream.getvalue()
         header_stream = BinaryStream(io.BytesIO())
@@ -336,7 +503,48 @@ class Map:
         return header_stream.getvalue() + asset_data
 
 
-def parse_map(file: io.BufferedReader) -> Map:
+# Map attribute holding each top-level asset, by asset name
+ASSET_ATTRIBUTES = {asset.asset_name: attribute for attribute, asset in Map.__annotations__.items()}
+
+# Top-level assets that other assets need when they are parsed
+ASSET_DEPENDENCIES = {
+    BlendTileData.asset_name: (HeightMapData.asset_name,),
+    SidesList.asset_name: (AssetList.asset_name,),
+    BuildLists.asset_name: (AssetList.asset_name,),
+}
+
+
+def required_assets(attributes: Iterable[str]) -> set[str]:
+    """Attributes of the given assets and of every asset they need to be parsed.
+
+    Raises:
+        ValueError: If an attribute does not hold a top-level asset
+    """
+    asset_names = {attribute: name for name, attribute in ASSET_ATTRIBUTES.items()}
+    required = set()
+    pending = list(attributes)
+    while pending:
+        attribute = pending.pop()
+        if attribute not in asset_names:
+            raise ValueError(f"Unknown asset attribute: {attribute}")
+        if attribute not in required:
+            required.add(attribute)
+            pending.extend(ASSET_ATTRIBUTES[name] for name in ASSET_DEPENDENCIES.get(asset_names[attribute], ()))
+    return required
+
+
+def parse_map(file: io.BufferedReader, profile: bool = False, assets: Iterable[str] | None = None) -> Map:
+    """Parse a map from an open file.
+
+    Args:
+        file: Binary file object positioned at the start of the map
+        profile: Record per-asset timings as a ``ProfileNode`` tree on ``Map.profile``
+        assets: Only decode these asset attributes and their dependencies, see ``Map.parse``
+
+    Returns:
+        The parsed Map
+    """
+    profiler = ParseProfiler() if profile else None
     ea_compression = file.read(8)
     if not ea_compression.startswith(b"EAR"):
         file.seek(0)
@@ -344,28 +552,51 @@ def parse_map(file: io.BufferedReader) -> Map:
 
     compressed_data = file.read()
 
+    if profiler is not None:
+        profiler.begin("Decompress", 0)
+
     try:
         decompressed_data = RefpackHandler().decompress_data(compressed_data)
     except Exception:
         decompressed_data = compressed_data
 
+    if profiler is not None:
+        profiler.end(len(compressed_data))
+
+    return _parse_data(BinaryStream(io.BytesIO(decompressed_data)), ea_compression, profiler, assets)
+
+
+def _parse_data(
+    stream: BinaryStream, ea_compression: bytes | None, profiler: ParseProfiler | None, assets: Iterable[str] | None
+) -> Map:
+    """Parse the decompressed contents of a map."""
     logger = logging.getLogger("sagemap")
 
-    stream = BinaryStream(io.BytesIO(decompressed_data))
     context = ParsingContext(stream)
     context.set_logger(logger)
+    context.set_profiler(profiler)
 
     map = Map()
     map.ea_compression_header = ea_compression
-    map.parse(context)
+    map.parse(context, assets=assets)
+
+    if profiler is not None:
+        map.profile = profiler.finish(len(map.source))
 
     return map
 
 
-def write_map(map: Map, compress: bool) -> bytes:
+def write_map(map: Map, compress: bool, incremental: bool = False) -> bytes:
+    """Encode a map.
+
+    Args:
+        map: The map to write
+        compress: Compress the data with refpack
+        incremental: Reuse the original bytes of unmodified chunks, see ``Map.write``
+    """
     stream = BinaryStream(io.BytesIO())
     context = WritingContext(stream)
-    uncompressed_data = map.write(context)
+    uncompressed_data = map.write(context, incremental=incremental)
 
     if compress:
         compressed_data = RefpackHandler().compress_data(uncompressed_data)
@@ -382,12 +613,71 @@ def write_map(map: Map, compress: bool) -> bytes:
     return uncompressed_data
 
 
-def parse_map_from_path(path: str) -> Map:
-    with open(path, "rb") as file:
-        return parse_map(file)
-
+def parse_map_from_path(path: str, profile: bool = False, assets: Iterable[str] | None = None) -> Map:
+    """Parse a map from a file.
 
-def write_map_to_path(map: Map, path: str, compress: bool):
-    data = write_map(map, compress)
+    An uncompressed map is parsed straight from a read-only memory map of the file
+    rather than read into memory first: grids are decoded from NumPy views on the
+    mapping and ``Map.source`` is the mapping itself, so incremental writes copy
+    unmodified chunks from the file. The mapping is closed once the map no longer
+    refers to it, or when ``write_map_to_path`` writes over the file.
+    """
+    with open(path, "rb") as file:
+        if file.read(4) == MAP_MAGIC:
+            try:
+                data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError):
+                # Files that cannot be mapped, such as pipes
+                data = None
+            if data is not None:
+                profiler = ParseProfiler() if profile else None
+                map_obj = _parse_data(BinaryStream(data), None, profiler, assets)
+                map_obj.source_path = os.path.abspath(path)
+                return map_obj
+        file.seek(0)
+        return parse_map(file, profile=profile, assets=assets)
+
+
+def write_map_to_path(map: Map, path: str, compress: bool, incremental: bool = False):
+    """Write a map to a file.
+
+    A map memory-mapped from the same file is copied into memory first. If the mapping
+    cannot be closed yet, the file is replaced rather than truncated under it.
+    """
+    data = write_map(map, compress, incremental=incremental)
+    if isinstance(map.source, mmap.mmap) and _is_source_file(map, path):
+        # Detach the map from its file before truncating it, which would invalidate the mapping
+        source, map.source, map.source_path = map.source, bytes(map.source), None
+        try:
+            source.close()
+        except BufferError:
+            # Still exported by a NumPy view, which would fault on the truncated pages; the
+            # mapping keeps the old file and is closed once that view is released
+            _replace_file(path, data)
+            return
     with open(path, "wb") as file:
         file.write(data)
+
+
+def _is_source_file(map: Map, path: str) -> bool:
+    if map.source_path is None:
+        return False
+    try:
+        return os.path.samefile(path, map.source_path)
+    except OSError:
+        # Either file is missing, so they cannot be the same
+        return False
+
+
+def _replace_file(path: str, data: bytes):
+    """Write ``data`` to a new file and move it over ``path``, keeping its permissions."""
+    target = os.path.realpath(path)
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(target), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(data)
+        shutil.copymode(target, temp_path)
+        os.replace(temp_path, target)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
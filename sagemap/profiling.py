@@ -0,0 +1,159 @@
+"""Opt-in parse profiling: a tree of the time, bytes and allocations of every asset read."""
+
+import json
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Iterator
+
+
+@dataclass
+class ProfileNode:
+    """One profiled asset and the assets nested inside it.
+
+    Times are in seconds; ``start`` is relative to the start of the profile.
+    """
+
+    name: str
+    start: float
+    duration: float = 0.0
+    position: int = 0
+    bytes: int = 0
+    version: int | None = None
+    allocated: int | None = None
+    children: list["ProfileNode"] = field(default_factory=list)
+
+    @property
+    def self_time(self) -> float:
+        """Time spent in this asset excluding its nested assets."""
+        return self.duration - sum(child.duration for child in self.children)
+
+    @property
+    def count(self) -> int:
+        """Number of assets in this subtree, including this one."""
+        return sum(1 for _ in self.walk())
+
+    def walk(self) -> Iterator["ProfileNode"]:
+        """Iterate over this node and all its descendants, depth first."""
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(reversed(node.children))
+
+    def summary(self) -> dict[str, dict]:
+        """Aggregate the subtree by asset name.
+
+        Returns:
+            For each asset name: how many were parsed, their total and self time, and
+            the bytes they consumed, sorted by total time (slowest first)
+        """
+        totals = {}
+        # Each entry on the stack also carries the names of its ancestors, so that the
+        # total time of recursive assets (ScriptGroup in ScriptGroup) is not counted twice.
+        stack = [(self, frozenset())]
+        while stack:
+            node, ancestors = stack.pop()
+            entry = totals.setdefault(node.name, {"count": 0, "time": 0.0, "self_time": 0.0, "bytes": 0})
+            entry["count"] += 1
+            entry["self_time"] += node.self_time
+            if node.name not in ancestors:
+                entry["time"] += node.duration
+                entry["bytes"] += node.bytes
+                if node.allocated is not None:
+                    entry["allocated"] = entry.get("allocated", 0) + node.allocated
+
+            names = ancestors | {node.name}
+            stack.extend((child, names) for child in node.children)
+
+        return dict(sorted(totals.items(), key=lambda item: item[1]["time"], reverse=True))
+
+    def to_chrome_trace(self) -> dict:
+        """Export the tree in the Chrome trace event format.
+
+        The result can be saved as JSON and opened in ``chrome://tracing``, Perfetto or
+        speedscope.
+        """
+        events = []
+        for node in self.walk():
+            args = {"bytes": node.bytes, "position": node.position}
+            if node.version is not None:
+                args["version"] = node.version
+            if node.allocated is not None:
+                args["allocated"] = node.allocated
+
+            events.append(
+                {
+                    "name": node.name,
+                    "cat": "asset",
+                    "ph": "X",
+                    "ts": node.start * 1e6,
+                    "dur": node.duration * 1e6,
+                    "pid": 0,
+                    "tid": 0,
+                    "args": args,
+                }
+            )
+
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def to_flamegraph(self) -> dict:
+        """Export the tree as nested ``{"name", "value", "children"}`` dicts.
+
+        This is the format read by d3-flame-graph; ``value`` is the wall time in
+        microseconds.
+        """
+        return {
+            "name": self.name,
+            "value": round(self.duration * 1e6),
+            "children": [child.to_flamegraph() for child in self.children],
+        }
+
+    def write_chrome_trace(self, path: str):
+        with open(path, "w") as file:
+            json.dump(self.to_chrome_trace(), file)
+
+    def write_flamegraph(self, path: str):
+        with open(path, "w") as file:
+            json.dump(self.to_flamegraph(), file)
+
+
+class ParseProfiler:
+    """Collects a ``ProfileNode`` tree while a map is parsed."""
+
+    def __init__(self, name: str = "Map"):
+        self.origin = time.perf_counter()
+        self.root = ProfileNode(name=name, start=0.0)
+        self.stack = [self.root]
+        self.allocations = [self._traced_memory()]
+
+    @staticmethod
+    def _traced_memory() -> int | None:
+        return tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else None
+
+    def begin(self, name: str, position: int):
+        """Open a node for an asset starting at ``position`` in the stream."""
+        node = ProfileNode(name=name, start=time.perf_counter() - self.origin, position=position)
+        self.stack[-1].children.append(node)
+        self.stack.append(node)
+        self.allocations.append(self._traced_memory())
+
+    def end(self, position: int, version: int | None = None):
+        """Close the innermost node, which ended at ``position`` in the stream."""
+        node = self.stack.pop()
+        allocated_before = self.allocations.pop()
+        self._close(node, allocated_before)
+        node.bytes = position - node.position
+        node.version = version
+
+    def _close(self, node: ProfileNode, allocated_before: int | None):
+        node.duration = time.perf_counter() - self.origin - node.start
+        allocated_after = self._traced_memory()
+        if allocated_before is not None and allocated_after is not None:
+            node.allocated = allocated_after - allocated_before
+
+    def finish(self, size: int = 0) -> ProfileNode:
+        """Close the root node and return the finished tree."""
+        self._close(self.root, self.allocations[0])
+        self.root.bytes = size
+        return self.root
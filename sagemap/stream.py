@@ -1,12 +1,21 @@
 import io
+import mmap
 import struct
 
+import numpy as np
+
+_UINT16 = struct.Struct("<H")
+
 
 class BinaryStream:
     def __init__(self, base_stream, encoding="latin-1"):
         self.base_stream: io.BytesIO = base_stream
         self.encoding = encoding
 
+        # Strings read with intern=True, keyed by their encoded bytes. Object type names,
+        # property values and script arguments repeat thousands of times in a map.
+        self.interned: dict[bytes, str] = {}
+
     def readByte(self) -> bytes:
         return self.base_stream.read(1)
 
@@ -159,9 +168,33 @@ class BinaryStream:
         self.writeUChar(length)
         self.pack(str(length) + "s", value.encode(self.encoding))
 
-    def readUInt16PrefixedAsciiString(self) -> str:
-        lenght = self.readUInt16()
-        return self.readBytes(lenght).decode(self.encoding)
+    def _intern(self, raw: bytes, encoding: str) -> str:
+        value = self.interned.get(raw)
+        if value is None:
+            value = self.interned[raw] = raw.decode(encoding)
+        return value
+
+    def readEncodedString(self, size: int, encoding: str | None = None, intern: bool = False) -> str:
+        """Read ``size`` bytes and decode them, with the stream's encoding by default.
+
+        Args:
+            size: Number of bytes to read
+            encoding: Encoding of the bytes, defaults to ``self.encoding``
+            intern: Return the same string object for every read of the same bytes
+        """
+        raw = self.base_stream.read(size)
+        if intern:
+            return self._intern(raw, encoding or self.encoding)
+        return raw.decode(encoding or self.encoding)
+
+    # The string readers are the most called methods of the stream, so they read the
+    # length and payload straight from the base stream rather than through readUInt16.
+    def readUInt16PrefixedAsciiString(self, intern: bool = False) -> str:
+        read = self.base_stream.read
+        raw = read(_UINT16.unpack(read(2))[0])
+        if intern:
+            return self._intern(raw, self.encoding)
+        return raw.decode(self.encoding)
 
     def writeUInt16PrefixedAsciiString(self, value: str):
         lenght = len(value)
@@ -186,21 +219,30 @@ class BinaryStream:
         b = value.to_bytes(3, "little")
         self.writeBytes(b)
 
-    def readUInt16PrefixedUnicodeString(self) -> str:
-        length = self.readUInt16()
-        return self.readBytes(length * 2).decode("utf-16-le")
+    def readUInt16PrefixedUnicodeString(self, intern: bool = False) -> str:
+        read = self.base_stream.read
+        raw = read(_UINT16.unpack(read(2))[0] * 2)
+        if intern:
+            return self._intern(raw, "utf-16-le")
+        return raw.decode("utf-16-le")
 
     def writeUInt16PrefixedUnicodeString(self, value: str):
         encoded = value.encode("utf-16-le")
         self.writeUInt16(len(value))
         self.writeBytes(encoded)
 
+    def readArray(self, dtype: str, count: int) -> np.ndarray:
+        """Read ``count`` values of a NumPy dtype, as a view on the file when it is memory-mapped."""
+        dtype = np.dtype(dtype)
+        if isinstance(self.base_stream, mmap.mmap):
+            position = self.base_stream.tell()
+            array = np.frombuffer(self.base_stream, dtype, count, position)
+            self.base_stream.seek(position + dtype.itemsize * count)
+            return array
+        return np.frombuffer(self.base_stream.read(dtype.itemsize * count), dtype, count)
+
     def readUInt16Array2D(self, width: int, height: int) -> list[list[int]]:
-        result = [[0] * height for _ in range(width)]
-        for y in range(height):
-            for x in range(width):
-                result[x][y] = self.readUInt16()
-        return result
+        return self.readArray("<u2", width * height).reshape(height, width).T.tolist()
 
     def writeUInt16Array2D(self, array2d: list[list[int]]):
         width = len(array2d)
@@ -217,20 +259,9 @@ class BinaryStream:
             height: Height of the array
             bit_size: Size in bits (16 or 32) - determines whether to read UInt16 or UInt32
         """
-        result = [[0] * height for _ in range(width)]
-
-        for y in range(height):
-            for x in range(width):
-                if bit_size == 16:
-                    value = self.readUInt16()
-                elif bit_size == 32:
-                    value = self.readUInt32()
-                else:
-                    raise ValueError(f"Unsupported bit_size: {bit_size}. Expected 16 or 32.")
-
-                result[x][y] = value
-
-        return result
+        if bit_size not in (16, 32):
+            raise ValueError(f"Unsupported bit_size: {bit_size}. Expected 16 or 32.")
+        return self.readArray(f"<u{bit_size // 8}", width * height).reshape(height, width).T.tolist()
 
     def readSingleBitBooleanArray2D(self, width: int, height: int, row_byte_aligned: bool = True) -> list[list[bool]]:
         """Read a 2D array of single-bit boolean values.
@@ -241,47 +272,24 @@ class BinaryStream:
             row_byte_aligned: If True (default), each row starts on a byte boundary matching C# behavior.
                              If False, bits flow continuously (non-standard).
         """
-        result = [[False] * height for _ in range(width)]
-
         if row_byte_aligned:
             # Each row starts on a fresh byte boundary
-            for y in range(height):
-                temp = 0
-                for x in range(width):
-                    if x % 8 == 0:
-                        temp = self.readUChar()
-
-                    result[x][y] = (temp & (1 << (x % 8))) != 0
+            row_bytes = (width + 7) // 8
+            raw = self.readArray("u1", row_bytes * height).reshape(height, row_bytes)
+            bits = np.unpackbits(raw, axis=1, bitorder="little")[:, :width]
         else:
-            # Bits flow continuously without row alignment
-            temp = 0
-            bit_index = 0
-            for y in range(height):
-                for x in range(width):
-                    if bit_index % 8 == 0:
-                        temp = self.readUChar()
-
-                    result[x][y] = (temp & (1 << (bit_index % 8))) != 0
-                    bit_index += 1
-
-            # Note: If we ended mid-byte, remaining bits are padding
-            # This is implicit since bits_read will be reset on next read
-
-        return result
+            # Bits flow continuously without row alignment; bits after the last value are padding
+            raw = self.readArray("u1", (width * height + 7) // 8)
+            bits = np.unpackbits(raw, bitorder="little")[: width * height].reshape(height, width)
+        return bits.T.astype(bool).tolist()
 
     def readByteArray2D(self, width: int, height: int) -> list[list[int]]:
-        result = [[0] * height for _ in range(width)]
-        for y in range(height):
-            for x in range(width):
-                result[x][y] = self.readUChar()
-        return result
+        return self.readArray("u1", width * height).reshape(height, width).T.tolist()
 
     def readByteArray2DAsEnum(self, width: int, height: int, enum_class):
-        result = [[None] * height for _ in range(width)]
-        for y in range(height):
-            for x in range(width):
-                result[x][y] = enum_class(self.readUChar())
-        return result
+        values = self.readArray("u1", width * height).reshape(height, width).T
+        members = {value: enum_class(value) for value in np.unique(values).tolist()}
+        return [[members[value] for value in column] for column in values.tolist()]
 
     def writeUIntArray2D(self, array2d: list[list[int]], bit_size: int):
         """Write a 2D array of unsigned integers.
@@ -373,4 +381,7 @@ class BinaryStream:
         return self.base_stream.tell()
 
     def getvalue(self):
+        # A memory-mapped file is its own buffer
+        if isinstance(self.base_stream, mmap.mmap):
+            return self.base_stream
         return self.base_stream.getvalue()
@@ -0,0 +1,619 @@
+"""Synthetic map generation, deterministic for a given config including its ``seed``."""
+
+import math
+from dataclasses import dataclass, replace
+
+import numpy as np
+
+from .assets import (
+    BlendTileData,
+    CameraAnimationList,
+    GlobalLighting,
+    HeightMapData,
+    ObjectsList,
+    PlayerScriptsList,
+    SidesList,
+    Teams,
+    TriggerAreas,
+    WaypointsList,
+    WorldInfo,
+)
+from .assets.blend_tile_data import (
+    BlendDescription,
+    BlendTileTexture,
+    TileFlammability,
+    encode_texture_tiles,
+)
+from .assets.camera_animation_list import (
+    CameraAnimation,
+    FreeCameraAnimationCameraFrame,
+    FreeCameraAnimationFrameData,
+    LookAtCameraAnimationCameraFrame,
+    LookAtCameraAnimationFrameData,
+    LookAtCameraAnimationLookAtFrame,
+)
+from .assets.global_lighting import (
+    GlobalLight,
+    GlobalLightingConfiguration,
+    MapColorArgb,
+    TimeOfTheDay,
+)
+from .assets.height_map import HeightMapBorder
+from .assets.object_list import Object
+from .assets.player_scripts import (
+    OrCondition,
+    Script,
+    ScriptArgument,
+    ScriptArgumentType,
+    ScriptDerived,
+    ScriptGroup,
+    ScriptList,
+)
+from .assets.sides_list import Player
+from .assets.teams import Team
+from .assets.trigger_areas import TriggerArea
+from .constants import CELL_SIZE, REQUIRED_PLAYERS
+from .context import AssetPropertyType, Property
+from .map import Map
+
+TEXTURE_NAMES = [
+    "GrassLight",
+    "GrassDark",
+    "GrassDry",
+    "DirtRough",
+    "DirtPath",
+    "RockCliff",
+    "RockGray",
+    "SandBeach",
+    "SnowCaradhras02",
+    "MudWet",
+    "ForestFloor",
+    "AsphaltType1",
+]
+
+# Object templates placed on the map, with their relative frequency. Plot flags, farm
+# templates and trees are included so the linter's placement rules have work to do.
+OBJECT_TYPES = {
+    "TreeOak": 20,
+    "TreeBirch": 20,
+    "TreePine": 15,
+    "RockSmall": 15,
+    "RockLarge": 8,
+    "Shrub": 15,
+    "FenceWood": 4,
+    "FarmTemplate": 1,
+    "ExpansionPlotFlag": 1,
+    "WirtschaftPlotFlag": 1,
+}
+
+# Script actions as (content type, internal name, argument types).
+SCRIPT_ACTIONS = [
+    (
+        125,
+        "CAMERA_FADE_SUBTRACT",
+        [
+            ScriptArgumentType.REAL_NUMBER,
+            ScriptArgumentType.REAL_NUMBER,
+            ScriptArgumentType.INTEGER,
+            ScriptArgumentType.INTEGER,
+            ScriptArgumentType.INTEGER,
+        ],
+    ),
+    (10, "CALL_SUBROUTINE", [ScriptArgumentType.SUBROUTINE_NAME]),
+    (20, "SET_MILLISECOND_TIMER", [ScriptArgumentType.COUNTER_NAME, ScriptArgumentType.REAL_NUMBER]),
+    (177, "NAMED_STOP", [ScriptArgumentType.UNIT_NAME]),
+]
+
+CONDITION_TRUE = (3, "CONDITION_TRUE")
+WAYPOINT_TYPE = "*Waypoints/Waypoint"
+
+
+@dataclass
+class SynthConfig:
+    """Size knobs of a synthetic map.
+
+    ``width`` and ``height`` are height map dimensions in cells, border included. Script
+    trees are built for every player: ``script_depth`` levels of nested ``ScriptGroup``
+    with ``script_breadth`` items each, so every player gets ``script_breadth **
+    (script_depth + 1)`` scripts.
+    """
+
+    width: int = 512
+    height: int = 512
+    border_width: int = 30
+    max_elevation: int = 600
+    texture_count: int = 16
+    object_count: int = 4000
+    waypoint_count: int = 32
+    script_depth: int = 1
+    script_breadth: int = 4
+    script_actions: int = 3
+    trigger_count: int = 64
+    trigger_vertices: int = 8
+    camera_animations: int = 4
+    camera_frames: int = 16
+    seed: int = 0
+
+    def scaled(self, factor: float) -> "SynthConfig":
+        """Copy of this config with ``factor`` times the playable area and element counts.
+
+        Script trees, polygon vertices and camera keyframes keep their size; raise those
+        knobs directly to stress them.
+        """
+        side = math.sqrt(factor)
+        return replace(
+            self,
+            width=round((self.width - 2 * self.border_width) * side) + 2 * self.border_width,
+            height=round((self.height - 2 * self.border_width) * side) + 2 * self.border_width,
+            object_count=round(self.object_count * factor),
+            waypoint_count=round(self.waypoint_count * factor),
+            trigger_count=round(self.trigger_count * factor),
+            camera_animations=round(self.camera_animations * factor),
+        )
+
+
+def _property(name: str, property_type: AssetPropertyType, value) -> Property:
+    return {"name": name, "type": property_type, "value": value}
+
+
+def _properties(*properties: Property) -> dict[str, Property]:
+    return {prop["name"]: prop for prop in properties}
+
+
+def _smooth_noise(rng: np.random.Generator, shape: tuple[int, int], cell: int) -> np.ndarray:
+    """Value noise in [0, 1): random samples every ``cell`` entries, bilinearly interpolated."""
+    coarse = rng.random((shape[0] // cell + 2, shape[1] // cell + 2))
+    r = np.arange(shape[0]) / cell
+    c = np.arange(shape[1]) / cell
+    r0 = r.astype(np.int64)
+    c0 = c.astype(np.int64)
+    fr = (r - r0)[:, None]
+    fc = (c - c0)[None, :]
+
+    top = coarse[r0][:, c0] * (1 - fc) + coarse[r0][:, c0 + 1] * fc
+    bottom = coarse[r0 + 1][:, c0] * (1 - fc) + coarse[r0 + 1][:, c0 + 1] * fc
+    return top * (1 - fr) + bottom * fr
+
+
+def _playable_extent(config: SynthConfig) -> tuple[float, float]:
+    """Size of the playable area in world units."""
+    return (
+        (config.width - 2 * config.border_width) * CELL_SIZE,
+        (config.height - 2 * config.border_width) * CELL_SIZE,
+    )
+
+
+def generate_height_map(config: SynthConfig, rng: np.random.Generator) -> HeightMapData:
+    noise = 0.7 * _smooth_noise(rng, (config.height, config.width), 64)
+    noise += 0.3 * _smooth_noise(rng, (config.height, config.width), 8)
+    elevations = np.rint(noise * config.max_elevation).astype(np.int64)
+
+    return HeightMapData(
+        version=5,
+        width=config.width,
+        height=config.height,
+        border_width=config.border_width,
+        borders=[
+            HeightMapBorder(
+                corner1=(0, 0),
+                position=(config.width - 2 * config.border_width, config.height - 2 * config.border_width),
+            )
+        ],
+        area=config.width * config.height,
+        min_height=int(elevations.min()),
+        max_height=int(elevations.max()),
+        elevations=elevations.tolist(),
+        start_pos=0,
+        end_pos=0,
+    )
+
+
+def generate_blend_tile_data(config: SynthConfig, rng: np.random.Generator) -> BlendTileData:
+    """Build patches of textures with a blend wherever two textures meet along x."""
+    if config.texture_count < 1:
+        raise ValueError(f"texture_count must be at least 1, got: {config.texture_count}")
+
+    textures = []
+    cell_start = 0
+    for index in range(config.texture_count):
+        cell_size = 2 if index % 3 == 0 else 4
+        name = TEXTURE_NAMES[index % len(TEXTURE_NAMES)]
+        if index >= len(TEXTURE_NAMES):
+            name = f"{name}{index // len(TEXTURE_NAMES):02d}"
+
+        textures.append(BlendTileTexture(cell_start, cell_size * cell_size, cell_size, 0, name))
+        cell_start += cell_size * cell_size
+
+    shape = (config.width, config.height)
+    patch = 16
+    patches = rng.integers(config.texture_count, size=(shape[0] // patch + 1, shape[1] // patch + 1))
+    tile_tex = patches[np.arange(shape[0]) // patch][:, np.arange(shape[1]) // patch]
+    tiles = encode_texture_tiles(tile_tex, textures)
+
+    # Every blend starts on a placeholder description; rebuild_blend_descriptions then
+    # points each one at its neighbour's tile and deduplicates them.
+    blends = np.zeros(shape, dtype=np.int64)
+    blends[:-1][tile_tex[:-1] != tile_tex[1:]] = 1
+    placeholder = BlendDescription(
+        secondary_texture_tile=0, raw_blend_direction=b"\x01\x00\x00\x00", flags=0, two_sided=False, magic_value1=0
+    )
+
+    def zeros(dtype=np.int64):
+        return np.zeros(shape, dtype=dtype).tolist()
+
+    blend_tile_data = BlendTileData(
+        version=18,
+        tiles=tiles.tolist(),
+        blends=blends.tolist(),
+        three_way_blends=zeros(),
+        cliff_textures=zeros(),
+        impassability=zeros(bool),
+        impassability_to_players=zeros(bool),
+        passage_widths=zeros(bool),
+        taintability=zeros(bool),
+        extra_passability=zeros(bool),
+        flammability=[[TileFlammability.GRASS] * shape[1] for _ in range(shape[0])],
+        visibility=np.ones(shape, dtype=bool).tolist(),
+        buildability=None,
+        impassability_to_air_units=None,
+        tiberium_growability=None,
+        dynamic_shrubbery_density=None,
+        texture_cell_count=cell_start,
+        parsed_cliff_texture_mappings_count=1,
+        textures=textures,
+        magic_value1=0,
+        magic_value2=0,
+        blend_descriptions=[placeholder],
+        cliff_texture_mappings=[],
+        start_pos=0,
+        end_pos=0,
+    )
+    blend_tile_data.rebuild_blend_descriptions()
+    return blend_tile_data
+
+
+def generate_world_info() -> WorldInfo:
+    properties = _properties(
+        _property("isLivingWorldScriptHolder", AssetPropertyType.Boolean, False),
+        _property("weather", AssetPropertyType.Integer, 0),
+        _property("cameraMaxHeight", AssetPropertyType.RealNumber, 600.0),
+        _property("cameraPitchAngle", AssetPropertyType.RealNumber, 37.5),
+        _property("cameraYawAngle", AssetPropertyType.RealNumber, 0.0),
+        _property("compression", AssetPropertyType.Integer, 1),
+        _property("mapName", AssetPropertyType.AsciiString, "MAP:Synthetic"),
+        _property("mapDescription", AssetPropertyType.AsciiString, "MAP:Synthetic\\Desc"),
+        _property("isScenarioMultiplayer", AssetPropertyType.Boolean, True),
+    )
+    return WorldInfo(version=1, properties=properties, start_pos=0, end_pos=0)
+
+
+def player_names() -> list[str]:
+    """Names of the players of a synthetic map; the first is the neutral player."""
+    return ["", "PlyrCivilian", "PlyrCreeps", *REQUIRED_PLAYERS]
+
+
+def generate_sides_list() -> SidesList:
+    players = []
+    for name in player_names():
+        properties = _properties(
+            _property("playerName", AssetPropertyType.AsciiString, name),
+            _property("playerIsHuman", AssetPropertyType.Boolean, name.startswith("Skirmish")),
+            _property("playerDisplayName", AssetPropertyType.UnicodeString, name or "Neutral"),
+            _property("playerFaction", AssetPropertyType.AsciiString, f"Faction{name[8:]}" if name else ""),
+            _property("playerAllies", AssetPropertyType.AsciiString, ""),
+            _property("playerEnemies", AssetPropertyType.AsciiString, ""),
+        )
+        players.append(Player(properties=properties, build_list_items={}))
+
+    return SidesList(version=6, unknown1=False, players=players, start_pos=0, end_pos=0)
+
+
+def generate_teams() -> Teams:
+    teams = []
+    for name in player_names():
+        properties = _properties(
+            _property("teamName", AssetPropertyType.AsciiString, f"team{name}"),
+            _property("teamOwner", AssetPropertyType.AsciiString, name),
+            _property("teamIsSingleton", AssetPropertyType.Boolean, True),
+        )
+        teams.append(Team(properties=properties))
+
+    return Teams(version=1, teams=teams, start_pos=0, end_pos=0)
+
+
+def _script_argument(argument_type: ScriptArgumentType, rng: np.random.Generator, name: str) -> ScriptArgument:
+    if argument_type == ScriptArgumentType.REAL_NUMBER:
+        return ScriptArgument(argument_type, 0, float(rng.integers(0, 100)), "")
+    if argument_type == ScriptArgumentType.INTEGER:
+        return ScriptArgument(argument_type, int(rng.integers(0, 100)), 0.0, "")
+    return ScriptArgument(argument_type, 0, 0.0, name)
+
+
+def _script_derived(content_type: int, internal_name: str, arguments: list[ScriptArgument], condition: bool):
+    # Conditions and actions store the same fields, but gained them in different versions.
+    return ScriptDerived(
+        version=6 if condition else 3,
+        content_type=content_type,
+        internal_name=(AssetPropertyType.AsciiString, 0, internal_name),
+        arguments=arguments,
+        is_enabled=True,
+        is_inverted=False if condition else None,
+        has_internal_name_version=4 if condition else 2,
+        has_is_enabled_version=5 if condition else 3,
+        has_is_inverted=condition,
+    )
+
+
+def generate_script(name: str, config: SynthConfig, rng: np.random.Generator) -> Script:
+    actions = []
+    for index in rng.integers(len(SCRIPT_ACTIONS), size=config.script_actions):
+        content_type, internal_name, argument_types = SCRIPT_ACTIONS[index]
+        arguments = [_script_argument(argument_type, rng, name) for argument_type in argument_types]
+        actions.append(_script_derived(content_type, internal_name, arguments, condition=False))
+
+    condition = _script_derived(*CONDITION_TRUE, [], condition=True)
+    return Script(
+        name=name,
+        comment="",
+        conditions_comment="",
+        actions_comment="",
+        is_active=True,
+        deactivate_upon_success=False,
+        active_in_easy=True,
+        active_in_medium=True,
+        active_in_hard=True,
+        is_subroutine=False,
+        version=4,
+        start_pos=0,
+        end_pos=0,
+        evaluation_interval=int(rng.integers(0, 30)),
+        actions_fire_sequentially=False,
+        loop_actions=False,
+        loop_count=0,
+        sequential_target_type=True,
+        sequential_target_name="",
+        unknown="ALL",
+        or_conditions=[OrCondition(version=1, conditions=[condition], start_pos=0, end_pos=0)],
+        actions_if_true=actions,
+    )
+
+
+def _script_items(prefix: str, depth: int, config: SynthConfig, rng: np.random.Generator) -> list:
+    items = []
+    for index in range(config.script_breadth):
+        name = f"{prefix}_{index}"
+        if depth < config.script_depth:
+            items.append(
+                ScriptGroup(
+                    version=3,
+                    name=name,
+                    is_active=True,
+                    is_subroutine=False,
+                    start_pos=0,
+                    end_pos=0,
+                    items=_script_items(name, depth + 1, config, rng),
+                )
+            )
+        else:
+            items.append(generate_script(name, config, rng))
+    return items
+
+
+def generate_player_scripts(config: SynthConfig, rng: np.random.Generator) -> PlayerScriptsList:
+    script_lists = []
+    for name in player_names():
+        items = _script_items(f"{name or 'Neutral'}/Script", 0, config, rng)
+        script_lists.append(ScriptList(version=1, items=items, start_pos=0, end_pos=0))
+
+    return PlayerScriptsList(version=1, script_lists=script_lists, start_pos=0, end_pos=0)
+
+
+def _object_properties(unique_id: str, owner: str) -> dict[str, Property]:
+    return _properties(
+        _property("objectInitialHealth", AssetPropertyType.Integer, 100),
+        _property("objectEnabled", AssetPropertyType.Boolean, True),
+        _property("objectIndestructible", AssetPropertyType.Boolean, False),
+        _property("objectUnsellable", AssetPropertyType.Boolean, False),
+        _property("objectPowered", AssetPropertyType.Boolean, True),
+        _property("objectRecruitableAI", AssetPropertyType.Boolean, True),
+        _property("objectTargetable", AssetPropertyType.Boolean, False),
+        _property("originalOwner", AssetPropertyType.AsciiString, owner),
+        _property("uniqueID", AssetPropertyType.AsciiString, unique_id),
+        _property("objectLayer", AssetPropertyType.AsciiString, ""),
+    )
+
+
+def generate_waypoints(
+    config: SynthConfig, rng: np.random.Generator, first_id: int
+) -> tuple[list[Object], WaypointsList]:
+    """Player start and spawn waypoints for every slot, plus ``waypoint_count`` waypoints
+    chained into a single path."""
+    extent_x, extent_y = _playable_extent(config)
+    definitions = []
+    for player in range(1, 9):
+        definitions.append((f"Player_{player}_Start", None))
+        definitions.append((f"Player_{player}_Spawn", "Player_Path"))
+    definitions.extend((f"Waypoint_{index}", "Path_0") for index in range(config.waypoint_count))
+
+    positions = rng.random((len(definitions), 2)) * (extent_x, extent_y)
+    objects = []
+    for index, ((name, path), (x, y)) in enumerate(zip(definitions, positions.tolist())):
+        waypoint_id = first_id + index
+        properties = _object_properties(name, "/team")
+        properties.update(
+            _properties(
+                _property("waypointID", AssetPropertyType.Integer, waypoint_id),
+                _property("waypointName", AssetPropertyType.AsciiString, name),
+                _property("waypointTypeOption", AssetPropertyType.AsciiString, ""),
+            )
+        )
+        if path is not None:
+            properties.update(_properties(_property("waypointPathLabel1", AssetPropertyType.AsciiString, path)))
+
+        objects.append(Object(3, (x, y, 0.0), 0.0, 0, WAYPOINT_TYPE, properties, start_pos=0, end_pos=0))
+
+    path_start = first_id + 16
+    paths = [
+        (waypoint_id, waypoint_id + 1) for waypoint_id in range(path_start, path_start + config.waypoint_count - 1)
+    ]
+    return objects, WaypointsList(version=1, waypoint_paths=paths, start_pos=0, end_pos=0)
+
+
+def generate_objects(config: SynthConfig, rng: np.random.Generator) -> list[Object]:
+    extent_x, extent_y = _playable_extent(config)
+    type_names = list(OBJECT_TYPES)
+    weights = np.array(list(OBJECT_TYPES.values()), dtype=np.float64)
+
+    types = rng.choice(len(type_names), size=config.object_count, p=weights / weights.sum())
+    positions = rng.random((config.object_count, 2)) * (extent_x, extent_y)
+    angles = rng.uniform(-math.pi, math.pi, size=config.object_count)
+
+    objects = []
+    for index, (type_index, (x, y), angle) in enumerate(zip(types.tolist(), positions.tolist(), angles.tolist())):
+        type_name = type_names[type_index]
+        if type_name.endswith("PlotFlag"):
+            angle = 0.0
+
+        properties = _object_properties(f"{type_name}_{index}", "PlyrCivilian/teamPlyrCivilian")
+        objects.append(Object(3, (x, y, 0.0), angle, 0, type_name, properties, start_pos=0, end_pos=0))
+
+    return objects
+
+
+def generate_trigger_areas(config: SynthConfig, rng: np.random.Generator) -> TriggerAreas:
+    """Star-shaped (so never self-intersecting) polygons scattered over the playable area."""
+    if config.trigger_vertices < 3:
+        raise ValueError(f"trigger_vertices must be at least 3, got: {config.trigger_vertices}")
+
+    extent_x, extent_y = _playable_extent(config)
+    trigger_areas = []
+    for index in range(config.trigger_count):
+        center = rng.random(2) * (extent_x, extent_y)
+        angles = np.sort(rng.uniform(0, 2 * math.pi, size=config.trigger_vertices))
+        radii = rng.uniform(20, 200, size=config.trigger_vertices)
+        points = np.stack([center[0] + radii * np.cos(angles), center[1] + radii * np.sin(angles)], axis=1)
+        points = np.clip(np.rint(points), 0, (extent_x, extent_y))
+
+        trigger_areas.append(
+            TriggerArea(
+                name=f"Trigger_{index}",
+                layer_name="",
+                area_id=index + 1,
+                points=[tuple(point) for point in points.tolist()],
+                unknown2=0,
+            )
+        )
+
+    return TriggerAreas(version=1, trigger_areas=trigger_areas, start_pos=0, end_pos=0)
+
+
+def generate_global_lighting() -> GlobalLighting:
+    def light(color: float, direction: tuple[float, float, float]) -> GlobalLight:
+        return GlobalLight(ambient=(0.1, 0.1, 0.1), color=(color, color, color), direction=direction)
+
+    configurations = {}
+    for time in TimeOfTheDay:
+        lights = [light(0.6, (-0.6, 0.35, -0.7)), light(0.35, (0.8, 0.6, -0.07)), light(0.2, (0.3, -0.9, -0.3))]
+        configurations[time] = GlobalLightingConfiguration(
+            terrain_sun=lights[0],
+            object_sun=lights[0],
+            infantry_sun=lights[0],
+            terrain_accent1=lights[1],
+            object_accent1=lights[1],
+            infantry_accent1=lights[1],
+            terrain_accent2=lights[2],
+            object_accent2=lights[2],
+            infantry_accent2=lights[2],
+        )
+
+    return GlobalLighting(
+        version=8,
+        time_of_the_day=TimeOfTheDay.Morning,
+        lighting_configurations=configurations,
+        shadow_color=MapColorArgb(a=0, r=127, g=127, b=127),
+        unknown=bytes(44),
+        unknown2=None,
+        unknown3=None,
+        no_cloud_factor=(1.0, 1.0, 1.0),
+        start_pos=0,
+        end_pos=0,
+    )
+
+
+def generate_camera_animations(config: SynthConfig, rng: np.random.Generator) -> CameraAnimationList:
+    """Alternating free and look-at animations with ``camera_frames`` keyframes each."""
+    extent_x, extent_y = _playable_extent(config)
+    step = 10
+    animations = []
+    for index in range(config.camera_animations):
+        positions = rng.random((config.camera_frames, 3)) * (extent_x, extent_y, 300)
+        frames = [(frame * step, tuple(position)) for frame, position in enumerate(positions.tolist())]
+
+        if index % 2 == 0:
+            animation_type = "free"
+            frame_data = FreeCameraAnimationFrameData(
+                frames=[
+                    FreeCameraAnimationCameraFrame(frame, "catm", position, (0.0, 0.0, 0.0, 1.0), 0.87)
+                    for frame, position in frames
+                ]
+            )
+        else:
+            animation_type = "look"
+            frame_data = LookAtCameraAnimationFrameData(
+                camera_frames=[
+                    LookAtCameraAnimationCameraFrame(frame, "catm", position, 0.0, 0.87) for frame, position in frames
+                ],
+                look_at_frames=[
+                    LookAtCameraAnimationLookAtFrame(frame, "line", (position[0], position[1], 0.0))
+                    for frame, position in frames
+                ],
+            )
+
+        animations.append(
+            CameraAnimation(
+                animation_type=animation_type,
+                name=f"Camera_{index}",
+                num_frames=max(1, (config.camera_frames - 1) * step + 1),
+                start_offset=0,
+                frame_data=frame_data,
+            )
+        )
+
+    return CameraAnimationList(version=3, animations=animations, start_pos=0, end_pos=0)
+
+
+def generate_map(config: SynthConfig | None = None) -> Map:
+    """Build a synthetic map.
+
+    Args:
+        config: Size knobs of the map, defaults to ``SynthConfig()``
+
+    Returns:
+        A Map ready for ``write_map``
+    """
+    config = config if config is not None else SynthConfig()
+    if config.width <= 2 * config.border_width or config.height <= 2 * config.border_width:
+        raise ValueError(
+            f"Map size {config.width}x{config.height} leaves no playable area inside a {config.border_width} border"
+        )
+
+    rng = np.random.default_rng(config.seed)
+
+    map_obj = Map()
+    map_obj.compression_bytes = "CkMp"
+    map_obj.height_map_data = generate_height_map(config, rng)
+    map_obj.blend_tile_data = generate_blend_tile_data(config, rng)
+    map_obj.world_info = generate_world_info()
+    map_obj.sides_list = generate_sides_list()
+    map_obj.teams = generate_teams()
+    map_obj.player_scripts_list = generate_player_scripts(config, rng)
+
+    waypoints, map_obj.waypoints_list = generate_waypoints(config, rng, first_id=1)
+    objects = waypoints + generate_objects(config, rng)
+    map_obj.objects_list = ObjectsList(version=3, object_list=objects, start_pos=0, end_pos=0)
+
+    map_obj.trigger_areas = generate_trigger_areas(config, rng)
+    map_obj.global_lighting = generate_global_lighting()
+    map_obj.camera_animation_list = generate_camera_animations(config, rng)
+
+    return map_obj
@@ -0,0 +1,130 @@
+"""Slope, curvature and cliff layers of a height map, computed in bulk with NumPy.
+
+Layers are indexed ``[y][x]`` in file order (rows from the bottom of the map), like the masks of ``geometry``.
+"""
+
+from functools import cached_property, lru_cache
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from .constants import CELL_SIZE
+from .geometry import terrain_heights
+
+if TYPE_CHECKING:
+    from .assets import BlendTileData, HeightMapData
+
+# Height difference between the corners of a cell above which the pathfinder treats it as a cliff
+CLIFF_HEIGHT_DELTA = 9.8
+
+
+@lru_cache(maxsize=64)
+def _disk_offsets(radius: float) -> tuple[np.ndarray, np.ndarray]:
+    """Offsets ``(dy, dx)`` of the cells within ``radius`` cells of a centre, centre included."""
+    extent = int(radius) + 1
+    dy, dx = np.mgrid[-extent : extent + 1, -extent : extent + 1]
+    inside = np.hypot(dx, dy) <= radius
+    return dy[inside], dx[inside]
+
+
+class TerrainAnalysis:
+    """Derivative layers of a height map, each computed once on first access.
+
+    Args:
+        height_map_data: The terrain to analyse
+        blend_tile_data: Tile layers to compare the terrain against, if available
+    """
+
+    def __init__(self, height_map_data: "HeightMapData", blend_tile_data: "BlendTileData | None" = None):
+        self.height_map_data = height_map_data
+        self.blend_tile_data = blend_tile_data
+        self.width = height_map_data.width
+        self.height = height_map_data.height
+        self.border_width = height_map_data.border_width
+
+    @cached_property
+    def elevations(self) -> np.ndarray:
+        """Raw elevation values."""
+        return np.asarray(self.height_map_data.elevations)[::-1]
+
+    @cached_property
+    def heights(self) -> np.ndarray:
+        """Elevations in world units."""
+        return terrain_heights(self.height_map_data)
+
+    @cached_property
+    def gradient(self) -> tuple[np.ndarray, np.ndarray]:
+        """Rise per world unit along y and x, by central differences."""
+        return tuple(np.gradient(self.heights, CELL_SIZE))
+
+    @cached_property
+    def gradient_magnitude(self) -> np.ndarray:
+        gradient_y, gradient_x = self.gradient
+        return np.hypot(gradient_x, gradient_y)
+
+    @cached_property
+    def slope(self) -> np.ndarray:
+        """Steepest slope at each cell in degrees."""
+        return np.degrees(np.arctan(self.gradient_magnitude))
+
+    @cached_property
+    def curvature(self) -> np.ndarray:
+        """Laplacian of the heights; positive in hollows and negative on ridges."""
+        gradient_y, gradient_x = self.gradient
+        return np.gradient(gradient_y, CELL_SIZE, axis=0) + np.gradient(gradient_x, CELL_SIZE, axis=1)
+
+    @cached_property
+    def relief(self) -> np.ndarray:
+        """Height difference between the highest and lowest corner of each cell."""
+        padded = np.pad(self.heights, ((0, 1), (0, 1)), mode="edge")
+        corners = np.stack((padded[:-1, :-1], padded[1:, :-1], padded[:-1, 1:], padded[1:, 1:]))
+        return corners.max(axis=0) - corners.min(axis=0)
+
+    @cached_property
+    def cliff_mask(self) -> np.ndarray:
+        """Cells too steep for the pathfinder, see ``CLIFF_HEIGHT_DELTA``."""
+        return self.relief > CLIFF_HEIGHT_DELTA
+
+    def _tile_layer(self, name: str) -> np.ndarray | None:
+        layer = getattr(self.blend_tile_data, name, None)
+        return None if layer is None else np.asarray(layer).T
+
+    @cached_property
+    def impassable_mask(self) -> np.ndarray | None:
+        """``BlendTileData.impassability``, or None without tile data."""
+        return self._tile_layer("impassability")
+
+    @cached_property
+    def cliff_texture_mask(self) -> np.ndarray | None:
+        """Cells with a cliff texture mapping in ``BlendTileData.cliff_textures``, or None without tile data."""
+        layer = self._tile_layer("cliff_textures")
+        return None if layer is None else layer != 0
+
+    def cell(self, x: float, y: float) -> tuple[int, int]:
+        """Cell nearest to a world position."""
+        return round(x / CELL_SIZE) + self.border_width, round(y / CELL_SIZE) + self.border_width
+
+    def contains_cell(self, cell_x: int, cell_y: int) -> bool:
+        return 0 <= cell_x < self.width and 0 <= cell_y < self.height
+
+    def disk(self, cell_x: int, cell_y: int, radius: float) -> tuple[np.ndarray, np.ndarray]:
+        """Indices ``(ys, xs)`` of the cells within ``radius`` cells of a centre, clipped to the map."""
+        dy, dx = _disk_offsets(radius)
+        ys, xs = dy + cell_y, dx + cell_x
+        inside = (ys >= 0) & (ys < self.height) & (xs >= 0) & (xs < self.width)
+        return ys[inside], xs[inside]
+
+    def flatness(self, cell_x: int, cell_y: int, radius: float) -> float:
+        """Fraction of the cells within ``radius`` at exactly the elevation of the centre."""
+        if not self.contains_cell(cell_x, cell_y):
+            return 0.0
+        elevations = self.elevations
+        return float(np.mean(elevations[self.disk(cell_x, cell_y, radius)] == elevations[cell_y, cell_x]))
+
+    def max_slope(self, cell_x: int, cell_y: int, radius: float) -> float:
+        """Steepest slope in degrees within ``radius`` cells, 0 outside the map."""
+        window = self.disk(cell_x, cell_y, radius)
+        return float(self.slope[window].max()) if len(window[0]) else 0.0
+
+    def has_cliff(self, cell_x: int, cell_y: int, radius: float) -> bool:
+        return bool(self.cliff_mask[self.disk(cell_x, cell_y, radius)].any())
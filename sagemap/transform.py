@@ -0,0 +1,664 @@
+"""Map-wide terrain transforms backed by NumPy, taking and returning the nested lists stored on the assets."""
+
+import math
+from dataclasses import dataclass, replace
+from enum import Enum
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from .assets.blend_tile_data import (
+    BlendDescription,
+    BlendTileTexture,
+    build_texture_index_table,
+    encode_texture_tiles,
+    lookup_texture_indices,
+)
+from .assets.height_map import HeightMapBorder
+from .constants import CELL_SIZE
+from .context import AssetPropertyType
+
+if TYPE_CHECKING:
+    from .assets import BlendTileData, HeightMapData
+    from .map import Map
+
+
+# Every per-cell layer of BlendTileData that is resampled with nearest neighbour.
+NEAREST_LAYERS = [
+    "impassability",
+    "impassability_to_players",
+    "passage_widths",
+    "taintability",
+    "extra_passability",
+    "flammability",
+    "visibility",
+    "buildability",
+    "impassability_to_air_units",
+    "tiberium_growability",
+    "dynamic_shrubbery_density",
+]
+
+
+def _scaled_size(size: int, scale: float) -> int:
+    return round(size * scale)
+
+
+def _axis_coords(dst_size: int, scale: float, offset: float = 0.0) -> np.ndarray:
+    """Source coordinate sampled by each destination index along one axis."""
+    return (np.arange(dst_size) - offset) / scale
+
+
+def _nearest_indices(coords: np.ndarray, src_size: int) -> tuple[np.ndarray, np.ndarray]:
+    """Clamp sampled coordinates to source indices, also returning which were in bounds."""
+    indices = np.floor(coords).astype(np.int64)
+    inside = (indices >= 0) & (indices < src_size)
+    return np.clip(indices, 0, src_size - 1), inside
+
+
+def _gather_nearest(array: np.ndarray, coords0: np.ndarray, coords1: np.ndarray, fill=None) -> np.ndarray:
+    """Nearest-neighbour gather; out-of-bounds cells repeat the edge, or take ``fill`` if given."""
+    idx0, inside0 = _nearest_indices(coords0, array.shape[0])
+    idx1, inside1 = _nearest_indices(coords1, array.shape[1])
+    result = array[np.ix_(idx0, idx1)]
+    if fill is not None:
+        result = np.where(inside0[:, None] & inside1[None, :], result, fill)
+    return result
+
+
+def _gather_bilinear(array: np.ndarray, coords0: np.ndarray, coords1: np.ndarray) -> np.ndarray:
+    """Bilinear gather rounded back to integers; out-of-bounds cells repeat the edge."""
+    array = np.asarray(array, dtype=np.float64)
+    size0, size1 = array.shape
+
+    coords0 = np.clip(coords0, 0, size0 - 1)
+    coords1 = np.clip(coords1, 0, size1 - 1)
+    r0 = np.floor(coords0).astype(np.int64)
+    c0 = np.floor(coords1).astype(np.int64)
+    r1 = np.minimum(r0 + 1, size0 - 1)
+    c1 = np.minimum(c0 + 1, size1 - 1)
+    fr = (coords0 - r0)[:, None]
+    fc = (coords1 - c0)[None, :]
+
+    value = (
+        array[np.ix_(r0, c0)] * (1 - fr) * (1 - fc)
+        + array[np.ix_(r0, c1)] * (1 - fr) * fc
+        + array[np.ix_(r1, c0)] * fr * (1 - fc)
+        + array[np.ix_(r1, c1)] * fr * fc
+    )
+    return np.rint(value).astype(np.int64)
+
+
+def _to_list(array: np.ndarray, like) -> list:
+    """Convert a result back to nested lists, restoring enum members if ``like`` held any."""
+    result = array.tolist()
+    sample = like[0][0] if like and like[0] else None
+    if isinstance(sample, Enum):
+        enum_class = type(sample)
+        result = [[enum_class(value) for value in row] for row in result]
+    return result
+
+
+def resample_nearest(grid: list[list] | None, scale: float) -> list[list] | None:
+    """Resample a 2D grid with nearest-neighbour sampling.
+
+    Args:
+        grid: Grid to resample, or None
+        scale: Scale factor applied to both dimensions
+
+    Returns:
+        The resampled grid, or None if ``grid`` was None
+    """
+    if grid is None:
+        return None
+
+    array = np.asarray(grid)
+    coords0 = _axis_coords(_scaled_size(array.shape[0], scale), scale)
+    coords1 = _axis_coords(_scaled_size(array.shape[1], scale), scale)
+    return _to_list(_gather_nearest(array, coords0, coords1), grid)
+
+
+def resample_bilinear(grid: list[list[int]], scale: float) -> list[list[int]]:
+    """Resample an integer grid (such as elevations) with bilinear interpolation.
+
+    Args:
+        grid: Grid to resample
+        scale: Scale factor applied to both dimensions
+
+    Returns:
+        The resampled grid, rounded back to integers
+    """
+    array = np.asarray(grid)
+    coords0 = _axis_coords(_scaled_size(array.shape[0], scale), scale)
+    coords1 = _axis_coords(_scaled_size(array.shape[1], scale), scale)
+    return _gather_bilinear(array, coords0, coords1).tolist()
+
+
+def texture_ids(tiles: list[list[int]], textures: list[BlendTileTexture]) -> np.ndarray:
+    """Return the per-tile texture index grid, raising if any tile has no owning texture."""
+    ids = lookup_texture_indices(tiles, build_texture_index_table(textures))
+    if (ids < 0).any():
+        x, y = (int(v) for v in np.argwhere(ids < 0)[0])
+        tile_val = tiles[x][y]
+        raise ValueError(f"No texture owns tile value {tile_val} (global_cell={tile_val // 4})")
+    return ids
+
+
+def _footprint_bounds(dst_size: int, src_size: int, scale: float, offset: float = 0.0) -> tuple[np.ndarray, np.ndarray]:
+    blocks = np.arange(math.ceil(dst_size / 2))
+    starts = np.floor((blocks * 2 - offset) / scale).astype(np.int64)
+    ends = np.ceil((blocks * 2 + 2 - offset) / scale).astype(np.int64)
+    # Blocks outside the source (padding) take the nearest edge cell
+    starts = np.clip(starts, 0, src_size - 1)
+    ends = np.clip(ends, starts + 1, src_size)
+    return starts, ends
+
+
+def _retile_ids(
+    ids: np.ndarray,
+    textures: list[BlendTileTexture],
+    dst_shape: tuple[int, int],
+    scale: float,
+    offsets: tuple[float, float] = (0.0, 0.0),
+) -> np.ndarray:
+    src_rows, src_cols = ids.shape
+    dst_rows, dst_cols = dst_shape
+
+    r_start, r_end = _footprint_bounds(dst_rows, src_rows, scale, offsets[0])
+    c_start, c_end = _footprint_bounds(dst_cols, src_cols, scale, offsets[1])
+    rs, re = r_start[:, None], r_end[:, None]
+    cs, ce = c_start[None, :], c_end[None, :]
+
+    # Count every texture over every block footprint with a summed-area table. Footprints
+    # overlap for non-integer scales, so they cannot be read off a single strided view.
+    best_count = np.zeros((len(r_start), len(c_start)), dtype=np.int64)
+    best_tex = np.zeros_like(best_count)
+    tied = np.zeros(best_count.shape, dtype=bool)
+    for tex_idx in np.unique(ids):
+        table = np.zeros((src_rows + 1, src_cols + 1), dtype=np.int64)
+        table[1:, 1:] = (ids == tex_idx).cumsum(axis=0).cumsum(axis=1)
+        count = table[re, ce] - table[rs, ce] - table[re, cs] + table[rs, cs]
+
+        better = count > best_count
+        tied = np.where(better, False, tied | ((count == best_count) & (count > 0)))
+        best_tex[better] = tex_idx
+        best_count[better] = count[better]
+
+    for block_r, block_c in np.argwhere(tied):
+        counts = {}
+        for tid in ids[r_start[block_r] : r_end[block_r], c_start[block_c] : c_end[block_c]].flat:
+            counts[tid] = counts.get(tid, 0) + 1
+        best_tex[block_r, block_c] = max(counts, key=counts.get)
+
+    # Every block expands to its 2x2 sub-tiles
+    tile_tex = np.repeat(np.repeat(best_tex, 2, axis=0), 2, axis=1)[:dst_rows, :dst_cols]
+    return encode_texture_tiles(tile_tex, textures)
+
+
+def retile(tiles: list[list[int]], textures: list[BlendTileTexture], scale: float) -> list[list[int]]:
+    """Scale tiles by a factor, re-encoding each value for its destination position.
+
+    Destination tiles are processed in 2x2 blocks (the smallest addressable cell unit).
+    Each block takes the texture that covers most of its source footprint, so all 4
+    sub-tiles always share a texture and no checkerboard artefacts appear at texture
+    boundaries. Ties go to the texture seen first when scanning the footprint row by row.
+
+    Args:
+        tiles: Tile grid from ``BlendTileData.tiles``
+        textures: Texture list from ``BlendTileData.textures``
+        scale: Scale factor applied to both dimensions
+
+    Returns:
+        The retiled grid
+    """
+    ids = texture_ids(tiles, textures)
+    dst_shape = (_scaled_size(ids.shape[0], scale), _scaled_size(ids.shape[1], scale))
+    return _retile_ids(ids, textures, dst_shape, scale).tolist()
+
+
+def interior_mask(keys: np.ndarray) -> np.ndarray:
+    """Return a mask of cells whose in-bounds 8 neighbours all share the cell's key."""
+    keys = np.asarray(keys)
+    rows, cols = keys.shape
+    differs = np.zeros(keys.shape, dtype=bool)
+    for dr in (-1, 0, 1):
+        for dc in (-1, 0, 1):
+            if dr == 0 and dc == 0:
+                continue
+            # Destination window and the neighbour window shifted by (dr, dc)
+            r0, r1 = max(0, -dr), rows - max(0, dr)
+            c0, c1 = max(0, -dc), cols - max(0, dc)
+            differs[r0:r1, c0:c1] |= keys[r0:r1, c0:c1] != keys[r0 + dr : r1 + dr, c0 + dc : c1 + dc]
+    return ~differs
+
+
+def clear_interior_blends(
+    tiles: list[list[int]], blend_grid: list[list[int]] | None, textures: list[BlendTileTexture] | None = None
+) -> list[list[int]] | None:
+    """Clear blend values on cells that have no adjacent tile boundary.
+
+    A blend describes a directional texture transition. If all 8 neighbours of a cell
+    share the same texture there is no actual boundary and the blend overlay would
+    appear floating in the middle of a uniform texture.
+
+    Args:
+        tiles: Tile grid the blends apply to
+        blend_grid: Blend index grid to clear, or None
+        textures: When given, boundaries are detected by texture identity rather than raw
+            tile values (required after retiling, where same-texture tiles differ in value)
+
+    Returns:
+        The cleared grid, or None if ``blend_grid`` was None
+    """
+    if blend_grid is None:
+        return None
+
+    keys = texture_ids(tiles, textures) if textures is not None else np.asarray(tiles)
+    blends = np.asarray(blend_grid)
+    return np.where(interior_mask(keys), 0, blends).tolist()
+
+
+IDENTITY = ((1, 0), (0, 1))
+
+# Blend direction encoding (index of the set byte in raw_blend_direction, flipped flag)
+# to the grid offset it blends towards, matching BLEND_DIRECTION_OFFSETS for the axes.
+_BLEND_VECTORS = {
+    (0, 0): (1, 0),
+    (0, 1): (-1, 0),
+    (1, 0): (0, 1),
+    (1, 1): (0, -1),
+    (2, 0): (1, 1),
+    (2, 1): (-1, -1),
+    (3, 0): (-1, 1),
+    (3, 1): (1, -1),
+}
+_BLEND_ENCODINGS = {vector: key for key, vector in _BLEND_VECTORS.items()}
+
+
+def _compose(outer: tuple, inner: tuple) -> tuple:
+    """Multiply two 2x2 integer matrices given as nested tuples."""
+    return tuple(tuple(sum(outer[row][k] * inner[k][col] for k in range(2)) for col in range(2)) for row in range(2))
+
+
+@dataclass
+class TransformPlan:
+    """A chain of map transforms reduced to a single affine map.
+
+    A point ``p`` of the source grid lands on ``scale * matrix @ p + offset`` in the
+    destination grid. Coordinates are height-map cells in ``[x][y]`` order, where cell
+    ``i`` covers ``[i, i + 1)``, and ``matrix`` is one of the 8 axis-aligned flips and
+    quarter turns. The flip or turn is applied to each layer as a NumPy view, so every
+    layer is resampled with exactly one gather.
+    """
+
+    source_size: tuple[int, int]
+    size: tuple[int, int]
+    matrix: tuple[tuple[int, int], tuple[int, int]] = IDENTITY
+    scale: float = 1.0
+    offset: tuple[float, float] = (0.0, 0.0)
+
+    def _source_axis(self, axis: int) -> tuple[int, int]:
+        """Return the source axis sampled by a destination axis, and its direction."""
+        row = self.matrix[axis]
+        source_axis = 0 if row[0] else 1
+        return source_axis, row[source_axis]
+
+    def _flips(self, extent: bool) -> tuple[int, int]:
+        """Shift that keeps each flipped axis of the source view non-negative.
+
+        Cells flip with ``i -> n - 1 - i`` but cell extents flip with ``x -> n - x``.
+        """
+        flips = []
+        for axis in range(2):
+            source_axis, sign = self._source_axis(axis)
+            flips.append(self.source_size[source_axis] - (0 if extent else 1) if sign < 0 else 0)
+        return flips[0], flips[1]
+
+    def _view_offsets(self) -> tuple[float, float]:
+        """Offsets from the flipped source view to the destination grid."""
+        flip0, flip1 = self._flips(extent=True)
+        return self.offset[0] - self.scale * flip0, self.offset[1] - self.scale * flip1
+
+    def _source_view(self, array: np.ndarray) -> np.ndarray:
+        """Return a view of a source ``[x][y]`` array with the flips and turns applied."""
+        view = array if self.matrix[0][0] else array.T
+        if self._source_axis(0)[1] < 0:
+            view = view[::-1]
+        if self._source_axis(1)[1] < 0:
+            view = view[:, ::-1]
+        return view
+
+    def _coords(self) -> tuple[np.ndarray, np.ndarray]:
+        offset0, offset1 = self._view_offsets()
+        return _axis_coords(self.size[0], self.scale, offset0), _axis_coords(self.size[1], self.scale, offset1)
+
+    def _map(self, x: float, y: float, extent: bool) -> tuple[float, float]:
+        (a, b), (c, d) = self.matrix
+        flip0, flip1 = self._flips(extent)
+        offset0, offset1 = self._view_offsets()
+        # Position in the flipped source view, then scaled into the destination grid
+        view_x = a * x + b * y + flip0
+        view_y = c * x + d * y + flip1
+        return self.scale * view_x + offset0, self.scale * view_y + offset1
+
+    def map_point(self, x: float, y: float) -> tuple[float, float]:
+        """Map a point given in height-map sample coordinates (sample ``i`` is at ``i``)."""
+        return self._map(x, y, extent=False)
+
+    def map_extent(self, x: float, y: float) -> tuple[float, float]:
+        """Map a corner of a cell range (cell ``i`` covers ``[i, i + 1)``)."""
+        return self._map(x, y, extent=True)
+
+    def map_vector(self, dx: float, dy: float) -> tuple[float, float]:
+        """Rotate or flip a direction, ignoring scale and offset."""
+        (a, b), (c, d) = self.matrix
+        return a * dx + b * dy, c * dx + d * dy
+
+    def map_angle(self, angle: float) -> float:
+        """Map an angle in radians, measured counter-clockwise from the X axis."""
+        if self.matrix == IDENTITY:
+            return angle
+        dx, dy = self.map_vector(math.cos(angle), math.sin(angle))
+        return math.atan2(dy, dx)
+
+    def resample_nearest(self, grid: list[list] | None, fill=None) -> list[list] | None:
+        """Resample a ``[x][y]`` grid with nearest-neighbour sampling.
+
+        Args:
+            grid: Grid to resample, or None
+            fill: Value for cells outside the source; the edge is repeated when None
+
+        Returns:
+            The resampled grid, or None if ``grid`` was None
+        """
+        if grid is None:
+            return None
+        array = self._source_view(np.asarray(grid))
+        return _to_list(_gather_nearest(array, *self._coords(), fill=fill), grid)
+
+    def resample_bilinear(self, grid: list[list[int]]) -> list[list[int]]:
+        """Resample an integer ``[x][y]`` grid with bilinear interpolation."""
+        array = self._source_view(np.asarray(grid))
+        return _gather_bilinear(array, *self._coords()).tolist()
+
+    def retile(self, tiles: list[list[int]], textures: list[BlendTileTexture]) -> list[list[int]]:
+        """Transform a tile grid, re-encoding each value for its destination position.
+
+        When scaling, see ``retile`` for how each 2x2 destination block picks its texture.
+        Otherwise every tile keeps its own texture.
+        """
+        ids = self._source_view(texture_ids(tiles, textures))
+        if self.scale == 1:
+            return encode_texture_tiles(_gather_nearest(ids, *self._coords()), textures).tolist()
+        return _retile_ids(ids, textures, self.size, self.scale, self._view_offsets()).tolist()
+
+    def orient_blend_description(self, description: BlendDescription) -> BlendDescription:
+        """Return a copy of a blend description with its direction flipped or turned."""
+        raw = description.raw_blend_direction
+        axis = next((index for index, value in enumerate(raw) if value), None)
+        if axis is None or self.matrix == IDENTITY:
+            return replace(description)
+
+        vector = self.map_vector(*_BLEND_VECTORS[(axis, description.flags & 1)])
+        new_axis, flipped = _BLEND_ENCODINGS[vector]
+        new_raw = bytearray(len(raw))
+        new_raw[new_axis] = raw[axis]
+        return replace(description, raw_blend_direction=bytes(new_raw), flags=(description.flags & ~1) | flipped)
+
+    def transform_height_map(self, height_map_data: "HeightMapData"):
+        """Transform a HeightMapData in place, interpolating elevations bilinearly."""
+        hmd = height_map_data
+        new_border_width = round(hmd.border_width * self.scale)
+
+        # Border rectangles are cell ranges relative to the border, clipped to the new playable area
+        playable = [max(0, size - 2 * new_border_width) for size in self.size]
+        borders = []
+        for border in hmd.borders:
+            corners = [
+                self.map_extent(hmd.border_width + x, hmd.border_width + y)
+                for x, y in (border.corner1, border.position)
+            ]
+            lows, highs = [], []
+            for axis, values in enumerate(zip(*corners)):
+                lows.append(min(max(0, round(min(values)) - new_border_width), playable[axis]))
+                highs.append(min(max(0, round(max(values)) - new_border_width), playable[axis]))
+            borders.append(HeightMapBorder(corner1=(lows[0], lows[1]), position=(highs[0], highs[1])))
+
+        # Elevations are stored top row first; flip them into [x][y] order and back
+        elevations = np.asarray(hmd.elevations)[::-1].T
+        result = _gather_bilinear(self._source_view(elevations), *self._coords())
+
+        hmd.width, hmd.height = self.size
+        hmd.border_width = new_border_width
+        hmd.borders = borders
+        hmd.area = hmd.width * hmd.height
+        hmd.elevations = result.T[::-1].tolist()
+        hmd.min_height = int(result.min())
+        hmd.max_height = int(result.max())
+
+    def transform_blend_tile_data(self, blend_tile_data: "BlendTileData"):
+        """Transform every layer of a BlendTileData in place.
+
+        Tiles are retiled by majority vote, blend layers are resampled (and, when scaling,
+        cleared where no texture boundary remains), blend directions follow flips and
+        turns, and blend descriptions are rebuilt for the new tiles. All other layers use
+        nearest-neighbour resampling. Cliff texture UV mappings are left untouched.
+        """
+        btd = blend_tile_data
+        btd.tiles = self.retile(btd.tiles, btd.textures)
+
+        # The interior mask depends only on the tiles, so compute it once for all blend layers.
+        interior = interior_mask(texture_ids(btd.tiles, btd.textures)) if self.scale != 1 else None
+        for layer in ("blends", "three_way_blends", "cliff_textures"):
+            grid = getattr(btd, layer)
+            if grid is None:
+                continue
+            array = _gather_nearest(self._source_view(np.asarray(grid)), *self._coords(), fill=0)
+            if interior is not None:
+                array = np.where(interior, 0, array)
+            setattr(btd, layer, array.tolist())
+
+        if self.matrix != IDENTITY:
+            btd.blend_descriptions = [self.orient_blend_description(desc) for desc in btd.blend_descriptions]
+        btd.rebuild_blend_descriptions()
+
+        for layer in NEAREST_LAYERS:
+            setattr(btd, layer, self.resample_nearest(getattr(btd, layer)))
+
+
+class MapTransform:
+    """Composable map transform pipeline.
+
+    Steps are recorded in order and reduced to a single ``TransformPlan`` when applied,
+    so a chain such as ``MapTransform().crop(...).mirror("x").scale(2)`` resamples every
+    terrain layer once rather than once per step. Object, waypoint, trigger, water,
+    river, build list and camera look-at coordinates follow the terrain.
+
+    Example:
+        >>> MapTransform().pad(20).rotate90().scale(0.5).apply(map_obj)
+    """
+
+    def __init__(self):
+        self.steps: list[tuple[str, tuple]] = []
+
+    def _add(self, name: str, *args) -> "MapTransform":
+        self.steps.append((name, args))
+        return self
+
+    def scale(self, factor: float) -> "MapTransform":
+        """Scale both axes by ``factor``."""
+        if factor <= 0:
+            raise ValueError(f"Scale factor must be positive, got {factor}")
+        return self._add("scale", factor)
+
+    def crop(self, x: int, y: int, width: int, height: int) -> "MapTransform":
+        """Keep the ``width`` x ``height`` cells starting at cell ``(x, y)``."""
+        if width <= 0 or height <= 0:
+            raise ValueError(f"Crop size must be positive, got {width}x{height}")
+        return self._add("crop", x, y, width, height)
+
+    def pad(
+        self, left: int, bottom: int | None = None, right: int | None = None, top: int | None = None
+    ) -> "MapTransform":
+        """Grow the map by whole cells on each side, repeating the edge terrain.
+
+        Omitted sides default to ``left``, so ``pad(n)`` grows every side by ``n``.
+        """
+        bottom = left if bottom is None else bottom
+        right = left if right is None else right
+        top = left if top is None else top
+        return self._add("pad", left, bottom, right, top)
+
+    def mirror(self, axis: str) -> "MapTransform":
+        """Mirror the map along ``"x"`` (left to right) or ``"y"`` (bottom to top)."""
+        if axis not in ("x", "y"):
+            raise ValueError(f"Mirror axis must be 'x' or 'y', got {axis!r}")
+        return self._add("mirror", axis)
+
+    def rotate90(self, turns: int = 1) -> "MapTransform":
+        """Rotate the map counter-clockwise by ``turns`` quarter turns."""
+        return self._add("rotate90", turns % 4)
+
+    def translate(self, dx: int, dy: int) -> "MapTransform":
+        """Shift the map content by whole cells, keeping its size."""
+        return self._add("translate", dx, dy)
+
+    def plan(self, width: int, height: int) -> TransformPlan:
+        """Reduce the recorded steps to a single plan for a grid of the given size."""
+        matrix, scale, (offset_x, offset_y), (w, h) = IDENTITY, 1.0, (0.0, 0.0), (width, height)
+        for name, args in self.steps:
+            if name == "scale":
+                (factor,) = args
+                scale *= factor
+                offset_x, offset_y = offset_x * factor, offset_y * factor
+                w, h = _scaled_size(w, factor), _scaled_size(h, factor)
+            elif name == "crop":
+                x, y, w, h = args
+                offset_x, offset_y = offset_x - x, offset_y - y
+            elif name == "pad":
+                left, bottom, right, top = args
+                offset_x, offset_y = offset_x + left, offset_y + bottom
+                w, h = w + left + right, h + bottom + top
+            elif name == "translate":
+                dx, dy = args
+                offset_x, offset_y = offset_x + dx, offset_y + dy
+            elif name == "mirror":
+                if args[0] == "x":
+                    matrix = _compose(((-1, 0), (0, 1)), matrix)
+                    offset_x = w - offset_x
+                else:
+                    matrix = _compose(((1, 0), (0, -1)), matrix)
+                    offset_y = h - offset_y
+            elif name == "rotate90":
+                for _ in range(args[0]):
+                    # (x, y) -> (h - y, x)
+                    matrix = _compose(((0, -1), (1, 0)), matrix)
+                    offset_x, offset_y = h - offset_y, offset_x
+                    w, h = h, w
+
+            if w <= 0 or h <= 0:
+                raise ValueError(f"Transform step {name}{args} leaves an empty {w}x{h} map")
+
+        return TransformPlan(
+            source_size=(width, height),
+            size=(w, h),
+            matrix=matrix,
+            scale=scale,
+            offset=(offset_x, offset_y),
+        )
+
+    def apply(self, map_obj: "Map") -> TransformPlan:
+        """Apply the pipeline to a whole map in place.
+
+        Args:
+            map_obj: The Map to transform
+
+        Returns:
+            The plan that was applied
+        """
+        hmd = map_obj.height_map_data
+        plan = self.plan(hmd.width, hmd.height)
+        old_border = hmd.border_width
+        # Positions in nearly every chunk change, none of the original bytes can be reused
+        map_obj.mark_dirty()
+
+        plan.transform_height_map(hmd)
+        plan.transform_blend_tile_data(map_obj.blend_tile_data)
+        new_border = hmd.border_width
+
+        def world(x: float, y: float) -> tuple[float, float]:
+            new_x, new_y = plan.map_point(x / CELL_SIZE + old_border, y / CELL_SIZE + old_border)
+            return (new_x - new_border) * CELL_SIZE, (new_y - new_border) * CELL_SIZE
+
+        if map_obj.objects_list is not None:
+            for obj in map_obj.objects_list.object_list:
+                obj.position = (*world(obj.position[0], obj.position[1]), obj.position[2])
+                obj.angle = plan.map_angle(obj.angle)
+
+        if map_obj.sides_list is not None:
+            for player in map_obj.sides_list.players:
+                for item in player.build_list_items.values():
+                    item.location = (*world(item.location[0], item.location[1]), item.location[2])
+                    item.angle = plan.map_angle(item.angle)
+
+        if map_obj.polygon_triggers is not None:
+            for trigger in map_obj.polygon_triggers.polygon_triggers:
+                trigger.points = [(*(round(v) for v in world(x, y)), z) for x, y, z in trigger.points]
+
+        if map_obj.trigger_areas is not None:
+            for area in map_obj.trigger_areas.trigger_areas:
+                area.points = [world(x, y) for x, y in area.points]
+
+        if map_obj.standing_water_areas is not None:
+            for area in map_obj.standing_water_areas.areas:
+                area.points = [world(x, y) for x, y in area.points]
+
+        if map_obj.standing_wave_areas is not None:
+            for area in map_obj.standing_wave_areas.areas:
+                area.points = [world(x, y) for x, y in area.points]
+
+        if map_obj.river_areas is not None:
+            for area in map_obj.river_areas.areas:
+                area.lines = [(world(*start), world(*end)) for start, end in area.lines]
+
+        if map_obj.named_cameras is not None:
+            for camera in map_obj.named_cameras.cameras:
+                camera.look_at_point = (
+                    *world(camera.look_at_point[0], camera.look_at_point[1]),
+                    camera.look_at_point[2],
+                )
+
+        return plan
+
+
+def scale_height_map(height_map_data: "HeightMapData", scale: float):
+    """Scale a HeightMapData in place, interpolating elevations bilinearly."""
+    hmd = height_map_data
+    MapTransform().scale(scale).plan(hmd.width, hmd.height).transform_height_map(hmd)
+
+
+def scale_blend_tile_data(blend_tile_data: "BlendTileData", scale: float):
+    """Scale every layer of a BlendTileData in place.
+
+    See ``TransformPlan.transform_blend_tile_data``.
+    """
+    btd = blend_tile_data
+    MapTransform().scale(scale).plan(len(btd.tiles), len(btd.tiles[0])).transform_blend_tile_data(btd)
+
+
+def scale_map(map_obj: "Map", scale: float, scale_objects: bool = False):
+    """Scale a whole map in place by a numeric factor.
+
+    Args:
+        map_obj: The Map to scale
+        scale: Scale factor (e.g. 2, 0.5)
+        scale_objects: Also scale object prototype sizes via ``objectPrototypeScale``
+    """
+    MapTransform().scale(scale).apply(map_obj)
+
+    if scale_objects:
+        for obj in map_obj.objects_list.object_list:
+            obj.properties["objectPrototypeScale"] = {
+                "name": "objectPrototypeScale",
+                "type": AssetPropertyType.RealNumber,
+                "value": scale,
+            }
@@ -0,0 +1,301 @@
+"""Structural validation of map files, walking the asset headers without decoding any asset."""
+
+import io
+import struct
+from dataclasses import asdict, dataclass, field
+
+from reversebox.compression.compression_refpack import RefpackHandler
+
+from .assets import (
+    AssetList,
+    BlendTileData,
+    BuildLists,
+    CameraAnimationList,
+    CastleTemplates,
+    EnvironmentData,
+    FogSettings,
+    GlobalLighting,
+    GlobalVersion,
+    HeightMapData,
+    LibraryMapLists,
+    MissionHotSpots,
+    MissionObjectives,
+    MPPositionList,
+    NamedCameras,
+    ObjectsList,
+    PlayerScriptsList,
+    PolygonTriggers,
+    PostEffectsChunk,
+    RiverAreas,
+    SidesList,
+    SkyboxSettings,
+    StandingWaterAreas,
+    StandingWaveAreas,
+    Teams,
+    TriggerAreas,
+    WaterSettings,
+    WaypointsList,
+    WorldInfo,
+)
+from .assets.library_map_lists import LibraryMaps
+from .assets.mp_positions import MPPosition
+from .assets.object_list import Object
+from .assets.player_scripts import Script, ScriptGroup, ScriptList
+from .context import ParsingContext
+from .stream import BinaryStream
+
+# Asset index, version and datasize
+_ASSET_HEADER = struct.Struct("<IHI")
+_UINT16 = struct.Struct("<H")
+
+TOP_LEVEL_ASSETS = frozenset(
+    asset.asset_name
+    for asset in (
+        AssetList,
+        BlendTileData,
+        BuildLists,
+        CameraAnimationList,
+        CastleTemplates,
+        EnvironmentData,
+        FogSettings,
+        GlobalLighting,
+        GlobalVersion,
+        HeightMapData,
+        LibraryMapLists,
+        MissionHotSpots,
+        MissionObjectives,
+        MPPositionList,
+        NamedCameras,
+        ObjectsList,
+        PlayerScriptsList,
+        PolygonTriggers,
+        PostEffectsChunk,
+        RiverAreas,
+        SidesList,
+        SkyboxSettings,
+        StandingWaterAreas,
+        StandingWaveAreas,
+        Teams,
+        TriggerAreas,
+        WaterSettings,
+        WaypointsList,
+        WorldInfo,
+    )
+)
+
+# Assets that write_map emits for every map
+REQUIRED_ASSETS = (
+    HeightMapData.asset_name,
+    BlendTileData.asset_name,
+    WorldInfo.asset_name,
+    SidesList.asset_name,
+    ObjectsList.asset_name,
+    GlobalLighting.asset_name,
+    WaypointsList.asset_name,
+)
+
+# Assets whose body is a sequence of child assets, with the child names allowed. Script
+# bodies start with fields that cannot be skipped without decoding them, so scripts are
+# checked as a whole but not descended into.
+CONTAINER_ASSETS = {
+    ObjectsList.asset_name: (Object.asset_name,),
+    PlayerScriptsList.asset_name: (ScriptList.asset_name,),
+    ScriptList.asset_name: (ScriptGroup.asset_name, Script.asset_name),
+    ScriptGroup.asset_name: (ScriptGroup.asset_name, Script.asset_name),
+    LibraryMapLists.asset_name: (LibraryMaps.asset_name,),
+    MPPositionList.asset_name: (MPPosition.asset_name,),
+}
+
+
+def _script_group_prefix(data: bytes, body: int) -> int:
+    """Size of the name and flags preceding the children of a ScriptGroup."""
+    return _UINT16.size + _UINT16.unpack_from(data, body)[0] + 2
+
+
+CONTAINER_PREFIXES = {ScriptGroup.asset_name: _script_group_prefix}
+
+
+@dataclass
+class ValidationIssue:
+    offset: int
+    path: str
+    message: str
+
+
+@dataclass
+class AssetHeader:
+    """A top-level asset, with the number of child asset headers walked inside it."""
+
+    name: str
+    version: int
+    offset: int
+    datasize: int
+    children: int = 0
+
+
+@dataclass
+class ValidationReport:
+    """Result of ``validate``. Offsets are in the decompressed map data."""
+
+    path: str | None
+    compressed: bool
+    size: int
+    compression_bytes: str | None = None
+    assets: list[AssetHeader] = field(default_factory=list)
+    issues: list[ValidationIssue] = field(default_factory=list)
+
+    @property
+    def valid(self) -> bool:
+        return not self.issues
+
+    def add_issue(self, offset: int, path: str, message: str):
+        self.issues.append(ValidationIssue(offset, path, message))
+
+    def to_dict(self) -> dict:
+        return {**asdict(self), "valid": self.valid}
+
+
+def _walk_children(
+    data: bytes,
+    table: dict[int, str],
+    start: int,
+    end: int,
+    path: str,
+    allowed: tuple[str, ...],
+    report: ValidationReport,
+) -> int:
+    """Check the child assets filling ``data[start:end]``, returning how many were walked."""
+    count = 0
+    position = start
+    while position < end:
+        if position + _ASSET_HEADER.size > end:
+            report.add_issue(position, path, f"Truncated asset header: {end - position} bytes left in {path}")
+            return count
+
+        index, _, datasize = _ASSET_HEADER.unpack_from(data, position)
+        body = position + _ASSET_HEADER.size
+        asset_end = body + datasize
+        count += 1
+
+        name = table.get(index)
+        if name is None:
+            report.add_issue(position, path, f"Asset index {index} is not in the asset table")
+        elif name not in allowed:
+            report.add_issue(position, path, f"Unexpected {name} asset, expected one of: {', '.join(allowed)}")
+
+        if asset_end > end:
+            report.add_issue(
+                position, path, f"{name or index} datasize {datasize} overruns {path} by {asset_end - end} bytes"
+            )
+            return count
+
+        if name in CONTAINER_ASSETS:
+            count += _walk_container(data, table, name, body, asset_end, f"{path}/{name}", report)
+
+        position = asset_end
+
+    return count
+
+
+def _walk_container(
+    data: bytes, table: dict[int, str], name: str, body: int, end: int, path: str, report: ValidationReport
+) -> int:
+    prefix = CONTAINER_PREFIXES.get(name)
+    start = body
+    if prefix is not None:
+        if body + _UINT16.size > end or body + prefix(data, body) > end:
+            report.add_issue(body, path, f"{name} fields overrun its datasize")
+            return 0
+        start = body + prefix(data, body)
+
+    return _walk_children(data, table, start, end, path, CONTAINER_ASSETS[name], report)
+
+
+def decompress_map(data: bytes) -> tuple[bytes, bool]:
+    """Strip the optional EAR header and decompress map file contents, as ``parse_map`` does.
+
+    Returns:
+        The decompressed data and whether it was compressed
+    """
+    payload = data[8:] if data.startswith(b"EAR") else data
+    try:
+        return RefpackHandler().decompress_data(payload), True
+    except Exception:
+        return payload, False
+
+
+def validate_data(data: bytes, path: str | None = None) -> ValidationReport:
+    """Validate the structure of map file contents, compressed or not.
+
+    Args:
+        data: Contents of the map file, including the optional EAR header
+        path: Path to report the map under
+    """
+    decompressed, compressed = decompress_map(data)
+    return validate_decompressed(decompressed, path=path, compressed=compressed)
+
+
+def validate_decompressed(decompressed: bytes, path: str | None = None, compressed: bool = False) -> ValidationReport:
+    """Validate the structure of already decompressed map data."""
+    report = ValidationReport(path=path, compressed=compressed, size=len(decompressed))
+
+    context = ParsingContext(BinaryStream(io.BytesIO(decompressed)))
+    try:
+        table = context.parse_assets()
+    except (ValueError, struct.error, UnicodeDecodeError) as e:
+        report.add_issue(context.stream.tell(), "", f"Invalid asset table: {e}")
+        return report
+
+    report.compression_bytes = context.compression_bytes
+    seen = set()
+    position = context.stream.tell()
+    end = len(decompressed)
+    while position < end:
+        if position + _ASSET_HEADER.size > end:
+            report.add_issue(position, "", f"Truncated asset header: {end - position} bytes left")
+            break
+
+        index, version, datasize = _ASSET_HEADER.unpack_from(decompressed, position)
+        body = position + _ASSET_HEADER.size
+        asset_end = body + datasize
+
+        name = table.get(index)
+        if name is None:
+            report.add_issue(position, "", f"Asset index {index} is not in the asset table")
+            name = str(index)
+        elif name not in TOP_LEVEL_ASSETS:
+            report.add_issue(position, name, f"Unknown top-level asset: {name}")
+        elif name == BlendTileData.asset_name and HeightMapData.asset_name not in seen:
+            report.add_issue(position, name, "BlendTileData appears before HeightMapData")
+
+        header = AssetHeader(name, version, position, datasize)
+        report.assets.append(header)
+        seen.add(name)
+
+        if asset_end > end:
+            report.add_issue(position, name, f"datasize {datasize} overruns the map by {asset_end - end} bytes")
+            break
+
+        if name in CONTAINER_ASSETS:
+            header.children = _walk_container(decompressed, table, name, body, asset_end, name, report)
+
+        position = asset_end
+
+    for name in REQUIRED_ASSETS:
+        if name not in seen:
+            report.add_issue(end, name, f"Missing required asset: {name}")
+
+    return report
+
+
+def validate(path: str) -> ValidationReport:
+    """Validate the structure of a map file without parsing its assets.
+
+    Args:
+        path: Path of the map file
+
+    Returns:
+        A ``ValidationReport``; the map is structurally sound if ``report.valid``
+    """
+    with open(path, "rb") as file:
+        return validate_data(file.read(), path=str(path))
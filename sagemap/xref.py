@@ -0,0 +1,327 @@
+"""Cross-reference graph between scripts and the entities they name."""
+
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from .assets.player_scripts import ScriptArgumentType, ScriptGroup
+
+if TYPE_CHECKING:
+    from .assets.player_scripts import Script
+    from .map import Map
+
+
+class NodeKind(IntEnum):
+    SCRIPT = 0
+    SCRIPT_GROUP = 1
+    TEAM = 2
+    PLAYER = 3
+    WAYPOINT = 4
+    WAYPOINT_PATH = 5
+    TRIGGER_AREA = 6
+    UNIT = 7
+
+
+# Kind of entity named by each script argument type. SCRIPT_NAME may also name a script
+# group, which is resolved once every script and group is known.
+ARGUMENT_KINDS = {
+    ScriptArgumentType.SCRIPT_NAME: NodeKind.SCRIPT,
+    ScriptArgumentType.SUBROUTINE_NAME: NodeKind.SCRIPT,
+    ScriptArgumentType.TEAM_NAME: NodeKind.TEAM,
+    ScriptArgumentType.PLAYER_NAME: NodeKind.PLAYER,
+    ScriptArgumentType.WAYPOINT_NAME: NodeKind.WAYPOINT,
+    ScriptArgumentType.WAYPOINT_PATH_NAME: NodeKind.WAYPOINT_PATH,
+    ScriptArgumentType.TRIGGER_AREA_NAME: NodeKind.TRIGGER_AREA,
+    ScriptArgumentType.UNIT_NAME: NodeKind.UNIT,
+}
+
+WAYPOINT_TYPE = "*Waypoints/Waypoint"
+WAYPOINT_PATH_LABELS = ("waypointPathLabel1", "waypointPathLabel2", "waypointPathLabel3")
+
+# Team and object properties naming a script the game runs on an event; there are
+# numbered generic hooks (``teamGenericScriptHook0``, ...) as well
+TEAM_SCRIPT_PROPERTIES = (
+    "teamOnCreateScript",
+    "teamOnIdleScript",
+    "teamOnUnitDestroyedScript",
+    "teamOnDestroyedScript",
+    "teamEnemySightedScript",
+    "teamAllClearScript",
+)
+TEAM_GENERIC_SCRIPT_HOOK = "teamGenericScriptHook"
+OBJECT_SCRIPT_PROPERTIES = ("objectScriptAttachment",)
+
+
+def _csr(sources: np.ndarray, targets: np.ndarray, node_count: int) -> tuple[np.ndarray, np.ndarray]:
+    """Compressed sparse rows of the edges ``sources[i] -> targets[i]``."""
+    order = np.argsort(sources, kind="stable")
+    offsets = np.zeros(node_count + 1, dtype=np.int64)
+    np.cumsum(np.bincount(sources, minlength=node_count), out=offsets[1:])
+    return offsets, targets[order]
+
+
+@dataclass
+class ReferenceGraph:
+    """Entities of a map and the references between them.
+
+    Node ``i`` has kind ``kinds[i]`` and name ``names[i]``. ``defined[i]`` is False for
+    nodes that are only known because something refers to them. The successors of ``i``
+    are ``targets[offsets[i]:offsets[i + 1]]`` and its predecessors
+    ``sources[reverse_offsets[i]:reverse_offsets[i + 1]]``. ``hooked[i]`` is True for
+    scripts a team or object hook runs.
+
+    Edges point from the referring entity to the referred one: scripts to what their
+    arguments name, script groups to their contents, teams to their player and hook
+    scripts, named units to their attached script, and waypoints to their path labels
+    and the waypoints they link to.
+    """
+
+    kinds: np.ndarray
+    names: list[str]
+    defined: np.ndarray
+    subroutine: np.ndarray
+    hooked: np.ndarray
+    offsets: np.ndarray
+    targets: np.ndarray
+    reverse_offsets: np.ndarray
+    sources: np.ndarray
+    ids: dict[tuple[NodeKind, str], int]
+
+    @property
+    def node_count(self) -> int:
+        return len(self.names)
+
+    def node(self, kind: NodeKind, name: str) -> int | None:
+        return self.ids.get((kind, name))
+
+    def successors(self, node: int) -> np.ndarray:
+        return self.targets[self.offsets[node] : self.offsets[node + 1]]
+
+    def predecessors(self, node: int) -> np.ndarray:
+        return self.sources[self.reverse_offsets[node] : self.reverse_offsets[node + 1]]
+
+    def in_degree(self) -> np.ndarray:
+        return np.diff(self.reverse_offsets)
+
+    def _of_kinds(self, kinds: tuple[NodeKind, ...]) -> np.ndarray:
+        if not kinds:
+            return np.ones(self.node_count, dtype=bool)
+        return np.isin(self.kinds, [int(kind) for kind in kinds])
+
+    def dangling(self, *kinds: NodeKind) -> np.ndarray:
+        """Nodes that are referenced but not defined, optionally only of the given kinds."""
+        return np.flatnonzero(~self.defined & self._of_kinds(kinds))
+
+    def unused(self, *kinds: NodeKind) -> np.ndarray:
+        """Defined nodes nothing refers to, optionally only of the given kinds."""
+        return np.flatnonzero(self.defined & (self.in_degree() == 0) & self._of_kinds(kinds))
+
+    def reachable(self, roots: np.ndarray) -> np.ndarray:
+        """Boolean mask of the nodes reachable from ``roots``, roots included."""
+        seen = np.zeros(self.node_count, dtype=bool)
+        seen[roots] = True
+        frontier = np.asarray(roots, dtype=np.int64)
+        while len(frontier):
+            starts = self.offsets[frontier]
+            counts = self.offsets[frontier + 1] - starts
+            # Gather every successor of the frontier at once.
+            positions = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+            successors = np.unique(self.targets[positions])
+            frontier = successors[~seen[successors]]
+            seen[frontier] = True
+        return seen
+
+    def unreachable_subroutines(self) -> np.ndarray:
+        """Subroutine scripts that neither a regular script nor a team or object hook runs.
+
+        Subroutines called by reachable subroutines are reachable as well.
+        """
+        scripts = self.defined & (self.kinds == NodeKind.SCRIPT)
+        reachable = self.reachable(np.flatnonzero((scripts & ~self.subroutine) | self.hooked))
+        return np.flatnonzero(scripts & self.subroutine & ~reachable)
+
+
+class _GraphBuilder:
+    def __init__(self):
+        self.ids: dict[tuple[NodeKind, str], int] = {}
+        self.kinds: list[int] = []
+        self.names: list[str] = []
+        self.defined: list[bool] = []
+        self.subroutine: list[bool] = []
+        self.hooked: set[int] = set()
+        self.edge_sources: list[int] = []
+        self.edge_targets: list[int] = []
+
+    def node(self, kind: NodeKind, name: str, define: bool = False) -> int:
+        key = (kind, name)
+        node = self.ids.get(key)
+        if node is None:
+            node = self.ids[key] = len(self.names)
+            self.kinds.append(kind)
+            self.names.append(name)
+            self.defined.append(False)
+            self.subroutine.append(False)
+        if define:
+            self.defined[node] = True
+        return node
+
+    def edge(self, source: int, target: int):
+        self.edge_sources.append(source)
+        self.edge_targets.append(target)
+
+    def build(self) -> ReferenceGraph:
+        node_count = len(self.names)
+        hooked = np.zeros(node_count, dtype=bool)
+        hooked[list(self.hooked)] = True
+        edges = np.unique(np.array([self.edge_sources, self.edge_targets], dtype=np.int64).reshape(2, -1), axis=1)
+        offsets, targets = _csr(edges[0], edges[1], node_count)
+        reverse_offsets, sources = _csr(edges[1], edges[0], node_count)
+        return ReferenceGraph(
+            kinds=np.array(self.kinds, dtype=np.int8),
+            names=self.names,
+            defined=np.array(self.defined, dtype=bool),
+            subroutine=np.array(self.subroutine, dtype=bool),
+            hooked=hooked,
+            offsets=offsets,
+            targets=targets,
+            reverse_offsets=reverse_offsets,
+            sources=sources,
+            ids=self.ids,
+        )
+
+
+def _team_hooks(properties: dict) -> list[str]:
+    return [
+        prop["value"]
+        for key, prop in properties.items()
+        if (key in TEAM_SCRIPT_PROPERTIES or key.startswith(TEAM_GENERIC_SCRIPT_HOOK))
+        and isinstance(prop["value"], str)
+        and prop["value"]
+    ]
+
+
+def _define_entities(builder: _GraphBuilder, map_obj: "Map") -> list[tuple[int | None, str]]:
+    """Define every entity but scripts, returning the script hooks as (team or unit node, script name).
+
+    Hooks of unnamed objects have no node to start from.
+    """
+    hooks = []
+    if map_obj.sides_list is not None:
+        for player in map_obj.sides_list.players:
+            builder.node(NodeKind.PLAYER, player.properties["playerName"]["value"], define=True)
+
+    if map_obj.teams is not None:
+        for team in map_obj.teams.teams:
+            node = builder.node(NodeKind.TEAM, team.properties["teamName"]["value"], define=True)
+            owner = team.properties.get("teamOwner", {}).get("value")
+            if owner:
+                builder.edge(node, builder.node(NodeKind.PLAYER, owner))
+            hooks.extend((node, script) for script in _team_hooks(team.properties))
+
+    if map_obj.trigger_areas is not None:
+        for area in map_obj.trigger_areas.trigger_areas:
+            builder.node(NodeKind.TRIGGER_AREA, area.name, define=True)
+
+    if map_obj.polygon_triggers is not None:
+        for trigger in map_obj.polygon_triggers.polygon_triggers:
+            builder.node(NodeKind.TRIGGER_AREA, trigger.name, define=True)
+
+    waypoints_by_id = {}
+    if map_obj.objects_list is not None:
+        for obj in map_obj.objects_list.object_list:
+            properties = obj.properties
+            if obj.type_name == WAYPOINT_TYPE and "waypointName" in properties:
+                node = builder.node(NodeKind.WAYPOINT, properties["waypointName"]["value"], define=True)
+                if "waypointID" in properties:
+                    waypoints_by_id[properties["waypointID"]["value"]] = node
+                for label in WAYPOINT_PATH_LABELS:
+                    if properties.get(label, {}).get("value"):
+                        builder.edge(
+                            node, builder.node(NodeKind.WAYPOINT_PATH, properties[label]["value"], define=True)
+                        )
+                continue
+
+            node = None
+            if properties.get("objectName", {}).get("value"):
+                node = builder.node(NodeKind.UNIT, properties["objectName"]["value"], define=True)
+            for key in OBJECT_SCRIPT_PROPERTIES:
+                script = properties.get(key, {}).get("value")
+                if isinstance(script, str) and script:
+                    hooks.append((node, script))
+
+    if map_obj.waypoints_list is not None:
+        for start_id, end_id in map_obj.waypoints_list.waypoint_paths:
+            if start_id in waypoints_by_id and end_id in waypoints_by_id:
+                builder.edge(waypoints_by_id[start_id], waypoints_by_id[end_id])
+
+    return hooks
+
+
+def _script_nodes(builder: _GraphBuilder, map_obj: "Map") -> list[tuple[int, "Script"]]:
+    """Define every script and group, returning the scripts with their node ids."""
+    scripts = []
+    if map_obj.player_scripts_list is None:
+        return scripts
+
+    for script_list in map_obj.player_scripts_list.script_lists:
+        # (parent group node, inside a subroutine group, item)
+        stack = [(None, False, item) for item in reversed(script_list.items)]
+        while stack:
+            parent, in_subroutine, item = stack.pop()
+            is_group = isinstance(item, ScriptGroup)
+            node = builder.node(NodeKind.SCRIPT_GROUP if is_group else NodeKind.SCRIPT, item.name, define=True)
+            subroutine = in_subroutine or item.is_subroutine
+            builder.subroutine[node] = builder.subroutine[node] or subroutine
+            if parent is not None:
+                builder.edge(parent, node)
+
+            if is_group:
+                stack.extend((node, subroutine, child) for child in reversed(item.items))
+            else:
+                scripts.append((node, item))
+
+    return scripts
+
+
+def _resolve(builder: _GraphBuilder, kind: NodeKind, name: str) -> int:
+    if kind == NodeKind.SCRIPT:
+        if (NodeKind.SCRIPT, name) not in builder.ids and (NodeKind.SCRIPT_GROUP, name) in builder.ids:
+            return builder.ids[(NodeKind.SCRIPT_GROUP, name)]
+    elif kind == NodeKind.TEAM and "/" in name and (kind, name) not in builder.ids:
+        # Teams can be qualified with their owner: "PlyrCivilian/teamPlyrCivilian".
+        name = name.rsplit("/", 1)[1]
+    return builder.node(kind, name)
+
+
+def build_reference_graph(map_obj: "Map") -> ReferenceGraph:
+    """Build the reference graph of a map.
+
+    Placeholder names such as ``<This Player>`` and ``<All Players>`` are not entities
+    and are skipped.
+    """
+    builder = _GraphBuilder()
+    hooks = _define_entities(builder, map_obj)
+    scripts = _script_nodes(builder, map_obj)
+
+    # Resolved once scripts are defined, since a hook may name a script group
+    for node, name in hooks:
+        script = _resolve(builder, NodeKind.SCRIPT, name)
+        builder.hooked.add(script)
+        if node is not None:
+            builder.edge(node, script)
+
+    for node, script in scripts:
+        contents = [condition for or_condition in script.or_conditions for condition in or_condition.conditions]
+        contents.extend(script.actions_if_true)
+        contents.extend(script.actions_if_false)
+        for content in contents:
+            for argument in content.arguments:
+                kind = ARGUMENT_KINDS.get(argument.type)
+                value = argument.string_value
+                if kind is None or not value or value.startswith("<"):
+                    continue
+                builder.edge(node, _resolve(builder, kind, value))
+
+    return builder.build()
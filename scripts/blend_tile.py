@@ -21,6 +21,7 @@ from pathlib import Path
 
 from sagemap import parse_map_from_path, write_map_to_path
 from sagemap.assets.blend_tile_data import (
+    BLEND_DIRECTION_OFFSETS,
     BlendDescription,
     BlendDirection,
     BlendTileData,
@@ -49,11 +50,13 @@ def print_map(btd: BlendTileData) -> None:
     texture_names = [t.name for t in btd.textures]
     texture_symbol = {name: symbols[i % len(symbols)] for i, name in enumerate(texture_names)}
 
-    def tile_to_texture(tile_idx: int) -> str:
-        for tex in btd.textures:
-            if tex.cell_start <= tile_idx < tex.cell_start + tex.cell_count:
-                return texture_symbol[tex.name]
-        return "?"
+    tex_ids = btd.texture_index_grid().tolist()
+
+    def tile_to_texture(x: int, y: int) -> str:
+        tex_idx = tex_ids[x][y]
+        if tex_idx < 0:
+            return "?"
+        return texture_symbol[btd.textures[tex_idx].name]
 
     # Internal layout is [internal_row][internal_col].
     # Editor view is transposed: editor_row = internal_col, editor_col = internal_row.
@@ -64,7 +67,7 @@ def print_map(btd: BlendTileData) -> None:
     print(col_header)
     print("    " + "--" * editor_cols + "-")
     for er in range(editor_rows):
-        row_str = " ".join(tile_to_texture(btd.tiles[ec][er]) for ec in range(editor_cols))
+        row_str = " ".join(tile_to_texture(ec, er) for ec in range(editor_cols))
         blend_str = " ".join(str(btd.blends[ec][er]) if btd.blends[ec][er] else "." for ec in range(editor_cols))
         print(f"{er:2}| {row_str}   blends: {blend_str}")
     print()
@@ -74,12 +77,7 @@ def print_map(btd: BlendTileData) -> None:
 
 
 def blend_tile(btd: BlendTileData, row: int, col: int, direction: BlendDirection) -> None:
-    dr, dc = {
-        BlendDirection.RIGHT_TO_LEFT: (1, 0),
-        BlendDirection.LEFT_TO_RIGHT: (-1, 0),
-        BlendDirection.TOP_TO_BOTTOM: (0, 1),
-        BlendDirection.BOTTOM_TO_TOP: (0, -1),
-    }[direction]
+    dr, dc = BLEND_DIRECTION_OFFSETS[direction]
 
     neighbour_row = row + dr
     neighbour_col = col + dc
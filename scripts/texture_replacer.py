@@ -19,41 +19,26 @@ import sys
 from pathlib import Path
 
 from sagemap import parse_map_from_path, write_map_to_path
-from sagemap.assets.blend_tile_data import BlendDescription, BlendDirection
 
 # ---------------------------------------------------------------------------
 # Internal helpers – tile re-encoding and blend rebuilding
 # ---------------------------------------------------------------------------
 
 
-def _find_texture_for_tile(tile_val, textures):
-    global_cell = tile_val // 4
-    for tex in textures:
-        if tex.cell_start <= global_cell < tex.cell_start + tex.cell_count:
-            return tex
-    return None
-
-
-def _retile_after_resize(tiles, old_ranges, new_textures):
+def _retile_after_resize(tiles, old_tex_ids, new_textures):
     """Re-encode every tile using the updated cell_size / cell_start values.
 
-    old_ranges is a list of (old_cell_start, old_cell_count, index) tuples
-    captured *before* any texture metadata was modified.
+    old_tex_ids is the per-tile texture index grid captured *before* any texture
+    metadata was modified (-1 for tiles no texture owned).
     """
     rows = len(tiles)
     cols = len(tiles[0])
     result = [[0] * cols for _ in range(rows)]
     for r in range(rows):
         for c in range(cols):
-            old_val = tiles[r][c]
-            old_global_cell = old_val // 4
-            tex_idx = None
-            for i, (start, count, _) in enumerate(old_ranges):
-                if start <= old_global_cell < start + count:
-                    tex_idx = i
-                    break
-            if tex_idx is None:
-                result[r][c] = old_val
+            tex_idx = old_tex_ids[r][c]
+            if tex_idx < 0:
+                result[r][c] = tiles[r][c]
                 continue
             new_tex = new_textures[tex_idx]
             cr = (r // 2) % new_tex.cell_size
@@ -63,20 +48,20 @@ def _retile_after_resize(tiles, old_ranges, new_textures):
     return result
 
 
-def _clear_interior_blends(tiles, blend_grid, textures):
+def _clear_interior_blends(tex_ids, blend_grid):
     """Zero blend entries where all 8 neighbours share the same texture."""
     if blend_grid is None:
         return None
-    rows = len(tiles)
-    cols = len(tiles[0])
+    rows = len(tex_ids)
+    cols = len(tex_ids[0])
     result = [row[:] for row in blend_grid]
     for r in range(rows):
         for c in range(cols):
             if result[r][c] == 0:
                 continue
-            ref = _find_texture_for_tile(tiles[r][c], textures)
+            ref = tex_ids[r][c]
             all_same = all(
-                _find_texture_for_tile(tiles[r + dr][c + dc], textures) is ref
+                tex_ids[r + dr][c + dc] == ref
                 for dr in (-1, 0, 1)
                 for dc in (-1, 0, 1)
                 if (dr != 0 or dc != 0) and 0 <= r + dr < rows and 0 <= c + dc < cols
@@ -86,58 +71,6 @@ def _clear_interior_blends(tiles, blend_grid, textures):
     return result
 
 
-def _rebuild_blends(blends, three_way_blends, old_descriptions, retiled_tiles):
-    """Recompute secondary_texture_tile from the updated tile grid and deduplicate."""
-    _DIR_DELTAS = {
-        BlendDirection.RIGHT_TO_LEFT: (1, 0),
-        BlendDirection.LEFT_TO_RIGHT: (-1, 0),
-        BlendDirection.TOP_TO_BOTTOM: (0, 1),
-        BlendDirection.BOTTOM_TO_TOP: (0, -1),
-    }
-    rows = len(retiled_tiles)
-    cols = len(retiled_tiles[0])
-    new_descriptions = []
-    key_to_idx = {}
-    new_blends = [[0] * cols for _ in range(rows)]
-    new_three_way = [[0] * cols for _ in range(rows)]
-
-    for src_grid, dst_grid in [(blends, new_blends), (three_way_blends, new_three_way)]:
-        for r in range(rows):
-            for c in range(cols):
-                old_idx = src_grid[r][c]
-                if old_idx == 0:
-                    continue
-                old_desc = old_descriptions[old_idx - 1]
-                direction = old_desc.blend_direction
-                dr, dc = _DIR_DELTAS[direction]
-                nr, nc = r + dr, c + dc
-                if 0 <= nr < rows and 0 <= nc < cols:
-                    secondary = retiled_tiles[nr][nc]
-                else:
-                    secondary = old_desc.secondary_texture_tile
-                key = (
-                    secondary,
-                    bytes(old_desc.raw_blend_direction),
-                    old_desc.flags,
-                    old_desc.two_sided,
-                    old_desc.magic_value1,
-                )
-                if key not in key_to_idx:
-                    key_to_idx[key] = len(new_descriptions) + 1
-                    new_descriptions.append(
-                        BlendDescription(
-                            secondary_texture_tile=secondary,
-                            raw_blend_direction=old_desc.raw_blend_direction,
-                            flags=old_desc.flags,
-                            two_sided=old_desc.two_sided,
-                            magic_value1=old_desc.magic_value1,
-                        )
-                    )
-                dst_grid[r][c] = key_to_idx[key]
-
-    return new_blends, new_three_way, new_descriptions
-
-
 # ---------------------------------------------------------------------------
 # Public API
 # ---------------------------------------------------------------------------
@@ -205,8 +138,8 @@ def apply_replacements(map_path: str, mapping: dict, output_path: str = None):
 
     btd = sage_map.blend_tile_data
 
-    # Snapshot old ranges before touching anything.
-    old_ranges = [(tex.cell_start, tex.cell_count, i) for i, tex in enumerate(btd.textures)]
+    # Snapshot the old tile -> texture mapping before touching anything.
+    old_tex_ids = btd.texture_index_grid().tolist()
 
     print(f"\nApplying {len(active)} replacement(s):")
     replaced_count = 0
@@ -244,19 +177,18 @@ def apply_replacements(map_path: str, mapping: dict, output_path: str = None):
         btd.texture_cell_count = cursor
 
         # Re-encode all tile values for new cell layout.
-        old_descs = btd.blend_descriptions[:]
-        btd.tiles = _retile_after_resize(btd.tiles, old_ranges, btd.textures)
+        old_desc_count = len(btd.blend_descriptions)
+        btd.tiles = _retile_after_resize(btd.tiles, old_tex_ids, btd.textures)
 
         # Clear blends that are now interior (same texture on all sides).
-        cleared_blends = _clear_interior_blends(btd.tiles, btd.blends, btd.textures)
-        cleared_three_way = _clear_interior_blends(btd.tiles, btd.three_way_blends, btd.textures)
-        btd.cliff_textures = _clear_interior_blends(btd.tiles, btd.cliff_textures, btd.textures)
+        new_tex_ids = btd.texture_index_grid().tolist()
+        btd.blends = _clear_interior_blends(new_tex_ids, btd.blends)
+        btd.three_way_blends = _clear_interior_blends(new_tex_ids, btd.three_way_blends)
+        btd.cliff_textures = _clear_interior_blends(new_tex_ids, btd.cliff_textures)
 
         # Rebuild blend descriptions with updated secondary_texture_tile values.
-        btd.blends, btd.three_way_blends, btd.blend_descriptions = _rebuild_blends(
-            cleared_blends, cleared_three_way, old_descs, btd.tiles
-        )
-        print(f"  Re-tiling done. blend_descriptions: {len(old_descs)} -> {len(btd.blend_descriptions)}")
+        btd.rebuild_blend_descriptions()
+        print(f"  Re-tiling done. blend_descriptions: {old_desc_count} -> {len(btd.blend_descriptions)}")
 
     if output_path is None:
         output_path = map_path
@@ -2,10 +2,18 @@
 
 import io
 import json
+from dataclasses import replace
 from pathlib import Path
 
+from sagemap import parse_map, write_map
+from sagemap.assets import RiverAreas, StandingWaterAreas
+from sagemap.assets.river_areas import RiverArea
+from sagemap.assets.standing_water_area import StandingWaterArea
 from sagemap.context import ParsingContext, WritingContext
 from sagemap.stream import BinaryStream
+from sagemap.synth import SynthConfig, generate_map
+
+SYNTHETIC_CONFIG = SynthConfig(width=64, height=64, border_width=8, object_count=20, script_depth=1, script_breadth=2)
 
 
 def load_asset_bytes(asset_name: str) -> bytes:
@@ -70,3 +78,26 @@ def create_writing_context(asset_name: str) -> WritingContext:
     context.assets_by_index = asset_list.copy()
     context.index_by_asset = {v: k for k, v in asset_list.items()}
     return context
+
+
+def synthetic_map(**overrides):
+    """Generate a small synthetic map; keyword arguments override fields of ``SYNTHETIC_CONFIG``."""
+    return generate_map(replace(SYNTHETIC_CONFIG, **overrides))
+
+
+def parse_synthetic(**overrides):
+    """Write a synthetic map uncompressed and parse it back, returning the bytes and the parsed map."""
+    data = write_map(synthetic_map(**overrides), compress=False)
+    return data, parse_map(io.BytesIO(data))
+
+
+def add_water(map_obj, water_height: int):
+    """Give a synthetic map a square lake and a river with a bend."""
+    lake = [(50.0, 50.0), (250.0, 50.0), (250.0, 250.0), (50.0, 250.0)]
+    map_obj.standing_water_areas = StandingWaterAreas(
+        1, [StandingWaterArea(1, "Lake", None, 0.0, False, "", "", lake, water_height, "", "")], 0, 0
+    )
+    lines = [((300.0, 0.0), (340.0, 0.0)), ((300.0, 200.0), (340.0, 200.0)), ((450.0, 300.0), (450.0, 260.0))]
+    river = RiverArea(3, 2, "River", "", 0.0, False, "", "", "", "", (0, 0, 0), 0, 1.0, water_height, None, "", lines)
+    map_obj.river_areas = RiverAreas(1, [river], 0, 0)
+    return lake, lines
@@ -1,6 +1,7 @@
 """Test BlendTileData asset parsing."""
 
 from sagemap.assets import BlendTileData, HeightMapData
+from sagemap.assets.blend_tile_data import BLEND_DIRECTION_OFFSETS
 
 from .conftest import create_context, create_writing_context, load_asset_bytes
 
@@ -36,3 +37,51 @@ def test_blend_tile_data_write():
 
     # Compare
     assert written_bytes == asset_bytes
+
+
+def test_blend_tile_data_texture_index_grid():
+    """Test the texture index grid matches a linear scan over the textures."""
+    asset_bytes = load_asset_bytes("BlendTileData")
+    height_map_bytes = load_asset_bytes("HeightMapData")
+
+    height_map = HeightMapData.parse(create_context(height_map_bytes, "HeightMapData"))
+    result = BlendTileData.parse(create_context(asset_bytes, "BlendTileData"), height_map)
+
+    def linear_scan(tile_val):
+        for index, tex in enumerate(result.textures):
+            if tex.cell_start <= tile_val // 4 < tex.cell_start + tex.cell_count:
+                return index
+        return -1
+
+    grid = result.texture_index_grid()
+    assert grid.shape == (len(result.tiles), len(result.tiles[0]))
+    for x, column in enumerate(result.tiles):
+        for y, tile_val in enumerate(column):
+            assert grid[x][y] == linear_scan(tile_val)
+
+
+def test_blend_tile_data_rebuild_blend_descriptions():
+    """Test rebuilt blend descriptions point at the neighbour tile they blend towards."""
+    asset_bytes = load_asset_bytes("BlendTileData")
+    height_map_bytes = load_asset_bytes("HeightMapData")
+
+    height_map = HeightMapData.parse(create_context(height_map_bytes, "HeightMapData"))
+    result = BlendTileData.parse(create_context(asset_bytes, "BlendTileData"), height_map)
+    old_descriptions = result.blend_descriptions[:]
+    old_blends = [column[:] for column in result.blends]
+
+    result.rebuild_blend_descriptions()
+
+    assert len(set(map(repr, result.blend_descriptions))) == len(result.blend_descriptions)
+    for x, column in enumerate(result.blends):
+        for y, index in enumerate(column):
+            assert (index == 0) == (old_blends[x][y] == 0)
+            if index == 0:
+                continue
+
+            desc = result.blend_descriptions[index - 1]
+            old_desc = old_descriptions[old_blends[x][y] - 1]
+            assert desc.blend_direction == old_desc.blend_direction
+            dx, dy = BLEND_DIRECTION_OFFSETS[desc.blend_direction]
+            if 0 <= x + dx < len(result.tiles) and 0 <= y + dy < len(result.tiles[0]):
+                assert desc.secondary_texture_tile == result.tiles[x + dx][y + dy]
@@ -0,0 +1,69 @@
+"""Test the chunk-level map diff."""
+
+import numpy as np
+import pytest
+
+from sagemap import write_map
+from sagemap.diff import GridRegion, changed_regions, diff_maps
+
+from .conftest import synthetic_map
+
+
+def test_diff_unchanged():
+    """Test identical maps have no changed chunks."""
+    data = write_map(synthetic_map(width=96, height=96, object_count=40), compress=False)
+    result = diff_maps(data, data)
+    assert not result.changed
+    assert {chunk.status for chunk in result.chunks} == {"unchanged"}
+
+
+def test_diff_changed_chunks():
+    """Test only the edited chunks are reported, with object, script and grid details."""
+    map_obj = synthetic_map(width=96, height=96, object_count=40)
+    old = write_map(map_obj, compress=False)
+
+    elevations = map_obj.height_map_data.elevations
+    elevations[-1][2] += 1  # file row 0
+    elevations[-3][4] += 1
+    elevations[10][90] += 1
+    objects = map_obj.objects_list.object_list
+    moved = objects[0]
+    moved.position = (moved.position[0] + 10, moved.position[1], moved.position[2])
+    removed = objects.pop(1)
+    script = map_obj.player_scripts_list.script_lists[0].items[0].items[0]
+    script.is_active = not script.is_active
+
+    result = diff_maps(old, write_map(map_obj, compress=False))
+    changed = {chunk.name: chunk.fields for chunk in result.chunks if chunk.status == "changed"}
+    assert changed == {
+        "HeightMapData": ["elevations"],
+        "ObjectsList": ["object_list"],
+        "PlayerScriptsList": ["script_lists"],
+    }
+
+    assert [(diff.status, diff.changes) for diff in result.objects] == [("changed", ["position"]), ("removed", [])]
+    assert result.objects[1].key == removed.properties["uniqueID"]["value"]
+    assert [(diff.name, diff.changes) for diff in result.scripts] == [(script.name, ["is_active"])]
+
+    (grid,) = result.grids
+    assert (grid.layer, grid.changed_cells) == ("elevations", 3)
+    assert grid.regions == [GridRegion(2, 0, 4, 2, 2), GridRegion(90, 85, 90, 85, 1)]
+
+
+def test_changed_regions():
+    """Test nearby changed cells merge into one box and distant ones stay separate."""
+    mask = np.zeros((64, 64), dtype=bool)
+    mask[[1, 20, 40], [1, 18, 60]] = True
+    assert changed_regions(mask) == [GridRegion(1, 1, 18, 20, 2), GridRegion(60, 40, 60, 40, 1)]
+    assert changed_regions(mask, block_size=4) == [
+        GridRegion(1, 1, 1, 1, 1),
+        GridRegion(18, 20, 18, 20, 1),
+        GridRegion(60, 40, 60, 40, 1),
+    ]
+
+
+def test_diff_invalid_map():
+    """Test structurally invalid maps are rejected."""
+    data = write_map(synthetic_map(width=96, height=96, object_count=40), compress=False)
+    with pytest.raises(ValueError):
+        diff_maps(data, data[:-5])
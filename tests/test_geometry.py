@@ -0,0 +1,121 @@
+"""Test point-in-polygon queries and polygon rasterization."""
+
+import numpy as np
+
+from sagemap.geometry import (
+    PolygonKind,
+    PolygonSet,
+    object_positions,
+    point_in_polygon,
+    polygons_from_map,
+    rasterize_polygon,
+    river_quads,
+    terrain_heights,
+    water_mask,
+)
+
+from .conftest import add_water, synthetic_map
+
+SQUARE = [(0.0, 0.0), (100.0, 0.0), (100.0, 100.0), (0.0, 100.0)]
+# A U shape, concave between x 30 and 70 above y 40
+U_SHAPE = [
+    (0.0, 0.0),
+    (100.0, 0.0),
+    (100.0, 100.0),
+    (70.0, 100.0),
+    (70.0, 40.0),
+    (30.0, 40.0),
+    (30.0, 100.0),
+    (0.0, 100.0),
+]
+
+
+def test_point_in_polygon():
+    """Test the even-odd test on a concave polygon and the per-kind queries of a set."""
+    points = np.array([(15.0, 80.0), (50.0, 80.0), (50.0, 20.0), (85.0, 80.0), (150.0, 20.0), (-1.0, 50.0)])
+    assert point_in_polygon(np.array(U_SHAPE), points).tolist() == [True, False, True, True, False, False]
+
+    polygons = PolygonSet.from_polygons(
+        [
+            (PolygonKind.TRIGGER_AREA, "u", U_SHAPE, None),
+            (PolygonKind.STANDING_WATER, "square", [(x + 40, y, 5) for x, y in SQUARE], None),
+        ]
+    )
+    assert polygons.bounds.tolist() == [[0, 0, 100, 100], [40, 0, 140, 100]]
+    assert polygons.contains(1, points).tolist() == [False, True, True, True, False, False]
+
+    point_indices, polygon_indices = polygons.locate(points)
+    assert sorted(zip(point_indices.tolist(), polygon_indices.tolist())) == [
+        (0, 0),
+        (1, 1),
+        (2, 0),
+        (2, 1),
+        (3, 0),
+        (3, 1),
+    ]
+    assert polygons.inside_any(points, PolygonKind.TRIGGER_AREA).tolist() == [True, False, True, True, False, False]
+
+
+def test_locate_matches_brute_force():
+    """Test the prefiltered queries over a synthetic map agree with testing every polygon."""
+    map_obj = synthetic_map(object_count=400, trigger_count=12, trigger_vertices=7)
+    polygons = polygons_from_map(map_obj)
+    positions = object_positions(map_obj.objects_list.object_list)
+    assert len(polygons.of_kinds(PolygonKind.TRIGGER_AREA)) == 12
+
+    expected = {
+        (point, index)
+        for index in range(len(polygons))
+        for point in np.flatnonzero(point_in_polygon(polygons.polygon(index), positions))
+    }
+    assert expected
+    assert set(zip(*(array.tolist() for array in polygons.locate(positions)))) == expected
+    for index in range(len(polygons)):
+        assert np.array_equal(polygons.contains(index, positions), point_in_polygon(polygons.polygon(index), positions))
+
+
+def test_rasterize():
+    """Test the scanline fill covers exactly the grid points inside each polygon."""
+    map_obj = synthetic_map(object_count=400, trigger_count=12, trigger_vertices=7)
+    hmd = map_obj.height_map_data
+    polygons = polygons_from_map(map_obj)
+
+    y, x = np.mgrid[: hmd.height, : hmd.width]
+    grid_points = np.column_stack(((x.ravel() - hmd.border_width) * 10.0, (y.ravel() - hmd.border_width) * 10.0))
+    for index in range(len(polygons)):
+        mask = polygons.terrain_mask(index, hmd)
+        assert mask.shape == (hmd.height, hmd.width)
+        expected = point_in_polygon(polygons.polygon(index), grid_points).reshape(mask.shape)
+        assert np.array_equal(mask, expected)
+
+    # The U shape covers grid points 0 to 9 on both axes, less the notch of x 3 to 6 from y 4 up
+    mask = PolygonSet.from_polygons([(PolygonKind.TRIGGER_AREA, "u", U_SHAPE, None)]).rasterize(0, 16, 16)
+    assert mask.sum() == 10 * 10 - 4 * 6
+    assert not mask[4, 3] and mask[3, 3] and mask[4, 2] and mask[4, 7]
+
+    # Grid point (270, 300) lies on the first edge, where scaling to cells rounds the crossing the other way
+    edge = np.array([[176.0, 254.0], [317.0, 323.0], [188.0, 295.0]])
+    mask = rasterize_polygon(edge, 64, 64, 8)
+    assert np.array_equal(mask, point_in_polygon(edge, grid_points).reshape(mask.shape))
+
+
+def test_water_mask():
+    """Test cells inside water polygons and river strips are under water where the terrain is below it."""
+    map_obj = synthetic_map(object_count=400, trigger_count=12, trigger_vertices=7)
+    hmd = map_obj.height_map_data
+    heights = terrain_heights(hmd)
+    water_height = int(np.median(heights))
+    lake, lines = add_water(map_obj, water_height)
+
+    quads = river_quads(lines)
+    assert [quad.tolist() for quad in quads][0] == [[300, 0], [340, 0], [340, 200], [300, 200]]
+
+    covered = rasterize_polygon(np.array(lake), hmd.width, hmd.height, hmd.border_width)
+    for quad in quads:
+        covered |= rasterize_polygon(quad, hmd.width, hmd.height, hmd.border_width)
+
+    mask = water_mask(map_obj)
+    assert np.array_equal(mask, covered & (heights < water_height))
+    assert 0 < mask.sum() < covered.sum()
+    # Terrain outside every water polygon stays dry even if it is low
+    assert not (mask & ~covered).any()
@@ -1,5 +1,7 @@
 """Test HeightMapData asset parsing."""
 
+import pytest
+
 from sagemap.assets import HeightMapData
 
 from .conftest import create_context, create_writing_context, load_asset_bytes
@@ -29,3 +31,13 @@ def test_height_map_data_write():
 
     # Compare
     assert written_bytes == asset_bytes
+
+
+@pytest.mark.parametrize("elevation", [-1, 0x10000])
+def test_height_map_data_write_out_of_range(elevation):
+    """Test writing elevations that do not fit the cell size fails instead of wrapping around."""
+    result = HeightMapData.parse(create_context(load_asset_bytes("HeightMapData"), "HeightMapData"))
+    result.elevations[0][0] = elevation
+
+    with pytest.raises(ValueError):
+        result.write(create_writing_context("HeightMapData"))
@@ -0,0 +1,103 @@
+"""Test array-backed height map editing."""
+
+import io
+import pickle
+
+import numpy as np
+
+from sagemap import parse_map, write_map
+from sagemap.heightfield import MAX_DIRTY_REGIONS, Region
+
+from .conftest import parse_synthetic
+
+
+def test_height_field_operations():
+    """Test region operations edit the buffer and the nested lists, tracking dirty regions and extremes."""
+    _, map_obj = parse_synthetic(height=48, object_count=0)
+    field = map_obj.height_field
+    assert map_obj.height_field is field
+    original = np.asarray(map_obj.height_map_data.elevations)[::-1]
+    assert np.array_equal(field.values, original)
+
+    assert field.fill(-5, -5, 4, 3, 1000) == 12
+    assert field.dirty == [Region(0, 0, 4, 3)]
+    assert field.max_height == 1000
+
+    assert field.flatten_disk(30, 20, 2, value=0) == 13
+    assert field.min_height == 0 and field.dirty[-1] == Region(28, 18, 33, 23)
+    assert field.flatten_disk(30, 20, 2, value=0) == 0 and len(field.dirty) == 2
+
+    # The brush falls off from its centre and clips to the value range
+    field.fill(40, 10, 50, 20, 500)
+    field.brush(45, 15, 4, 100)
+    assert field.values[15, 45] == 600 and field.values[15, 48] == 525 and field.values[15, 49] == 500
+    field.brush(45, 15, 4, -10000)
+    assert field.values[15, 45] == 0
+
+    field.fill(0, 0, 4, 3, int(original.max()))
+    assert field.max_height == max(int(original.max()), 500)
+
+    field.fill(10, 30, 20, 40, 100)
+    field.fill(14, 34, 15, 35, 1000)
+    field.smooth(14, 34, 15, 35)
+    assert field.values[34, 14] == 200
+
+    patch = np.arange(6).reshape(2, 3) * 10
+    field.paste(62, 46, patch)
+    assert field.values[46:48, 62:64].tolist() == [[0, 10], [30, 40]]
+
+    values = field.values
+    assert np.array_equal(np.asarray(map_obj.height_map_data.elevations)[::-1], values)
+    assert (field.min_height, field.max_height) == (values.min(), values.max())
+
+    for x in range(MAX_DIRTY_REGIONS + 1):
+        field.fill(x % 64, 0, x % 64 + 1, 1, x + 2000)
+    assert len(field.dirty) <= MAX_DIRTY_REGIONS and field.dirty_bounds == Region(0, 0, 64, 48)
+
+
+def test_height_field_write():
+    """Test incremental writes patch the dirty regions into the original chunk."""
+    data, map_obj = parse_synthetic(height=48, object_count=0)
+    terrain = map_obj.terrain
+    map_obj.height_field.flatten_disk(20, 20, 5)
+    map_obj.height_field.brush(40, 30, 6, 300)
+    assert map_obj.terrain is not terrain
+    assert not map_obj.is_dirty("height_map_data")
+
+    patched = write_map(map_obj, compress=False, incremental=True)
+    assert patched != data
+    assert patched == write_map(map_obj, compress=False)
+    assert parse_map(io.BytesIO(patched)).height_map_data.elevations == map_obj.height_map_data.elevations
+
+    # Dirty regions are not pickled, so the copy re-encodes the height map instead
+    copy = pickle.loads(pickle.dumps(map_obj))
+    assert copy.is_dirty("height_map_data")
+    assert write_map(copy, compress=False, incremental=True) == patched
+
+    map_obj.mark_dirty("height_map_data")
+    assert "_height_field" not in map_obj.__dict__
+
+
+def test_height_field_direct_edits():
+    """Test cells edited directly in the nested lists are read back rather than overwritten."""
+    _, map_obj = parse_synthetic(height=48, object_count=0)
+    field = map_obj.height_field
+    elevations = map_obj.height_map_data.elevations
+    height = map_obj.height_map_data.height
+
+    # Direct edit in a row the field edits next, then in a row it never touches
+    elevations[height - 1 - 10][5] = 900
+    field.fill(20, 10, 30, 11, 100)
+    assert elevations[height - 1 - 10][5] == 900 and field.values[10, 5] == 900
+    assert field.max_height == 900 and Region(5, 10, 6, 11) in field.dirty
+
+    elevations[height - 1 - 40][60] = 77
+    written = write_map(map_obj, compress=False, incremental=True)
+    assert Region(60, 40, 61, 41) in field.dirty
+    assert written == write_map(map_obj, compress=False)
+    reparsed = parse_map(io.BytesIO(written)).height_map_data.elevations
+    assert reparsed[height - 1 - 10][5] == 900 and reparsed[height - 1 - 40][60] == 77
+
+    field.brush(60, 40, 1, 10)
+    assert field.values[40, 60] == 87
+    assert field.sync() == 0
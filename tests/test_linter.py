@@ -0,0 +1,303 @@
+"""Test the linter rule engine."""
+
+import io
+import json
+import os
+import pickle
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from importlib.metadata import EntryPoint
+from pathlib import Path
+from xml.etree import ElementTree
+
+import pytest
+
+from sagemap import parse_map, parse_map_from_path, write_map, write_map_to_path
+from sagemap.heightfield import Region
+from sagemap.linter import Linter, Rule, engine, lint_map, lint_map_report
+from sagemap.linter.__main__ import main
+from sagemap.linter.errors import LintError
+from sagemap.linter.fixes import apply_fixes
+from sagemap.linter.height_utils import is_flat_at_position, world_to_heightmap_coords
+from sagemap.linter.linter import BUILTIN_RULES, FlatnessRule, default_rules
+from sagemap.linter.watch import IncrementalLinter, MapWatcher
+
+from .conftest import synthetic_map
+
+
+class CountingRule(Rule):
+    codes = ("TEST-001",)
+    assets = ("objects_list",)
+    object_types = ("*Waypoints/Waypoint",)
+    object_prefixes = ("*Waypoints/", "")
+
+    def __init__(self, map_obj):
+        super().__init__(map_obj)
+        self.visited = []
+
+    def visit(self, obj):
+        self.visited.append(obj)
+
+    def finish(self):
+        self.report(LintError(code="TEST-001", extra={}, message_template=str(len(self.visited))))
+
+
+class BrokenRule(Rule):
+    codes = ("TEST-002",)
+    object_prefixes = ("*Waypoints/",)
+
+    def visit(self, obj):
+        raise KeyError("waypointName")
+
+
+class ProcessRule(Rule):
+    """Reports the process it ran in."""
+
+    codes = ("TEST-004",)
+    assets = ("world_info",)
+    holds_gil = True
+
+    def finish(self):
+        self.report(LintError(code="TEST-004", extra={}, message_template=str(os.getpid())))
+
+
+class TeamsRule(Rule):
+    """Reads assets without declaring them."""
+
+    codes = ("TEST-003",)
+
+    def finish(self):
+        name = self.map.world_info.properties["mapName"]["value"]
+        self.report(LintError(code="TEST-003", extra={}, message_template=f"{name}: {len(self.map.teams.teams)}"))
+
+
+PLUGIN_RULES = [CountingRule]
+
+
+def test_linter_dispatch():
+    """Test objects reach each subscribed rule once, and a failing rule does not stop the others."""
+    map_obj = synthetic_map()
+    report = Linter([BrokenRule, CountingRule]).run(map_obj)
+
+    assert [error.code for error in report.errors] == ["MAP-999", "TEST-001"]
+    assert report.errors[1].message == str(len(map_obj.objects_list.object_list))
+    assert set(report.timings) == {"BrokenRule", "CountingRule"}
+
+    trie = Linter([BrokenRule, CountingRule]).trie
+    assert trie.match("*Waypoints/Waypoint") == (0, 1)
+    assert trie.match("*Waypoints") == (1,)
+
+    # Rules whose codes are all excluded are not run, and their assets are not needed
+    linter = Linter([CountingRule, FlatnessRule], exclude_codes=["TEST-001", "MAP-011"])
+    assert linter.rules == [FlatnessRule]
+    assert linter.assets == {"objects_list", "height_map_data"}
+
+
+@pytest.mark.parametrize("executor_class", [ThreadPoolExecutor, ProcessPoolExecutor])
+def test_linter_executor(executor_class):
+    """Test rules run on an executor report the same errors, in the same order, as a single pass."""
+    map_obj = synthetic_map()
+    linter = Linter(BUILTIN_RULES + [BrokenRule, CountingRule])
+    expected = linter.run(map_obj)
+
+    with executor_class(max_workers=2) as executor:
+        report = linter.run(map_obj, executor=executor)
+
+    assert [repr(error) for error in report.errors] == [repr(error) for error in expected.errors]
+    assert [result.name for result in report.rules] == [rule.name for rule in linter.rules]
+    assert [result.objects for result in report.rules] == [result.objects for result in expected.rules]
+    assert report.rules[-1].objects == len(map_obj.objects_list.object_list)
+    assert all(result.seconds > 0 for result in report.rules)
+
+    # Rules holding the GIL go to the process executor, the others stay on threads or run inline
+    linter = Linter([CountingRule, ProcessRule, FlatnessRule])
+    with ThreadPoolExecutor(max_workers=2) as threads, ProcessPoolExecutor(max_workers=1) as processes:
+        for executor in (None, threads):
+            report = linter.run(map_obj, executor=executor, process_executor=processes)
+            assert [result.name for result in report.rules] == ["CountingRule", "ProcessRule", "FlatnessRule"]
+            assert report.rules[0].objects == len(map_obj.objects_list.object_list)
+            assert report.errors[1].code == "TEST-004" and report.errors[1].message != str(os.getpid())
+        assert linter.run(map_obj, executor=threads).errors[1].message == str(os.getpid())
+
+    # The derived caches are not pickled for worker processes
+    assert map_obj.terrain is not None
+    assert "_terrain" not in pickle.loads(pickle.dumps(map_obj)).__dict__
+
+
+def test_lint_partially_parsed_map():
+    """Test maps parsed with only the assets the rules read lint the same as fully parsed ones."""
+    data = write_map(synthetic_map(), compress=False)
+    linter = Linter(BUILTIN_RULES)
+    assert "sides_list" in linter.assets and "asset_list" in linter.assets
+    partial = parse_map(io.BytesIO(data), assets=linter.assets)
+    assert partial.blend_tile_data is None and partial.global_lighting is None
+
+    expected = [repr(error) for error in lint_map(parse_map(io.BytesIO(data)), rules=BUILTIN_RULES)]
+    assert [repr(error) for error in linter.run(partial).errors] == expected
+    assert set(lint_map_report(partial, rules=BUILTIN_RULES).timings) == {rule.name for rule in BUILTIN_RULES}
+
+
+def test_undeclared_assets(tmp_path):
+    """Test rules that do not declare their assets get fully parsed maps, and re-run after any change."""
+    path = tmp_path / "undeclared.map"
+    map_obj = synthetic_map()
+    write_map_to_path(map_obj, str(path), compress=False)
+    expected = f"MAP:Synthetic: {len(map_obj.teams.teams)}"
+
+    linter = Linter([FlatnessRule, TeamsRule])
+    assert linter.assets is None and Linter([FlatnessRule]).assets is not None
+    errors = linter.run(parse_map_from_path(str(path), assets=linter.assets)).errors
+    assert [error.message for error in errors if error.code == "TEST-003"] == [expected]
+
+    incremental = IncrementalLinter(linter)
+    incremental.lint(path)
+    assert not incremental.lint(path).rules
+    map_obj.world_info.properties["mapName"]["value"] = "Renamed"
+    write_map_to_path(map_obj, str(path), compress=False)
+    delta = incremental.lint(path)
+    assert [result.name for result in delta.rules] == ["TeamsRule"]
+    assert [error.message for error in delta.added] == ["Renamed: " + expected.split(": ")[1]]
+
+
+def test_plugin_rules(monkeypatch):
+    """Test rule packs are loaded from entry points, skipping those that fail to load."""
+    plugins = [
+        EntryPoint("pack", "tests.test_linter:PLUGIN_RULES", engine.ENTRY_POINT_GROUP),
+        EntryPoint("broken", "tests.test_linter:MISSING", engine.ENTRY_POINT_GROUP),
+    ]
+    monkeypatch.setattr(engine, "entry_points", lambda group: plugins if group == engine.ENTRY_POINT_GROUP else [])
+    engine.load_plugin_rules.cache_clear()
+    try:
+        assert default_rules() == BUILTIN_RULES + [CountingRule]
+        assert default_rules(plugins=False) == BUILTIN_RULES
+    finally:
+        engine.load_plugin_rules.cache_clear()
+
+
+@pytest.mark.parametrize("format", ["json", "jsonl", "sarif", "junit"])
+def test_cli_formats(format, tmp_path, capsys):
+    """Test every map of a folder is reported in each machine-readable format, unparseable ones included."""
+    write_map_to_path(synthetic_map(), str(tmp_path / "a.map"), compress=False)
+    (tmp_path / "nested").mkdir()
+    write_map_to_path(synthetic_map(), str(tmp_path / "nested" / "b.map"), compress=False)
+    (tmp_path / "nested" / "broken.map").write_bytes(b"CkMp")
+
+    assert main([str(tmp_path), "--format", format, "--exclude", "MAP-016"]) == 1
+    output = capsys.readouterr().out
+
+    if format == "jsonl":
+        records = [json.loads(line) for line in output.splitlines()]
+    elif format == "json":
+        records = json.loads(output)
+    elif format == "sarif":
+        (run,) = json.loads(output)["runs"]
+        records = [
+            {"file": result["locations"][0]["physicalLocation"]["artifactLocation"]["uri"], "code": result["ruleId"]}
+            for result in run["results"]
+        ]
+        assert {rule["id"] for rule in run["tool"]["driver"]["rules"]} == {record["code"] for record in records}
+    else:
+        suites = ElementTree.fromstring(output)
+        records = [{"file": case.get("classname"), "code": case.get("name")} for case in suites.iter("testcase")]
+
+    files = [Path(record["file"]).name for record in records]
+    assert sorted(set(files)) == ["a.map", "b.map", "broken.map"]
+    assert files.count("a.map") == files.count("b.map") > 0
+    assert [record["code"] for record in records if record["file"].endswith("broken.map")] == ["MAP-999"]
+    assert "MAP-016" not in {record["code"] for record in records}
+
+
+def test_incremental_lint(tmp_path):
+    """Test only the rules reading a changed chunk run again, and errors are reported as a diff."""
+    path = tmp_path / "watched.map"
+    map_obj = synthetic_map()
+    write_map_to_path(map_obj, str(path), compress=False)
+    incremental = IncrementalLinter(Linter(BUILTIN_RULES))
+
+    delta = incremental.lint(path)
+    assert [result.name for result in delta.rules] == [rule.name for rule in BUILTIN_RULES]
+    assert delta.added == delta.errors and not delta.removed
+    assert not incremental.lint(path).rules
+
+    map_obj.world_info.properties["cameraMaxHeight"]["value"] = 100.0
+    write_map_to_path(map_obj, str(path), compress=False)
+    delta = incremental.lint(path)
+    assert [result.name for result in delta.rules] == ["ValidationRule"]
+    assert [error.code for error in delta.added] == ["MAP-017"] and not delta.removed
+    assert [repr(error) for error in delta.errors] == [
+        repr(error) for error in lint_map(parse_map_from_path(str(path)), rules=BUILTIN_RULES)
+    ]
+
+    path.write_bytes(path.read_bytes()[:-5])
+    delta = incremental.lint(path)
+    assert [error.code for error in delta.errors] == ["MAP-999"] and delta.removed
+
+    write_map_to_path(map_obj, str(path), compress=False)
+    delta = incremental.lint(path)
+    assert len(delta.rules) == len(BUILTIN_RULES) and [error.code for error in delta.removed] == ["MAP-999"]
+
+
+def test_map_watcher_debounce(tmp_path):
+    """Test maps are reported once their writes have settled for the debounce delay."""
+    now = [0.0]
+    (tmp_path / "a.map").write_bytes(b"a")
+    (tmp_path / "notes.txt").write_bytes(b"a")
+    watcher = MapWatcher([tmp_path], debounce=1.0, clock=lambda: now[0])
+
+    assert watcher.poll() == []
+    now[0] = 1.0
+    assert watcher.poll() == [tmp_path / "a.map"]
+    assert watcher.poll() == []
+
+    (tmp_path / "a.map").write_bytes(b"ab")
+    now[0] = 1.5
+    assert watcher.poll() == []
+    (tmp_path / "a.map").write_bytes(b"abc")
+    now[0] = 2.0
+    assert watcher.poll() == []
+    now[0] = 3.0
+    assert watcher.poll() == [tmp_path / "a.map"]
+
+
+def test_apply_fixes(tmp_path, capsys):
+    """Test the fixes of every error are applied at once and the map is written back with them."""
+    path = tmp_path / "fixed.map"
+    write_map_to_path(synthetic_map(object_count=60), str(path), compress=False)
+    map_obj = parse_map_from_path(str(path))
+    flag = next(obj for obj in map_obj.objects_list.object_list if obj.type_name == "ExpansionPlotFlag")
+    flag.angle = 0.5
+    map_obj.world_info.properties["cameraMaxHeight"]["value"] = 300.0
+    write_map_to_path(map_obj, str(path), compress=False)
+
+    map_obj = parse_map_from_path(str(path))
+    errors = lint_map(map_obj)
+    assert {error.code for error in errors if error.fix} == {"MAP-005", "MAP-011", "MAP-017"}
+
+    summary = apply_fixes(map_obj, [error.fix for error in errors if error.fix])
+    assert (summary.fixes, summary.objects, summary.properties) == (3, 1, 1) and summary.cells > 0
+    assert summary.assets == {"height_map_data", "objects_list", "world_info"}
+    assert map_obj.height_field.dirty and not map_obj.is_dirty("sides_list")
+    assert not [error for error in lint_map(map_obj) if error.fix]
+    assert apply_fixes(map_obj, [error.fix for error in errors if error.fix]).assets == set()
+
+    assert main([str(path), "--fix", "--quiet"]) == 0
+    assert "Applied 3 fix(es)" in capsys.readouterr().out
+    assert not [error for error in lint_map(parse_map_from_path(str(path))) if error.fix]
+
+
+def test_lint_direct_elevation_edits():
+    """Test elevations edited directly between two lint runs are seen by the flatness checks."""
+    map_obj = synthetic_map(object_count=60)
+    apply_fixes(map_obj, [error.fix for error in lint_map(map_obj) if error.fix])
+    assert not [error for error in lint_map(map_obj) if error.code == "MAP-011"]
+
+    flag = next(obj for obj in map_obj.objects_list.object_list if obj.type_name == "ExpansionPlotFlag")
+    x, y = flag.position[0] / 10.0, flag.position[1] / 10.0
+    hm_x, hm_y = world_to_heightmap_coords(map_obj, x, y)
+    cell_y = map_obj.height_map_data.height - 1 - hm_y
+    assert is_flat_at_position(map_obj, x, y, 3) and map_obj.terrain.flatness(hm_x, cell_y, 3) == 1.0
+
+    map_obj.height_map_data.elevations[hm_y][hm_x + 1] += 1
+    assert not is_flat_at_position(map_obj, x, y, 3)
+    assert len([error for error in lint_map(map_obj) if error.code == "MAP-011"]) == 1
+    assert map_obj.terrain.flatness(hm_x, cell_y, 3) < 1.0
+    assert map_obj.height_field.dirty[-1] == Region(hm_x + 1, cell_y, hm_x + 2, cell_y + 1)
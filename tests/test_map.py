@@ -0,0 +1,129 @@
+"""Test Map level behaviour."""
+
+import io
+import mmap
+import pickle
+
+import numpy as np
+import pytest
+
+from sagemap import parse_map, parse_map_from_path, write_map, write_map_to_path
+from sagemap.context import AssetPropertyType
+from sagemap.geometry import water_mask
+
+from .conftest import add_water, parse_synthetic, synthetic_map
+
+
+def test_write_incremental():
+    """Test incremental writes reuse clean chunks and match a full re-encode."""
+    data, map_obj = parse_synthetic()
+    assert write_map(map_obj, compress=False, incremental=True) == data
+
+    obj = map_obj.objects_list.object_list[0]
+    obj.position = (1.0, 2.0, 3.0)
+    obj.properties["newProperty"] = {"name": "newProperty", "type": AssetPropertyType.Integer, "value": 7}
+
+    # Edited in place without marking: the stale chunk is still copied
+    assert write_map(map_obj, compress=False, incremental=True) == data
+
+    map_obj.mark_dirty("objects_list")
+    assert map_obj.is_dirty("objects_list") and not map_obj.is_dirty("height_map_data")
+    written = write_map(map_obj, compress=False, incremental=True)
+    assert written == write_map(map_obj, compress=False)
+
+    parsed = parse_map(io.BytesIO(written))
+    assert parsed.objects_list.object_list[0].properties["newProperty"]["value"] == 7
+    assert parsed.height_map_data.elevations == map_obj.height_map_data.elevations
+
+    with pytest.raises(ValueError):
+        map_obj.mark_dirty("not_an_asset")
+
+
+def test_write_incremental_replaced_chunks():
+    """Test replacing an asset marks it dirty, and the AssetList also dirties the chunks depending on it."""
+    _, map_obj = parse_synthetic()
+    other = synthetic_map()
+    other.world_info.properties["mapName"]["value"] = "Replaced"
+
+    map_obj.world_info = other.world_info
+    assert map_obj.is_dirty("world_info")
+    parsed = parse_map(io.BytesIO(write_map(map_obj, compress=False, incremental=True)))
+    assert parsed.world_info.properties["mapName"]["value"] == "Replaced"
+
+    map_obj.asset_list = None
+    assert map_obj.is_dirty("sides_list")
+    assert "source" not in map_obj.to_dict()
+
+
+def test_parse_mapped(tmp_path):
+    """Test uncompressed maps are parsed from a memory map of the file and can be written back over it."""
+    data, map_obj = parse_synthetic()
+    path = tmp_path / "synthetic.map"
+    path.write_bytes(data)
+
+    mapped = parse_map_from_path(str(path))
+    assert isinstance(mapped.source, mmap.mmap)
+    assert mapped.to_dict() == map_obj.to_dict()
+    assert write_map(mapped, compress=False, incremental=True) == data
+    assert pickle.loads(pickle.dumps(mapped)).source == data
+
+    partial = parse_map_from_path(str(path), assets=["height_map_data"])
+    assert partial.height_map_data.elevations == map_obj.height_map_data.elevations
+    assert partial.objects_list is None
+
+    # Writing to another file keeps the mapping
+    write_map_to_path(mapped, str(tmp_path / "copy.map"), compress=False)
+    assert isinstance(mapped.source, mmap.mmap) and (tmp_path / "copy.map").read_bytes() == data
+
+    # Writing over the file detaches the map from the mapping first
+    mapped.height_field.fill(0, 0, 8, 8, 1234)
+    mapped.world_info.properties["mapName"]["value"] = "Mapped"
+    mapped.mark_dirty("world_info")
+    write_map_to_path(mapped, str(path), compress=False, incremental=True)
+    assert mapped.source == data
+
+    reparsed = parse_map_from_path(str(path))
+    assert reparsed.world_info.properties["mapName"]["value"] == "Mapped"
+    assert reparsed.height_map_data.elevations == mapped.height_map_data.elevations
+    assert write_map(reparsed, compress=False) == path.read_bytes()
+
+    # A mapping still exported by a view cannot be closed, so the file is replaced instead
+    written, inode = path.read_bytes(), path.stat().st_ino
+    view = np.frombuffer(reparsed.source, dtype=np.uint8)
+    write_map_to_path(reparsed, str(path), compress=False)
+    assert not isinstance(reparsed.source, mmap.mmap) and path.read_bytes() == written
+    assert path.stat().st_ino != inode
+    assert view[:4].tobytes() == b"CkMp" and len(view) == len(reparsed.source)
+    assert [file.name for file in tmp_path.iterdir() if file.suffix == ".tmp"] == []
+
+
+def test_water_mask_cache():
+    """Test the water mask is cached and dropped when the terrain or the water assets change."""
+    _, map_obj = parse_synthetic()
+    assert not map_obj.water_mask.any()
+    add_water(map_obj, 1000)
+
+    mask = map_obj.water_mask
+    assert mask.any() and map_obj.water_mask is mask
+    assert np.array_equal(mask, water_mask(map_obj))
+    assert map_obj.is_underwater(100.0, 100.0) and not map_obj.is_underwater(600.0, 100.0)
+    assert not map_obj.is_underwater(-1000.0, 100.0)
+
+    # Direct edits to the elevations are picked up by sync_elevations
+    hmd = map_obj.height_map_data
+    hmd.elevations[hmd.height - 1 - 18][18] = 60000
+    assert map_obj.water_mask is mask
+    map_obj.sync_elevations()
+    assert not map_obj.is_underwater(100.0, 100.0) and map_obj.is_underwater(110.0, 100.0)
+    mask = map_obj.water_mask
+
+    # In-place edits need mark_dirty; unrelated chunks keep the cache
+    map_obj.standing_water_areas.areas[0].water_height = 0
+    map_obj.mark_dirty("objects_list")
+    assert map_obj.water_mask is mask
+    map_obj.mark_dirty("standing_water_areas")
+    assert not map_obj.is_underwater(100.0, 100.0)
+
+    map_obj.river_areas = None
+    assert not map_obj.water_mask.any()
+    assert "_water_mask" not in map_obj.to_dict()
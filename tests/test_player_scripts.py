@@ -1,6 +1,9 @@
 """Test PlayerScriptsList asset parsing."""
 
+import pytest
+
 from sagemap.assets import PlayerScriptsList
+from sagemap.assets.player_scripts import ScriptArgument, ScriptArgumentType
 
 from .conftest import create_context, create_writing_context, load_asset_bytes
 
@@ -26,3 +29,61 @@ def test_player_scripts_list_write():
     written_bytes = write_context.stream.getvalue()
 
     assert written_bytes == asset_bytes
+
+
+def test_script_argument_round_trip():
+    """Test arguments of every shape round trip and share their string values."""
+    arguments = [
+        ScriptArgument(ScriptArgumentType.POSITION_COORDINATE, position_value=(1.5, -2.0, 0.0)),
+        ScriptArgument(ScriptArgumentType.TEAM_NAME, 3, -0.0, "teamPlyrCivilian"),
+        ScriptArgument(ScriptArgumentType.REAL_NUMBER, 0, 12.25, ""),
+        ScriptArgument(ScriptArgumentType.TEAM_NAME, 0, 0.0, "teamPlyrCivilian"),
+    ]
+
+    write_context = create_writing_context("PlayerScriptsList")
+    for argument in arguments:
+        argument.write(write_context)
+
+    parse_context = create_context(write_context.stream.getvalue(), "PlayerScriptsList")
+    parsed = [ScriptArgument.parse(parse_context) for _ in arguments]
+    assert parsed == arguments
+    assert str(parsed[1].float_value) == "-0.0"
+    assert parsed[1].string_value is parsed[3].string_value
+    assert not hasattr(parsed[0], "__dict__")
+
+    with pytest.raises(ValueError):
+        ScriptArgument(ScriptArgumentType.TEAM_NAME, 0, None, "team").write(write_context)
+
+
+def test_player_scripts_list_index():
+    """Test the script index finds nested scripts and the arguments referencing them."""
+    asset_bytes = load_asset_bytes("PlayerScriptsList")
+    result = PlayerScriptsList.parse(create_context(asset_bytes, "PlayerScriptsList"))
+
+    location = result.index.find_script("V_Veteranen__Check")
+    assert (location.player_index, location.group_path) == (1, ("V", "V_Zwerge", "V_Veteranen"))
+    assert location.script.is_subroutine
+    assert result.index.subroutines["V_Veteranen__Check"] == [location]
+    assert result.index.find_group("V_Veteranen").group_path == ("V", "V_Zwerge")
+
+    callers = result.index.references_to("V_Veteranen__Check", ScriptArgumentType.SUBROUTINE_NAME)
+    assert [reference.location.script.name for reference in callers] == [f"V_Veteran__{i}" for i in range(1, 9)]
+    assert result.index.references_to("V_Veteranen__Check", ScriptArgumentType.TEAM_NAME) == []
+
+
+def test_player_scripts_list_index_invalidation():
+    """Test the script index is rebuilt after the script trees change."""
+    asset_bytes = load_asset_bytes("PlayerScriptsList")
+    result = PlayerScriptsList.parse(create_context(asset_bytes, "PlayerScriptsList"))
+
+    script = result.remove_script("V_Veteranen__Check")
+    assert result.index.find_script("V_Veteranen__Check") is None
+
+    result.add_item(0, script)
+    assert result.index.find_script("V_Veteranen__Check").group_path == ()
+
+    result.script_lists = []
+    assert result.index.find_script("V_Veteranen__Check") is None
+
+    with pytest.raises(ValueError):
+        result.remove_script("V_Veteranen__Check")
@@ -0,0 +1,67 @@
+"""Test parse profiling."""
+
+import tracemalloc
+
+import pytest
+
+from sagemap.assets import ObjectsList, PlayerScriptsList
+from sagemap.profiling import ParseProfiler
+
+from .conftest import create_context, load_asset_bytes
+
+
+def test_profile_objects_list():
+    """Test profiling records nested assets with their bytes."""
+    asset_bytes = load_asset_bytes("ObjectsList")
+    context = create_context(asset_bytes, "ObjectsList")
+    context.set_profiler(ParseProfiler())
+
+    result = ObjectsList.parse(context)
+    root = context.profiler.finish(len(asset_bytes))
+
+    (objects_list,) = root.children
+    assert objects_list.bytes == len(asset_bytes)
+    assert objects_list.version == result.version
+    assert [node.name for node in objects_list.children] == ["Object"] * len(result.object_list)
+    assert sum(node.bytes for node in objects_list.children) < objects_list.bytes
+    assert root.summary()["Object"]["count"] == len(result.object_list)
+    assert objects_list.allocated is None
+
+
+def test_profile_exports():
+    """Test profiles export to Chrome trace and flamegraph formats."""
+    asset_bytes = load_asset_bytes("PlayerScriptsList")
+    context = create_context(asset_bytes, "PlayerScriptsList")
+
+    tracemalloc.start()
+    try:
+        context.set_profiler(ParseProfiler())
+        PlayerScriptsList.parse(context)
+        root = context.profiler.finish()
+    finally:
+        tracemalloc.stop()
+
+    events = root.to_chrome_trace()["traceEvents"]
+    assert len(events) == root.count
+    assert all(event["ph"] == "X" and "allocated" in event["args"] for event in events)
+    assert "Script" in root.summary()
+
+    flamegraph = root.to_flamegraph()
+    assert flamegraph["name"] == "Map"
+    assert flamegraph["children"][0]["value"] <= flamegraph["value"]
+
+
+def test_profile_parse_error():
+    """Test an asset that fails to parse still closes its profile node."""
+    asset_bytes = load_asset_bytes("ObjectsList")
+    context = create_context(asset_bytes[: len(asset_bytes) // 2], "ObjectsList")
+    context.set_profiler(ParseProfiler())
+
+    with pytest.raises(Exception):
+        ObjectsList.parse(context)
+    assert context.profiler.stack == [context.profiler.root]
+
+    root = context.profiler.finish()
+    (objects_list,) = root.children
+    assert objects_list.duration > 0 and objects_list.version is not None
+    assert len(root.to_chrome_trace()["traceEvents"]) == root.count
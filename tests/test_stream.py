@@ -0,0 +1,74 @@
+"""Test BinaryStream string and grid readers."""
+
+import io
+import mmap
+
+import pytest
+
+from sagemap.assets.blend_tile_data import TileFlammability
+from sagemap.stream import BinaryStream
+
+
+def test_uint16_prefixed_strings():
+    """Test prefixed strings round trip and interned reads share one string object."""
+    writer = BinaryStream(io.BytesIO())
+    for value in ("AmonSulFortress", "AmonSulFortress", "", "caf\xe9"):
+        writer.writeUInt16PrefixedAsciiString(value)
+    writer.writeUInt16PrefixedUnicodeString("Minas Tirith — Gate")
+    writer.writeUInt16PrefixedUnicodeString("Minas Tirith — Gate")
+
+    reader = BinaryStream(io.BytesIO(writer.getvalue()))
+    first = reader.readUInt16PrefixedAsciiString(intern=True)
+    second = reader.readUInt16PrefixedAsciiString(intern=True)
+    assert first == "AmonSulFortress" and first is second
+    assert reader.readUInt16PrefixedAsciiString() == ""
+    assert reader.readUInt16PrefixedAsciiString() == "caf\xe9"
+
+    first = reader.readUInt16PrefixedUnicodeString(intern=True)
+    second = reader.readUInt16PrefixedUnicodeString(intern=True)
+    assert first == "Minas Tirith — Gate" and first is second
+    assert reader.tell() == len(writer.getvalue())
+
+
+@pytest.mark.parametrize("mapped", [False, True])
+def test_grid_readers(tmp_path, mapped):
+    """Test the array-backed grid readers decode ``[x][y]`` grids written by the writers."""
+    width, height = 11, 3
+    writer = BinaryStream(io.BytesIO())
+    writer.writeUInt16(7)
+    uints = [[x * 100 + y for y in range(height)] for x in range(width)]
+    writer.writeUIntArray2D(uints, 32)
+    writer.writeUInt16Array2D(uints)
+    bits = [[(x * y + x) % 3 == 0 for y in range(height)] for x in range(width)]
+    writer.writeSingleBitBooleanArray2D(bits)
+    # Continuous bits: 33 values then padding to a whole byte
+    writer.writeBytes(bytes([0b10110101, 0xFF, 0x00, 0x0F, 0x01]))
+    flammability = [[TileFlammability(y % 2) for y in range(height)] for x in range(width)]
+    writer.writeByteArray2DAsEnum(flammability)
+    writer.writeByteArray2D([[x + y for y in range(height)] for x in range(width)])
+    data = writer.getvalue()
+
+    if mapped:
+        path = tmp_path / "grids.bin"
+        path.write_bytes(data)
+        with open(path, "rb") as file:
+            base = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    else:
+        base = io.BytesIO(data)
+    reader = BinaryStream(base)
+
+    assert reader.readUInt16() == 7
+    # Arrays are read at unaligned offsets
+    assert reader.readUIntArray2D(width, height, 32) == uints
+    assert reader.readUInt16Array2D(width, height) == uints
+    assert reader.readSingleBitBooleanArray2D(width, height) == bits
+    continuous = reader.readSingleBitBooleanArray2D(width, height, row_byte_aligned=False)
+    flat = [bool(byte >> bit & 1) for byte in (0b10110101, 0xFF, 0x00, 0x0F, 0x01) for bit in range(8)]
+    assert continuous == [[flat[y * width + x] for y in range(height)] for x in range(width)]
+    assert reader.readByteArray2DAsEnum(width, height, TileFlammability) == flammability
+    assert reader.readByteArray2D(width, height) == [[x + y for y in range(height)] for x in range(width)]
+    assert reader.tell() == len(data)
+    assert isinstance(reader.getvalue(), mmap.mmap) == mapped
+
+    with pytest.raises(ValueError):
+        reader.readUIntArray2D(width, height, 8)
@@ -0,0 +1,77 @@
+"""Test synthetic map generation."""
+
+import copy
+import io
+import json
+import pickle
+from dataclasses import replace
+
+import pytest
+
+from sagemap import parse_map, write_map
+from sagemap.assets.player_scripts import ScriptGroup
+from sagemap.linter import lint_map
+from sagemap.synth import SynthConfig, generate_map
+
+from .conftest import SYNTHETIC_CONFIG
+
+CONFIG = replace(
+    SYNTHETIC_CONFIG,
+    width=96,
+    height=80,
+    texture_count=14,
+    object_count=300,
+    waypoint_count=5,
+    script_depth=2,
+    trigger_count=6,
+    trigger_vertices=11,
+    camera_animations=3,
+    camera_frames=7,
+)
+
+
+def test_generate_map_round_trip():
+    """Test a synthetic map writes, parses back and rewrites to the same bytes."""
+    data = write_map(generate_map(CONFIG), compress=False)
+    parsed = parse_map(io.BytesIO(data))
+
+    assert write_map(parsed, compress=False) == data
+    assert (parsed.height_map_data.width, parsed.height_map_data.height) == (96, 80)
+    assert len(parsed.blend_tile_data.textures) == 14
+    assert len(parsed.blend_tile_data.blend_descriptions) > 0
+    assert len(parsed.objects_list.object_list) == 300 + 16 + 5
+    assert len(parsed.waypoints_list.waypoint_paths) == 4
+    assert all(len(area.points) == 11 for area in parsed.trigger_areas.trigger_areas)
+    assert [
+        len(animation.frame_data.look_at_frames) for animation in parsed.camera_animation_list.animations[1::2]
+    ] == [7]
+
+    group = parsed.player_scripts_list.script_lists[0].items[0]
+    assert isinstance(group, ScriptGroup) and isinstance(group.items[0], ScriptGroup)
+    assert len(group.items[0].items) == 2
+
+    lint_map(parsed)
+
+
+def test_generate_map_deterministic():
+    """Test generation depends only on the config."""
+    assert write_map(generate_map(CONFIG), compress=False) == write_map(generate_map(CONFIG), compress=False)
+
+    with pytest.raises(ValueError):
+        generate_map(SynthConfig(width=40, height=40, border_width=20))
+
+
+def test_generate_map_pickle_and_copy():
+    """Test slotted asset records survive pickling, copying and ``to_dict``."""
+    map_obj = generate_map(CONFIG)
+    data = write_map(map_obj, compress=False)
+
+    assert not hasattr(map_obj.objects_list.object_list[0], "__dict__")
+    assert write_map(pickle.loads(pickle.dumps(map_obj)), compress=False) == data
+
+    edited = copy.deepcopy(map_obj)
+    edited.objects_list.object_list[0].position = (1.0, 2.0, 3.0)
+    assert write_map(edited, compress=False) != data
+    assert write_map(map_obj, compress=False) == data
+
+    assert json.loads(json.dumps(map_obj.to_dict()))["objects_list"]["object_list"][0]["position"] is not None
@@ -0,0 +1,59 @@
+"""Test terrain derivative layers."""
+
+import math
+
+import numpy as np
+
+from sagemap.linter.height_utils import flatten_position_in_radius
+
+from .conftest import synthetic_map
+
+
+def generate_terrain_map():
+    """A synthetic map rising 2.5 world units per cell along x, with a 20 unit step up at column 40."""
+    map_obj = synthetic_map(height=48, object_count=0)
+    hmd = map_obj.height_map_data
+    hmd.elevations = [[x * 64 + (512 if x >= 40 else 0) for x in range(hmd.width)] for _ in range(hmd.height)]
+    return map_obj
+
+
+def test_terrain_layers():
+    """Test slope, curvature and cliffs of a ramp with a step."""
+    terrain = generate_terrain_map().terrain
+    assert terrain.heights.shape == (48, 64)
+    assert terrain.heights[0, 1] == 2.5
+
+    gradient_y, gradient_x = terrain.gradient
+    assert np.allclose(gradient_y, 0) and np.allclose(gradient_x[:, 1:38], 0.25)
+    assert np.allclose(terrain.slope[:, 1:38], math.degrees(math.atan(0.25)))
+    assert terrain.curvature[5, 39] > 0 > terrain.curvature[5, 40]
+
+    assert terrain.cliff_mask.any(axis=0).nonzero()[0].tolist() == [39]
+    assert terrain.impassable_mask.shape == terrain.cliff_mask.shape
+    assert not terrain.cliff_texture_mask.any()
+
+    # The cliff column is within 4 cells of column 35 but not of 34
+    assert terrain.has_cliff(35, 10, 4) and not terrain.has_cliff(34, 10, 4)
+    assert terrain.max_slope(20, 10, 3) < 15 < terrain.max_slope(39, 10, 1)
+    assert terrain.cell(100.0, -10.0) == (18, 7)
+
+
+def test_terrain_flatness_and_cache():
+    """Test flatness windows match a direct count, and the cache follows height map edits."""
+    map_obj = generate_terrain_map()
+    terrain = map_obj.terrain
+    assert map_obj.terrain is terrain
+    assert terrain.flatness(-1, 5, 3) == 0.0
+    # Rows 0 to 2 of the disk are on the map, holding 5, 3 and 1 cells, one per row in column 10
+    assert terrain.flatness(10, 0, 2) == 3 / 9
+
+    ys, xs = terrain.disk(20, 20, 4.5)
+    assert len(ys) == sum(1 for dy in range(-5, 6) for dx in range(-5, 6) if math.hypot(dx, dy) <= 4.5)
+
+    map_obj.mark_dirty("objects_list")
+    assert map_obj.terrain is terrain
+
+    # flatten_position_in_radius takes cells relative to the border, rows from the bottom
+    flatten_position_in_radius(map_obj, 20, 20, 4)
+    assert map_obj.terrain is not terrain
+    assert map_obj.terrain.flatness(28, 28, 4) == 1.0
@@ -0,0 +1,130 @@
+"""Test map-wide terrain transforms."""
+
+import numpy as np
+import pytest
+
+from sagemap.assets import BlendTileData, HeightMapData
+from sagemap.transform import (
+    MapTransform,
+    clear_interior_blends,
+    resample_bilinear,
+    resample_nearest,
+    retile,
+    scale_blend_tile_data,
+)
+
+from .conftest import create_context, create_writing_context, load_asset_bytes
+
+
+def load_terrain():
+    height_map = HeightMapData.parse(create_context(load_asset_bytes("HeightMapData"), "HeightMapData"))
+    blend_tile_data = BlendTileData.parse(
+        create_context(load_asset_bytes("BlendTileData"), "BlendTileData"), height_map
+    )
+    return height_map, blend_tile_data
+
+
+def test_resample_nearest():
+    """Test nearest-neighbour resampling keeps value types."""
+    grid = [[True, False], [False, True]]
+    assert resample_nearest(grid, 2) == [
+        [True, True, False, False],
+        [True, True, False, False],
+        [False, False, True, True],
+        [False, False, True, True],
+    ]
+    assert resample_nearest(None, 2) is None
+
+
+def test_resample_bilinear():
+    """Test bilinear resampling interpolates between samples."""
+    assert resample_bilinear([[0, 10], [20, 30]], 2) == [
+        [0, 5, 10, 10],
+        [10, 15, 20, 20],
+        [20, 25, 30, 30],
+        [20, 25, 30, 30],
+    ]
+
+
+def test_retile():
+    """Test retiling keeps every tile owned by the texture of its source footprint."""
+    _, btd = load_terrain()
+    source_ids = btd.texture_index_grid()
+
+    btd.tiles = retile(btd.tiles, btd.textures, 2)
+    scaled_ids = btd.texture_index_grid()
+
+    assert scaled_ids.shape == (source_ids.shape[0] * 2, source_ids.shape[1] * 2)
+    assert (scaled_ids == source_ids.repeat(2, axis=0).repeat(2, axis=1)).all()
+
+
+def test_clear_interior_blends():
+    """Test blends are cleared only where no neighbour differs."""
+    tiles = [[0, 0, 0, 0], [0, 0, 0, 0], [0, 0, 0, 4]]
+    blends = [[1, 1, 1, 1], [1, 1, 1, 1], [1, 1, 1, 1]]
+    assert clear_interior_blends(tiles, blends) == [[0, 0, 0, 0], [0, 0, 1, 1], [0, 0, 1, 1]]
+
+
+def test_scale_blend_tile_data_write():
+    """Test a scaled BlendTileData can still be written."""
+    height_map, btd = load_terrain()
+    scale_blend_tile_data(btd, 0.5)
+
+    assert len(btd.tiles) == round(height_map.width * 0.5)
+    assert len(btd.impassability) == len(btd.tiles)
+
+    write_context = create_writing_context("BlendTileData")
+    btd.write(write_context)
+    assert write_context.stream.getvalue()
+
+
+def test_map_transform_plan():
+    """Test a chain of steps reduces to a single plan."""
+    plan = MapTransform().pad(10).rotate90().crop(5, 0, 50, 60).scale(2).plan(40, 30)
+    assert plan.size == (100, 120)
+    assert plan.matrix == ((0, -1), (1, 0))
+    assert plan.scale == 2
+
+    identity = MapTransform().mirror("x").rotate90(2).mirror("y").plan(40, 30)
+    assert identity.matrix == ((1, 0), (0, 1))
+    assert identity.size == (40, 30)
+    assert identity.map_point(3, 4) == (3, 4)
+
+    mirrored = MapTransform().mirror("x").plan(40, 30)
+    assert mirrored.map_point(0, 4) == (39, 4)
+    assert mirrored.map_extent(0, 4) == (40, 4)
+
+    with pytest.raises(ValueError):
+        MapTransform().mirror("z")
+    with pytest.raises(ValueError):
+        MapTransform().crop(0, 0, 50, 50).crop(0, 0, 0, 10).plan(40, 30)
+
+
+def test_transform_height_map_rotate():
+    """Test rotating a HeightMapData rotates its elevations and keeps its borders."""
+    height_map, _ = load_terrain()
+    elevations = np.asarray(height_map.elevations)
+    borders = [(b.corner1, b.position) for b in height_map.borders]
+
+    MapTransform().rotate90().plan(height_map.width, height_map.height).transform_height_map(height_map)
+
+    assert (height_map.width, height_map.height) == elevations.shape
+    assert (np.asarray(height_map.elevations) == np.rot90(elevations)).all()
+    assert [(b.corner1, b.position) for b in height_map.borders] == [((c[1], c[0]), (p[1], p[0])) for c, p in borders]
+
+
+def test_transform_blend_tile_data_mirror():
+    """Test mirroring a BlendTileData mirrors textures and blend directions."""
+    _, btd = load_terrain()
+    source_ids = btd.texture_index_grid()
+    directions = {(desc.raw_blend_direction[0], desc.flags & 1) for desc in btd.blend_descriptions}
+
+    MapTransform().mirror("x").plan(len(btd.tiles), len(btd.tiles[0])).transform_blend_tile_data(btd)
+
+    assert (btd.texture_index_grid() == source_ids[::-1]).all()
+    for x_axis, flipped in {(desc.raw_blend_direction[0], desc.flags & 1) for desc in btd.blend_descriptions}:
+        assert (x_axis, flipped ^ bool(x_axis)) in directions
+
+    write_context = create_writing_context("BlendTileData")
+    btd.write(write_context)
+    assert write_context.stream.getvalue()
@@ -0,0 +1,60 @@
+"""Test structural map validation."""
+
+import struct
+
+from sagemap import validate, write_map
+from sagemap.validation import validate_data
+
+from .conftest import SYNTHETIC_CONFIG, synthetic_map
+
+
+def find_asset(report, name):
+    return next(asset for asset in report.assets if asset.name == name)
+
+
+def test_validate_valid_map(tmp_path):
+    """Test a well-formed map validates and its container assets are walked."""
+    path = tmp_path / "synthetic.map"
+    path.write_bytes(write_map(synthetic_map(script_depth=2), compress=False))
+
+    report = validate(path)
+    assert report.valid, report.issues
+    assert not report.compressed and report.compression_bytes == "CkMp"
+    objects = SYNTHETIC_CONFIG.object_count + 16 + SYNTHETIC_CONFIG.waypoint_count
+    assert find_asset(report, "ObjectsList").children == objects
+    assert find_asset(report, "PlayerScriptsList").children > len(report.assets)
+    assert report.to_dict()["valid"] is True
+
+
+def test_validate_corrupt_map():
+    """Test corrupt headers, unknown indices, truncation and missing chunks are reported."""
+    data = write_map(synthetic_map(script_depth=2), compress=False)
+    report = validate_data(data)
+    objects = find_asset(report, "ObjectsList")
+    first_object = objects.offset + 10
+
+    corrupt = bytearray(data)
+    struct.pack_into("<I", corrupt, first_object + 6, 1 << 24)
+    issues = validate_data(bytes(corrupt)).issues
+    assert [(issue.offset, issue.path) for issue in issues] == [(first_object, "ObjectsList")]
+    assert "overruns ObjectsList" in issues[0].message
+
+    corrupt = bytearray(data)
+    struct.pack_into("<I", corrupt, first_object, 9999)
+    assert [issue.message for issue in validate_data(bytes(corrupt)).issues] == [
+        "Asset index 9999 is not in the asset table"
+    ]
+
+    corrupt = bytearray(data)
+    struct.pack_into(
+        "<I",
+        corrupt,
+        find_asset(report, "GlobalLighting").offset,
+        struct.unpack_from("<I", data, find_asset(report, "WorldInfo").offset)[0],
+    )
+    assert [issue.message for issue in validate_data(bytes(corrupt)).issues] == [
+        "Missing required asset: GlobalLighting"
+    ]
+
+    truncated = validate_data(data[:-5])
+    assert not truncated.valid and "overruns the map" in truncated.issues[0].message
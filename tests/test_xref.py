@@ -0,0 +1,91 @@
+"""Test the script cross-reference graph."""
+
+from pathlib import Path
+
+from sagemap import parse_map_from_path
+from sagemap.assets.player_scripts import ScriptArgument, ScriptArgumentType
+from sagemap.context import AssetPropertyType
+from sagemap.linter.linter import lint_map_references
+from sagemap.xref import NodeKind, build_reference_graph
+
+from .conftest import synthetic_map
+
+
+def generate_scripted_map():
+    """A synthetic map whose first player calls a subroutine chain and names missing entities."""
+    map_obj = synthetic_map()
+    group = map_obj.player_scripts_list.script_lists[0].items[0]
+    caller, callee = group.items
+
+    callee.is_subroutine = True
+    callee.actions_if_true[0].arguments = [
+        ScriptArgument(ScriptArgumentType.TEAM_NAME, 0, 0.0, "PlyrCivilian/teamMissing"),
+        ScriptArgument(ScriptArgumentType.WAYPOINT_NAME, 0, 0.0, "Player_1_Start"),
+        ScriptArgument(ScriptArgumentType.WAYPOINT_PATH_NAME, 0, 0.0, "Missing_Path"),
+        ScriptArgument(ScriptArgumentType.PLAYER_NAME, 0, 0.0, "<This Player>"),
+    ]
+    caller.actions_if_true[0].arguments = [ScriptArgument(ScriptArgumentType.SUBROUTINE_NAME, 0, 0.0, callee.name)]
+    return map_obj, caller, callee
+
+
+def test_reference_graph():
+    """Test references are resolved to nodes and queried in both directions."""
+    map_obj, caller, callee = generate_scripted_map()
+    graph = build_reference_graph(map_obj)
+
+    caller_node = graph.node(NodeKind.SCRIPT, caller.name)
+    callee_node = graph.node(NodeKind.SCRIPT, callee.name)
+    team_node = graph.node(NodeKind.TEAM, "teamMissing")
+    assert callee_node in graph.successors(caller_node)
+    assert list(graph.predecessors(team_node)) == [callee_node]
+    assert graph.node(NodeKind.PLAYER, "<This Player>") is None
+
+    assert [graph.names[node] for node in graph.dangling(NodeKind.TEAM)] == ["teamMissing"]
+    assert [graph.names[node] for node in graph.dangling(NodeKind.WAYPOINT_PATH)] == ["Missing_Path"]
+    assert graph.node(NodeKind.WAYPOINT, "Player_1_Start") not in graph.unused(NodeKind.WAYPOINT)
+    assert graph.node(NodeKind.WAYPOINT, "Player_2_Start") in graph.unused(NodeKind.WAYPOINT)
+    assert len(graph.unreachable_subroutines()) == 0
+
+    # Without its caller the subroutine, and whatever only it calls, is unreachable.
+    caller.actions_if_true[0].arguments = []
+    graph = build_reference_graph(map_obj)
+    assert [graph.names[node] for node in graph.unreachable_subroutines()] == [callee.name]
+
+    # An object's script attachment runs it, even on an unnamed object
+    obj = next(
+        obj
+        for obj in map_obj.objects_list.object_list
+        if "objectName" not in obj.properties and "waypointName" not in obj.properties
+    )
+    obj.properties["objectScriptAttachment"] = {
+        "name": "objectScriptAttachment",
+        "type": AssetPropertyType.AsciiString,
+        "value": callee.name,
+    }
+    graph = build_reference_graph(map_obj)
+    assert graph.hooked[graph.node(NodeKind.SCRIPT, callee.name)]
+    assert len(graph.unreachable_subroutines()) == 0
+
+
+def test_lint_map_references():
+    """Test the reference lint rules report missing teams, waypoints and unused subroutines."""
+    map_obj, caller, callee = generate_scripted_map()
+    assert [error.code for error in lint_map_references(map_obj)] == ["MAP-018", "MAP-019"]
+
+    caller.actions_if_true[0].arguments = []
+    errors = lint_map_references(map_obj)
+    assert [error.code for error in errors] == ["MAP-018", "MAP-019", "MAP-020"]
+    assert errors[0].extra == {"team": "teamMissing", "scripts": [callee.name]}
+    assert errors[2].extra == {"script": callee.name}
+
+
+def test_script_hooks():
+    """Test subroutines run by team script hooks, and the ones they call, are reachable on a sample map."""
+    map_obj = parse_map_from_path(str(Path(__file__).parent / "data" / "maps" / "spieler.map"))
+    graph = build_reference_graph(map_obj)
+
+    spawn_move = graph.node(NodeKind.SCRIPT, "SpawnMove")
+    teams = {graph.names[node] for node in graph.predecessors(spawn_move) if graph.kinds[node] == NodeKind.TEAM}
+    assert len(teams) == 7 and graph.hooked[spawn_move]
+    assert graph.node(NodeKind.SCRIPT, "SpawnMove__1") in graph.successors(spawn_move)
+    assert [error.code for error in lint_map_references(map_obj) if error.code == "MAP-020"] == []